@@ -1,11 +1,18 @@
 from .blackboard import Blackboard
 from .direct_communication import DirectMessenger
 from .pubsub_communication import PubSubCommunicator
+from .async_bus import AsyncMessageBus
+from .topic_trie import TopicTrie
+from .message_queue import BackpressurePolicy, BoundedMessageQueue
 
 __all__ = [
     'Blackboard',
     'DirectMessenger',
     'PubSubCommunicator',
+    'BackpressurePolicy',
+    'BoundedMessageQueue',
+    'AsyncMessageBus',
+    'TopicTrie',
     'CommunicationFactory',
     'create_communication'
 ]
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from ..message import Message
+
+
+class AsyncMessageBus:
+    """
+    Wake-on-message layer over a communicator's synchronous receive().
+
+    An agent awaiting messages parks on a future instead of polling. After every
+    successful send, notify() resolves the futures of the waiting agents that now
+    have pending messages, so a send costs O(waiting agents) and idle agents cost
+    nothing. Sends may come from any thread: futures are resolved through their
+    own event loop.
+    """
+
+    def __init__(self, receive: Callable[[str], List[Message]], has_pending: Callable[[str], bool]):
+        """
+        Args:
+            receive: Consuming receive of the current communicator (agent_id -> messages)
+            has_pending: Non-consuming check of the current communicator
+        """
+        self._receive = receive
+        self._has_pending = has_pending
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        """Wake every waiting agent that has messages to receive"""
+        with self._lock:
+            ready = [future for agent_id, futures in self._waiters.items()
+                     if self._has_pending(agent_id) for future in futures]
+        for future in ready:
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+
+    async def wait(self, agent_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the agent has pending messages (nothing is consumed)
+
+        Returns:
+            True if messages are pending, False if the timeout elapsed first
+        """
+        if self._has_pending(agent_id):
+            return True
+        if timeout is not None and timeout <= 0:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters.setdefault(agent_id, set()).add(future)
+        try:
+            # A send that raced with the registration above has already happened
+            if self._has_pending(agent_id):
+                return True
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                futures = self._waiters.get(agent_id)
+                if futures is not None:
+                    futures.discard(future)
+                    if not futures:
+                        del self._waiters[agent_id]
+
+    async def receive(self, agent_id: str, timeout: Optional[float] = None) -> List[Message]:
+        """
+        Receive the agent's messages, waiting for at least one
+
+        Returns:
+            The new messages, or an empty list if the timeout elapsed first
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            messages = self._receive(agent_id)
+            if messages:
+                return messages
+            remaining = None if deadline is None else deadline - loop.time()
+            if not await self.wait(agent_id, remaining):
+                return []
+
+    async def subscribe(self, agent_id: str, idle_timeout: Optional[float] = None) -> AsyncIterator[Message]:
+        """
+        Yield the agent's messages one by one as they arrive
+
+        Args:
+            agent_id: Receiving agent
+            idle_timeout: Stop after this many seconds without a message (never by default)
+        """
+        while True:
+            messages = await self.receive(agent_id, idle_timeout)
+            if not messages:
+                return
+            for message in messages:
+                yield message
+
+    def waiting_agents(self) -> List[str]:
+        """Agents currently parked in wait() / receive()"""
+        with self._lock:
+            return list(self._waiters)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(True)
@@ -1,15 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict, List
 
 from src.message import Message
 
 
+DEFAULT_MESSAGE_LOG_SIZE = 1000
+
 class BaseCommunicator(ABC):
     """Abstract base class for all communication implementations"""
     
-    def __init__(self):
+    def __init__(self, message_log_size: int = DEFAULT_MESSAGE_LOG_SIZE):
         self.agents: Dict[str, object] = {}
-        self.message_log: List[Message] = []
+        # Most recent deliveries only, so the log stays bounded like the queues
+        self.message_log: Deque[Message] = deque(maxlen=message_log_size)
     
     @abstractmethod
     def register_agent(self, agent) -> bool:
@@ -25,6 +29,11 @@ class BaseCommunicator(ABC):
     def receive(self, agent_id: str) -> List[Message]:
         """Receive messages for a specific agent"""
         pass
+    
+    @abstractmethod
+    def has_pending(self, agent_id: str) -> bool:
+        """Whether receive() would return at least one message (without consuming it)"""
+        pass
 
 
 
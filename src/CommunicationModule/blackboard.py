@@ -1,62 +1,124 @@
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ..message import Message
 from .base_communicator import BaseCommunicator
+from .transcript import TranscriptCache
+
+
+class MessageView(Sequence):
+    """
+    Read-only window [start, end) over the blackboard's append-only message list.
+    Nothing is copied: positions already written never change, so the view stays valid
+    while new messages are appended (clear() swaps in a new list).
+    """
+
+    def __init__(self, messages: List[Message], start: int, end: int):
+        self._messages = messages
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return MessageView(self._messages, self.start + start, self.start + max(stop, start))
+            return [self._messages[self.start + i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message view index out of range")
+        return self._messages[self.start + index]
+
+    def __iter__(self):
+        messages = self._messages
+        for position in range(self.start, self.end):
+            yield messages[position]
+
+    def __repr__(self) -> str:
+        return f"MessageView(start={self.start}, end={self.end})"
+
 
 class Blackboard(BaseCommunicator):
     """
     Blackboard communication system where all agents can read and write messages
+    The board is append-only; each agent has a read cursor, so receive() returns
+    only the messages posted since that agent's previous receive()
     """
     def __init__(self):
         super().__init__()
         self.messages: List[Message] = []
         self.message_counter = 0
+        self.read_cursors: Dict[str, int] = {}
+        # Conversation history rendered once per message, at send time
+        self.transcript = TranscriptCache("=== CONVERSATION HISTORY ===\n")
 
 
     def register_agent(self, agent) -> bool:
         """Register an agent with the blackboard"""
-        agent_id = getattr(agent, 'id', str(agent))
+        agent_id = agent.get_id() if hasattr(agent, 'get_id') else str(agent)
         if agent_id not in self.agents:
             self.agents[agent_id] = agent
             return True
         return False
            
-    def send(self, message ,agent_id: str, agent_role: str, content: str, 
-                    message_type: str = "response", metadata: Dict = None) -> str:
+    def send(self, message: Message) -> bool:
         """Post a message to the blackboard"""
         self.message_counter += 1
-        message_id = f"msg_{self.message_counter:04d}"
-        
-        # message = Message(
-        #     id=message_id,
-        #     agent_id=agent_id,
-        #     agent_role=agent_role,
-        #     content=content,
-        #     timestamp=datetime.now(),
-        #     message_type=message_type,
-        #     metadata=metadata or {}
-        # )
-        
         self.messages.append(message)
-        return message_id
+        self.transcript.append(self._render(message))
+        return True
+    
+    @staticmethod
+    def _render(msg: Message) -> str:
+        timestamp = msg.timestamp.strftime("%H:%M:%S")
+        return f"[{timestamp}] {msg.agent_role} ({msg.agent_id}):\n{msg.content}\n\n"
+    
+    def receive(self , agent_id) -> MessageView:
+        """Get the messages posted since this agent last received (advances its cursor)"""
+        start = self.read_cursors.get(agent_id, 0)
+        end = len(self.messages)
+        self.read_cursors[agent_id] = end
+        return MessageView(self.messages, start, end)
+    
+    def read_range(self, start: int = 0, end: Optional[int] = None) -> MessageView:
+        """Get messages [start, end) of the whole board (no cursor involved)"""
+        size = len(self.messages)
+        end = size if end is None else max(0, min(end, size))
+        start = max(0, min(start, end))
+        return MessageView(self.messages, start, end)
+    
+    def has_pending(self, agent_id: str) -> bool:
+        return self.read_cursors.get(agent_id, 0) < len(self.messages)
     
-    def receive(self , agent_id) -> List[Message]:
-        """Get all messages from the blackboard"""
-        return self.messages.copy()
+    def get_cursor(self, agent_id: str) -> int:
+        """Offset of the next message this agent will receive"""
+        return self.read_cursors.get(agent_id, 0)
+    
+    def seek(self, agent_id: str, offset: int = 0) -> None:
+        """Move an agent's read cursor (0 replays the whole board on the next receive)"""
+        self.read_cursors[agent_id] = max(0, min(offset, len(self.messages)))
     
     def get_conversation_history(self) -> str:
-        """Get formatted conversation history for LLM prompts"""
+        """Get formatted conversation history for LLM prompts (cached, O(1) when unchanged)"""
         if not self.messages:
             return "No previous messages."
         
-        history = "=== CONVERSATION HISTORY ===\n"
-        for msg in self.messages:
-            timestamp = msg.timestamp.strftime("%H:%M:%S")
-            history += f"[{timestamp}] {msg.agent_role} ({msg.agent_id}):\n{msg.content}\n\n"
+        return self.transcript.text()
+    
+    def get_conversation_tail(self, max_tokens: int) -> str:
+        """Get the newest part of the conversation history that fits in max_tokens"""
+        if not self.messages:
+            return "No previous messages."
         
-        return history
+        return self.transcript.tail(max_tokens)
     
     def clear(self):
-        """Clear all messages from the blackboard"""
-        self.messages.clear()
-        self.message_counter = 0
\ No newline at end of file
+        """Clear all messages from the blackboard (views handed out earlier keep the old messages)"""
+        self.messages = []
+        self.message_counter = 0
+        self.read_cursors.clear()
+        self.transcript.clear()
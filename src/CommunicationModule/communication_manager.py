@@ -1,9 +1,12 @@
 from enum import Enum
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
+from .async_bus import AsyncMessageBus
+from .base_communicator import DEFAULT_MESSAGE_LOG_SIZE
 from .blackboard import Blackboard
 from src.message import Message
 from .direct_communication import DirectMessenger
 from .pubsub_communication import PubSubCommunicator
+from .message_queue import BackpressurePolicy, DEFAULT_QUEUE_SIZE, QueueStats
 class CommunicationMode(Enum):
     """Enumeration for different communication modes"""
     BLACKBOARD = "blackboard"
@@ -14,14 +17,25 @@ class CommunicationMode(Enum):
 class CommunicationManager:
     """Factory pattern manager for different communication modes"""
     
-    def __init__(self, mode: CommunicationMode, shared_log = None):
+    def __init__(self, mode: CommunicationMode, shared_log = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 backpressure: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST, block_timeout: float = 1.0,
+                 message_log_size: int = DEFAULT_MESSAGE_LOG_SIZE):
+        """
+        Args:
+            mode: Communication mode
+            queue_size: Capacity of each agent's queue (direct and pubsub modes)
+            backpressure: What a full queue does with the next message
+            block_timeout: Seconds a send waits on a full queue with the BLOCK policy (BLOCK needs
+                the consumer on another thread, or asend() from async code)
+            message_log_size: How many recent deliveries each communicator keeps in its message_log
+        """
         self.mode = mode
         # self.shared_log = shared_log or SharedLogDB()
         
         # Create instances of all concrete communicators
         self.blackboard_impl = Blackboard()
-        self.direct_impl = DirectMessenger()
-        self.pubsub_impl = PubSubCommunicator()
+        self.direct_impl = DirectMessenger(queue_size, backpressure, block_timeout, message_log_size)
+        self.pubsub_impl = PubSubCommunicator(queue_size, backpressure, block_timeout, message_log_size)
         
         # Set current communicator based on mode
         self.current_communicator = self.create_communicator(mode)
@@ -32,8 +46,13 @@ class CommunicationManager:
             "messages_received": 0,
             "total_message_length": 0,
             "unique_senders": set(),
-            "unique_topics": set()
+            "unique_topics": set(),
+            # Queue depth / backpressure counters of the current communicator
+            **QueueStats().as_dict()
         }
+        
+        # Awaitable receive / subscriptions on top of the current communicator
+        self.bus = AsyncMessageBus(self.receive, self.has_pending)
     
     def create_communicator(self, mode: CommunicationMode):
         """Factory method to get the appropriate communicator"""
@@ -53,18 +72,77 @@ class CommunicationManager:
     def send(self, message: Message) -> bool:
         """Send message using current communicator and log it"""
         success = self.current_communicator.send(message=message)
-
+        return self._record_send(message, success)
+    
+    async def asend(self, message: Message) -> bool:
+        """
+        send() for coroutines. With the BLOCK policy a full queue is awaited without
+        stalling the event loop; a synchronous send() on the loop drops the message instead.
+        """
+        if hasattr(self.current_communicator, 'asend'):
+            success = await self.current_communicator.asend(message)
+        else:
+            success = self.current_communicator.send(message=message)
+        return self._record_send(message, success)
+    
+    def _record_send(self, message: Message, success: bool) -> bool:
         if success:
             self.communication_stats["messages_sent"] += 1
             self.communication_stats["total_message_length"] += len(message.content)
             self.communication_stats["unique_senders"].add(message.agent_id)
             self.communication_stats["unique_topics"].add(message.metadata.get("topic"))
             #self._log_message(message)
+        self._update_queue_stats()
+        self.bus.notify()
         return success
     
     def receive(self, agent_id: str) -> List[Message]:
         """Receive messages for agent using current communicator"""
-        return self.current_communicator.receive(agent_id)
+        messages = self.current_communicator.receive(agent_id)
+        self.communication_stats["messages_received"] += len(messages)
+        self._update_queue_stats()
+        return messages
+    
+    def has_pending(self, agent_id: str) -> bool:
+        """Whether the agent has messages waiting (nothing is consumed)"""
+        return self.current_communicator.has_pending(agent_id)
+    
+    async def areceive(self, agent_id: str, timeout: Optional[float] = None) -> List[Message]:
+        """
+        Await the agent's next messages instead of polling
+
+        Args:
+            agent_id: Receiving agent
+            timeout: Seconds to wait for a message (forever by default)
+
+        Returns:
+            The new messages, or an empty list if the timeout elapsed first
+        """
+        return await self.bus.receive(agent_id, timeout)
+    
+    async def wait_for_messages(self, agent_id: str, timeout: Optional[float] = None) -> bool:
+        """Await until the agent has messages to receive, without consuming them"""
+        return await self.bus.wait(agent_id, timeout)
+    
+    def iter_messages(self, agent_id: str, idle_timeout: Optional[float] = None) -> AsyncIterator[Message]:
+        """
+        Async iterator over the agent's messages as they arrive (works in every mode):
+
+            async for message in comm_manager.iter_messages(agent_id, idle_timeout=5):
+                ...
+        """
+        return self.bus.subscribe(agent_id, idle_timeout)
+    
+    def _update_queue_stats(self) -> None:
+        queue_stats = getattr(self.current_communicator, 'queue_stats', None)
+        if queue_stats is not None:
+            self.communication_stats.update(queue_stats.as_dict())
+    
+    def get_queue_depths(self) -> dict:
+        """Current queue depth per agent (empty in blackboard mode, which has no queues)"""
+        if hasattr(self.current_communicator, 'get_queue_depths'):
+            return self.current_communicator.get_queue_depths()
+        return {}
     
     def subscribe(self, agent_id: str, topic: str) -> bool:
         """Subscribe to topic (only works for PubSub mode)"""
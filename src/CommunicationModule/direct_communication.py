@@ -1,13 +1,20 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ..message import Message
-from .base_communicator import BaseCommunicator
+from .base_communicator import BaseCommunicator, DEFAULT_MESSAGE_LOG_SIZE
+from .message_queue import BackpressurePolicy, BoundedMessageQueue, DEFAULT_QUEUE_SIZE, QueueStats
 
 class DirectMessenger(BaseCommunicator):
-    """Direct messaging between agents with individual message queues"""
+    """Direct messaging between agents with individual bounded message queues"""
     
-    def __init__(self):
-        super().__init__()
-        self.message_queues: Dict[str, List[Message]] = {}
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 backpressure: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST, block_timeout: float = 1.0,
+                 message_log_size: int = DEFAULT_MESSAGE_LOG_SIZE):
+        super().__init__(message_log_size)
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.queue_stats = QueueStats()
+        self.message_queues: Dict[str, BoundedMessageQueue] = {}
     
     def register_agent(self, agent) -> bool:
         """Register an agent and create their message queue"""
@@ -15,38 +22,60 @@ class DirectMessenger(BaseCommunicator):
 
         if agent_id not in self.agents:
             self.agents[agent_id] = agent
-            self.message_queues[agent_id] = []
+            self.message_queues[agent_id] = BoundedMessageQueue(self.queue_size, self.backpressure,
+                                                                self.block_timeout, self.queue_stats)
             return True
         return False
     
     def send(self, message: Message) -> bool:
         """Send direct message to specific recipient"""
         try:
-
-            if message.recipient_id == "all":
-                # Broadcast to all agents
-                for agent_id in self.message_queues:
-                    self.message_queues[agent_id].append(message)
-                    self.message_log.append(message)
-                return True
-            # Send to specific recipient
-            if message.recipient_id in self.message_queues:
-                self.message_queues[message.recipient_id].append(message)
-                self.message_log.append(message)
-                return True
-            else:
-                print(f"Recipient {message.recipient_id} not found")
+            queues = self._target_queues(message)
+            if queues is None:
                 return False
+            return self._record_delivery(message, [queue.put(message) for queue in queues])
         except Exception as e:
             print(f"Error sending direct message: {e}")
             return False
     
+    async def asend(self, message: Message) -> bool:
+        """send() for coroutines: full BLOCK queues are awaited instead of blocking the event loop"""
+        try:
+            queues = self._target_queues(message)
+            if queues is None:
+                return False
+            return self._record_delivery(message, [await queue.aput(message) for queue in queues])
+        except Exception as e:
+            print(f"Error sending direct message: {e}")
+            return False
+    
+    def _target_queues(self, message: Message) -> Optional[List[BoundedMessageQueue]]:
+        if message.recipient_id == "all":
+            # Broadcast to all agents
+            return list(self.message_queues.values())
+        if message.recipient_id in self.message_queues:
+            return [self.message_queues[message.recipient_id]]
+        print(f"Recipient {message.recipient_id} not found")
+        return None
+    
+    def _record_delivery(self, message: Message, accepted: List[bool]) -> bool:
+        # A broadcast is logged once per recipient and always succeeds; a direct send
+        # fails if the recipient's full queue rejected the message
+        self.message_log.extend(message for _ in accepted)
+        return message.recipient_id == "all" or all(accepted)
+    
     def receive(self, agent_id: str) -> List[Message]:
         """Get messages from agent's personal queue"""
         if agent_id not in self.message_queues:
             return []
         
         # Return and clear the agent's message queue
-        messages = self.message_queues[agent_id].copy()
-        self.message_queues[agent_id].clear()
-        return messages
+        return self.message_queues[agent_id].drain()
+    
+    def has_pending(self, agent_id: str) -> bool:
+        queue = self.message_queues.get(agent_id)
+        return queue is not None and len(queue) > 0
+    
+    def get_queue_depths(self) -> Dict[str, int]:
+        """Current number of queued messages per agent"""
+        return {agent_id: len(queue) for agent_id, queue in self.message_queues.items()}
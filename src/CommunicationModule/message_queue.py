@@ -0,0 +1,197 @@
+import asyncio
+import itertools
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, List, Optional
+
+from ..message import Message
+
+
+DEFAULT_QUEUE_SIZE = 1000
+
+
+class BackpressurePolicy(Enum):
+    """What a full agent queue does with the next message"""
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued message
+    DROP_NEWEST = "drop_newest"  # reject the incoming message
+    BLOCK = "block"  # wait for a threaded consumer or in aput() (up to block_timeout), then reject
+    COALESCE_BY_SENDER = "coalesce_by_sender"  # keep only each sender's latest message
+
+
+class QueueStats:
+    """Totals shared by all queues of one communicator (updated incrementally)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.depth = 0
+        self.max_depth = 0
+        self.enqueued = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.block_timeouts = 0
+
+    def record(self, depth_change: int = 0, enqueued: int = 0, dropped: int = 0, coalesced: int = 0,
+               block_timeouts: int = 0) -> None:
+        with self._lock:
+            self.depth += depth_change
+            self.max_depth = max(self.max_depth, self.depth)
+            self.enqueued += enqueued
+            self.dropped += dropped
+            self.coalesced += coalesced
+            self.block_timeouts += block_timeouts
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queue_depth": self.depth,
+                "max_queue_depth": self.max_depth,
+                "messages_enqueued": self.enqueued,
+                "messages_dropped": self.dropped,
+                "messages_coalesced": self.coalesced,
+                "block_timeouts": self.block_timeouts
+            }
+
+
+class BoundedMessageQueue:
+    """
+    Per-agent message queue with a fixed capacity and a backpressure policy.
+
+    Messages are kept in insertion order under a sequence number, so the oldest can be
+    evicted and a sender's pending message can be replaced (COALESCE_BY_SENDER) in O(1).
+
+    BLOCK only waits when the producer and the consumer run on different threads: a
+    synchronous put() on an event-loop thread would stall the very loop that has to
+    drain the queue, so it is rejected there. Async producers use aput(), which awaits
+    space without blocking the loop.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE,
+                 policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+                 block_timeout: float = 1.0, stats: Optional[QueueStats] = None):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.stats = stats or QueueStats()
+        self._messages: "OrderedDict[int, Message]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._pending_by_sender: Dict[str, int] = {}  # sender -> sequence number (coalescing only)
+        self._not_full = threading.Condition()
+        self._space_waiters: List[asyncio.Future] = []
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def put(self, message: Message) -> bool:
+        """Enqueue a message; False if the policy rejected it"""
+        with self._not_full:
+            if self._coalesce(message):
+                return True
+
+            if len(self._messages) >= self.maxsize:
+                if self.policy == BackpressurePolicy.DROP_NEWEST or self.maxsize <= 0:
+                    self.stats.record(dropped=1)
+                    return False
+                if self.policy == BackpressurePolicy.BLOCK:
+                    if _on_event_loop():
+                        print("Queue full: BLOCK cannot wait on the event loop thread (use asend), message dropped")
+                        self.stats.record(dropped=1)
+                        return False
+                    if not self._not_full.wait_for(lambda: len(self._messages) < self.maxsize,
+                                                   timeout=self.block_timeout):
+                        self.stats.record(dropped=1, block_timeouts=1)
+                        return False
+                else:
+                    self._evict_oldest()
+
+            self._append(message)
+            return True
+
+    async def aput(self, message: Message) -> bool:
+        """
+        put() for coroutines: with the BLOCK policy a full queue is awaited (up to
+        block_timeout) instead of blocking the thread; other policies never wait
+        """
+        if self.policy != BackpressurePolicy.BLOCK:
+            return self.put(message)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.block_timeout
+        while True:
+            with self._not_full:
+                if len(self._messages) < self.maxsize:
+                    self._append(message)
+                    return True
+                if self.maxsize <= 0:
+                    self.stats.record(dropped=1)
+                    return False
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.stats.record(dropped=1, block_timeouts=1)
+                    return False
+                waiter = loop.create_future()
+                self._space_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._not_full:
+                    if waiter in self._space_waiters:
+                        self._space_waiters.remove(waiter)
+
+    def _coalesce(self, message: Message) -> bool:
+        """Replace the sender's pending message (moving it to the back); False if there is none"""
+        if self.policy != BackpressurePolicy.COALESCE_BY_SENDER:
+            return False
+        sequence = self._pending_by_sender.get(message.agent_id)
+        if sequence is None:
+            return False
+        del self._messages[sequence]
+        self._store(message)
+        self.stats.record(coalesced=1)
+        return True
+
+    def _append(self, message: Message) -> None:
+        self._store(message)
+        self.stats.record(depth_change=1, enqueued=1)
+
+    def _store(self, message: Message) -> None:
+        sequence = next(self._sequence)
+        self._messages[sequence] = message
+        if self.policy == BackpressurePolicy.COALESCE_BY_SENDER:
+            self._pending_by_sender[message.agent_id] = sequence
+
+    def _evict_oldest(self) -> None:
+        _, evicted = self._messages.popitem(last=False)
+        self._pending_by_sender.pop(evicted.agent_id, None)
+        self.stats.record(depth_change=-1, dropped=1)
+
+    def drain(self) -> List[Message]:
+        """Remove and return every queued message, oldest first"""
+        with self._not_full:
+            messages = list(self._messages.values())
+            self._messages.clear()
+            self._pending_by_sender.clear()
+            self.stats.record(depth_change=-len(messages))
+            self._not_full.notify_all()
+            waiters, self._space_waiters = self._space_waiters, []
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+        return messages
+
+    def clear(self) -> None:
+        self.drain()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(True)
@@ -1,76 +1,126 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
-from .base_communicator import BaseCommunicator
+from .base_communicator import BaseCommunicator, DEFAULT_MESSAGE_LOG_SIZE
+from .message_queue import BackpressurePolicy, BoundedMessageQueue, DEFAULT_QUEUE_SIZE, QueueStats
+from .topic_trie import TopicTrie
 from ..message import Message
 
 
 
 
 class PubSubCommunicator(BaseCommunicator):
-    """Publish-Subscribe communication with topic-based messaging"""
+    """
+    Publish-Subscribe communication with topic-based messaging.
+    Topics are dotted hierarchies (`analysis.math.algebra`); subscriptions may use
+    `*` (one segment) and `#` (zero or more segments) wildcards.
+    """
     
-    def __init__(self):
-        super().__init__()
-        self.message_queues: Dict[str, List[Message]] = {}
-        self.topics: Dict[str, Set[str]] = {}  # topic -> set of subscribed agent_ids
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 backpressure: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST, block_timeout: float = 1.0,
+                 message_log_size: int = DEFAULT_MESSAGE_LOG_SIZE):
+        super().__init__(message_log_size)
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.queue_stats = QueueStats()
+        self.message_queues: Dict[str, BoundedMessageQueue] = {}
+        self.topics: Dict[str, Set[str]] = {}  # topic pattern -> set of subscribed agent_ids
+        self.agent_topics: Dict[str, Dict[str, None]] = {}  # agent_id -> its topic patterns, in subscription order
+        self.subscription_trie = TopicTrie()
     
     def register_agent(self, agent) -> bool:
         """Register an agent and create their message queue"""
         agent_id = agent.get_id()
         if agent_id not in self.agents:
             self.agents[agent_id] = agent
-            self.message_queues[agent_id] = []
+            self.message_queues[agent_id] = BoundedMessageQueue(self.queue_size, self.backpressure,
+                                                                self.block_timeout, self.queue_stats)
             return True
         return False
     
     def send(self, message: Message) -> bool:
         """Publish message to all subscribers of the topic"""
         try:
-            # Extract topic from your Message structure
-            topic = self._get_topic_from_message(message)
-            
-            if topic in self.topics:
-                subscribers = self.topics[topic]
-                for subscriber_id in subscribers:
-                    if subscriber_id != message.agent_id:  # Don't send to sender (using agent_id)
-                        self.message_queues[subscriber_id].append(message)
-                
-                self.message_log.append(message)
-                return True
-            else:
-                print(f"No subscribers for topic: {topic}")
+            queues = self._subscriber_queues(message)
+            if queues is None:
                 return False
+            for queue in queues:
+                queue.put(message)
+            self.message_log.append(message)
+            return True
+        except Exception as e:
+            print(f"Error publishing message: {e}")
+            return False
+    
+    async def asend(self, message: Message) -> bool:
+        """send() for coroutines: full BLOCK queues are awaited instead of blocking the event loop"""
+        try:
+            queues = self._subscriber_queues(message)
+            if queues is None:
+                return False
+            for queue in queues:
+                await queue.aput(message)
+            self.message_log.append(message)
+            return True
         except Exception as e:
             print(f"Error publishing message: {e}")
             return False
     
+    def _subscriber_queues(self, message: Message) -> Optional[List[BoundedMessageQueue]]:
+        # Extract topic from your Message structure
+        topic = self._get_topic_from_message(message)
+        
+        subscribers = self.subscription_trie.match(topic)
+        if not subscribers:
+            print(f"No subscribers for topic: {topic}")
+            return None
+        # Don't send to sender (using agent_id)
+        return [self.message_queues[subscriber_id] for subscriber_id in subscribers
+                if subscriber_id != message.agent_id]
+    
     def receive(self, agent_id: str) -> List[Message]:
         """Get messages from agent's subscription queue"""
         if agent_id not in self.message_queues:
             return []
         
         # Return and clear the agent's message queue
-        messages = self.message_queues[agent_id].copy()
-        self.message_queues[agent_id].clear()
-        return messages
+        return self.message_queues[agent_id].drain()
+    
+    def has_pending(self, agent_id: str) -> bool:
+        queue = self.message_queues.get(agent_id)
+        return queue is not None and len(queue) > 0
+    
+    def get_queue_depths(self) -> Dict[str, int]:
+        """Current number of queued messages per agent"""
+        return {agent_id: len(queue) for agent_id, queue in self.message_queues.items()}
     
     def subscribe(self, agent_id: str, topic: str) -> bool:
-        """Subscribe agent to a topic"""
+        """Subscribe agent to a topic or wildcard pattern (e.g. `analysis.*`, `analysis.#`)"""
         if agent_id not in self.agents:
             return False
         
+        if not self.subscription_trie.add(topic, agent_id):
+            print(f"Invalid topic pattern: {topic!r}")
+            return False
+        
         if topic not in self.topics:
             self.topics[topic] = set()
         
         self.topics[topic].add(agent_id)
+        self.agent_topics.setdefault(agent_id, {})[topic] = None
         return True
     
     def unsubscribe(self, agent_id: str, topic: str) -> bool:
-        """Unsubscribe agent from a topic"""
+        """Unsubscribe agent from a topic or wildcard pattern"""
         if topic in self.topics and agent_id in self.topics[topic]:
             self.topics[topic].remove(agent_id)
             if not self.topics[topic]:  # Remove empty topic
                 del self.topics[topic]
+            self.subscription_trie.remove(topic, agent_id)
+            agent_topics = self.agent_topics[agent_id]
+            agent_topics.pop(topic, None)
+            if not agent_topics:
+                del self.agent_topics[agent_id]
             return True
         return False
     
@@ -97,13 +147,13 @@ class PubSubCommunicator(BaseCommunicator):
         return list(self.topics.keys())
     
     def get_subscribers(self, topic: str) -> Set[str]:
-        """Get all subscribers for a specific topic"""
+        """Get all subscribers of a specific topic pattern (exact subscription only)"""
         return self.topics.get(topic, set()).copy()
     
+    def get_matching_subscribers(self, topic: str) -> Set[str]:
+        """Get every agent a message published on this topic would reach (wildcards included)"""
+        return set(self.subscription_trie.match(topic))
+    
     def get_agent_subscriptions(self, agent_id: str) -> List[str]:
         """Get all topics that an agent is subscribed to"""
-        subscribed_topics = []
-        for topic, subscribers in self.topics.items():
-            if agent_id in subscribers:
-                subscribed_topics.append(topic)
-        return subscribed_topics
\ No newline at end of file
+        return list(self.agent_topics.get(agent_id, {}))
\ No newline at end of file
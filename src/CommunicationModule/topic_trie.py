@@ -0,0 +1,115 @@
+from typing import Dict, FrozenSet, List, Optional, Set
+
+
+SEPARATOR = "."
+SINGLE_WILDCARD = "*"  # exactly one segment
+MULTI_WILDCARD = "#"  # zero or more segments
+
+
+def split_topic(topic: str) -> Optional[List[str]]:
+    """Segments of a dotted topic, or None if it has an empty segment"""
+    segments = topic.split(SEPARATOR)
+    if not all(segments):
+        return None
+    return segments
+
+
+class _TopicNode:
+    __slots__ = ("children", "subscribers")
+
+    def __init__(self):
+        self.children: Dict[str, "_TopicNode"] = {}
+        self.subscribers: Set[str] = set()
+
+
+class TopicTrie:
+    """
+    Subscription patterns stored segment by segment.
+
+    Patterns are dotted topics (`analysis.math.algebra`) where a `*` segment matches
+    exactly one segment and a `#` segment matches zero or more. Matching a published
+    topic only walks the branches that can match it, so its cost depends on the
+    topic's depth and the wildcards along the way, not on how many patterns exist.
+    Results are cached per topic until the subscriptions change.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self._root = _TopicNode()
+        self._cache: Dict[str, FrozenSet[str]] = {}
+        self.cache_size = cache_size
+
+    def add(self, pattern: str, agent_id: str) -> bool:
+        """Subscribe an agent to a pattern; False if the pattern is malformed"""
+        segments = split_topic(pattern)
+        if segments is None:
+            return False
+        node = self._root
+        for segment in segments:
+            node = node.children.setdefault(segment, _TopicNode())
+        node.subscribers.add(agent_id)
+        self._cache.clear()
+        return True
+
+    def remove(self, pattern: str, agent_id: str) -> bool:
+        """Unsubscribe an agent from a pattern, pruning branches left empty"""
+        segments = split_topic(pattern)
+        if segments is None:
+            return False
+        path = [self._root]
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return False
+            path.append(node)
+        if agent_id not in path[-1].subscribers:
+            return False
+
+        path[-1].subscribers.discard(agent_id)
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.subscribers or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+        self._cache.clear()
+        return True
+
+    def match(self, topic: str) -> FrozenSet[str]:
+        """Agents subscribed to any pattern matching the published topic"""
+        matched = self._cache.get(topic)
+        if matched is None:
+            matched = frozenset(self._match(topic.split(SEPARATOR)))
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[topic] = matched
+        return matched
+
+    def _match(self, segments: List[str]) -> Set[str]:
+        matched: Set[str] = set()
+        seen = set()
+
+        def walk(node: _TopicNode, index: int) -> None:
+            # Several `#` paths can reach the same (node, index) pair; walk it once
+            if (id(node), index) in seen:
+                return
+            seen.add((id(node), index))
+
+            multi = node.children.get(MULTI_WILDCARD)
+            if multi is not None:
+                for end in range(index, len(segments) + 1):
+                    walk(multi, end)
+            if index == len(segments):
+                matched.update(node.subscribers)
+                return
+            exact = node.children.get(segments[index])
+            if exact is not None:
+                walk(exact, index + 1)
+            single = node.children.get(SINGLE_WILDCARD)
+            if single is not None:
+                walk(single, index + 1)
+
+        walk(self._root, 0)
+        return matched
+
+    def clear(self) -> None:
+        self._root = _TopicNode()
+        self._cache.clear()
@@ -0,0 +1,58 @@
+from bisect import bisect_left
+from typing import List
+
+from src.LLMModule.context_builder import estimate_tokens
+
+
+class TranscriptCache:
+    """
+    Rendered conversation transcript, built incrementally.
+    Each message is formatted and token-counted once when it is appended; the full
+    text is joined at most once per change, and token-bounded tail windows are found
+    by bisecting the running token totals.
+    """
+
+    def __init__(self, header: str = ""):
+        self.header = header
+        self._lines: List[str] = []
+        # _token_totals[i] = tokens of lines[0:i]
+        self._token_totals: List[int] = [0]
+        self._text = header
+        self._joined_lines = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    @property
+    def total_tokens(self) -> int:
+        return self._token_totals[-1]
+
+    def append(self, line: str) -> None:
+        """Add one rendered message"""
+        self._lines.append(line)
+        self._token_totals.append(self._token_totals[-1] + estimate_tokens(line))
+
+    def text(self) -> str:
+        """Header plus every rendered message (only lines added since the last call are joined)"""
+        if self._joined_lines < len(self._lines):
+            self._text += "".join(self._lines[self._joined_lines:])
+            self._joined_lines = len(self._lines)
+        return self._text
+
+    def tail_lines(self, max_tokens: int) -> List[str]:
+        """Newest rendered messages whose tokens fit in max_tokens (whole messages only)"""
+        if max_tokens <= 0 or not self._lines:
+            return []
+        # First line i such that tokens of lines[i:] <= max_tokens
+        first = bisect_left(self._token_totals, self.total_tokens - max_tokens)
+        return self._lines[first:]
+
+    def tail(self, max_tokens: int) -> str:
+        """Header plus the newest messages fitting in max_tokens"""
+        return self.header + "".join(self.tail_lines(max_tokens))
+
+    def clear(self) -> None:
+        self._lines = []
+        self._token_totals = [0]
+        self._text = self.header
+        self._joined_lines = 0
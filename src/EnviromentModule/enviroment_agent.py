@@ -5,7 +5,9 @@ from langchain_core.messages import BaseMessage, HumanMessage
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 
-from src.clients import get_nvidia_llm
+from src.LLMModule.backends import LLMBackend, get_llm_backend
+from src.LLMModule.context_builder import estimate_tokens
+from src.LLMModule.rate_limiter import get_llm_governor
 from .tools import utils as tool_utils
 
 # Configure logging
@@ -23,13 +25,17 @@ class EnviromentAgent:
     A LangGraph agent for handling environment-related tool operations.
     This agent manages tool execution for the action executor.
     """
-    def __init__(self):
+    def __init__(self, backend: LLMBackend = None):
         """
         Initializes the agent with a set of tools and a language model.
+
+        Args:
+            backend: Completion backend providing the chat model (defaults to the process-wide one)
         """
         logger.info("Initializing Environment Agent...")
         self.tools = tool_utils.AGENT_TOOLS
-        self.llm   = get_nvidia_llm()
+        self.backend = backend or get_llm_backend()
+        self.llm   = self.backend.chat_model()
 
         self.system_prompt = self._create_system_prompt()
 
@@ -107,7 +113,13 @@ class EnviromentAgent:
         """
         logger.debug("Executing agent node - invoking model...")
         print("---AGENT NODE---")
-        response = self.model.invoke(state["messages"])
+        # Shares the process-wide LLM quota with the other agents
+        estimated_tokens = sum(estimate_tokens(str(message.content)) for message in state["messages"])
+        response = get_llm_governor().call(
+            lambda: self.model.invoke(state["messages"]),
+            estimated_tokens=estimated_tokens + 512,
+            usage_of=lambda result: (getattr(result, "usage_metadata", None) or {}).get("total_tokens")
+        )
         logger.debug("Model response received")
         return {"messages": [response]}
 
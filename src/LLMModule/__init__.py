@@ -0,0 +1,39 @@
+"""
+LLM Module for CollabArena
+Infrastructure around LLM calls shared by every agent: response caching, prompt context assembly, streaming,
+the shared rate limiter / concurrency governor, single-flight request coalescing, hedged requests
+and the pluggable completion backends (NVIDIA endpoint or a local fake for load testing)
+"""
+
+from .response_cache import LLMResponseCache, set_default_response_cache, get_default_response_cache
+from .context_builder import ContextBuilder, ContextSection, BuiltContext, estimate_tokens
+from .streaming import JSONObjectStream, GenerationMetrics
+from .rate_limiter import LLMGovernor, get_llm_governor, configure_llm_governor
+from .single_flight import SingleFlight, get_single_flight
+from .hedging import HedgingPolicy
+from .backends import (LLMBackend, OpenAIBackend, FakeLLMBackend, FakeBackendError,
+                       set_llm_backend, get_llm_backend)
+
+__all__ = [
+    'LLMResponseCache',
+    'set_default_response_cache',
+    'get_default_response_cache',
+    'ContextBuilder',
+    'ContextSection',
+    'BuiltContext',
+    'estimate_tokens',
+    'JSONObjectStream',
+    'GenerationMetrics',
+    'LLMGovernor',
+    'get_llm_governor',
+    'configure_llm_governor',
+    'SingleFlight',
+    'get_single_flight',
+    'HedgingPolicy',
+    'LLMBackend',
+    'OpenAIBackend',
+    'FakeLLMBackend',
+    'FakeBackendError',
+    'set_llm_backend',
+    'get_llm_backend'
+]
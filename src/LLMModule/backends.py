@@ -0,0 +1,319 @@
+"""
+LLM Backends for CollabArena
+Pluggable completion backends: the NVIDIA (OpenAI-compatible) endpoint and a
+deterministic local stand-in for load testing without a network
+"""
+
+import asyncio
+import random
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice, ChoiceDelta
+
+from src.clients import get_async_llm_client, get_llm, get_llm_client, get_nvidia_llm
+from .context_builder import estimate_tokens
+
+
+class LLMBackend:
+    """
+    Interface every completion backend implements.
+    Completions and stream chunks use the OpenAI chat completion types, so callers
+    read content and usage the same way whatever the backend.
+    """
+
+    name = "base"
+    model = None
+
+    def complete(self, messages: List[Dict[str, str]], model: str = None, temperature: float = 0) -> ChatCompletion:
+        """Run a blocking chat completion"""
+        raise NotImplementedError
+
+    async def acomplete(self, messages: List[Dict[str, str]], model: str = None,
+                        temperature: float = 0) -> ChatCompletion:
+        """Awaitable chat completion"""
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict[str, str]], model: str = None,
+               temperature: float = 0) -> Iterator[ChatCompletionChunk]:
+        """Stream a chat completion; the last chunk carries the usage"""
+        raise NotImplementedError
+
+    def astream(self, messages: List[Dict[str, str]], model: str = None,
+                temperature: float = 0) -> AsyncIterator[ChatCompletionChunk]:
+        """Async iterator over the chunks of a streamed chat completion"""
+        raise NotImplementedError
+
+    def chat_model(self) -> BaseChatModel:
+        """LangChain chat model (with tool binding) for LangGraph agents such as the EnviromentAgent"""
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    Backend for the NVIDIA OpenAI-compatible endpoint.
+    Clients come from the shared pooled client registry and are resolved lazily,
+    so constructing an agent does not need credentials.
+    """
+
+    name = "openai"
+
+    def __init__(self, model: str = None):
+        self.model = model or get_llm()
+
+    def complete(self, messages, model=None, temperature=0):
+        return get_llm_client().chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=temperature,
+        )
+
+    async def acomplete(self, messages, model=None, temperature=0):
+        # Async clients are bound to an event loop, so resolve the shared one per call
+        return await get_async_llm_client().chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=temperature,
+        )
+
+    def stream(self, messages, model=None, temperature=0):
+        return get_llm_client().chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+    async def astream(self, messages, model=None, temperature=0):
+        stream = await get_async_llm_client().chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            yield chunk
+
+    def chat_model(self):
+        return get_nvidia_llm()
+
+
+class FakeBackendError(Exception):
+    """Injected transient failure (looks like a 503 to the LLM governor)"""
+
+    def __init__(self, message: str = "fake backend unavailable"):
+        super().__init__(message)
+        self.status_code = 503
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Deterministic local stand-in for the LLM endpoint.
+    Returns scripted responses (cycled in order, or computed by a callable) or a
+    template, after a simulated latency, padded to a sampled completion length.
+    With a fixed seed the same sequence of calls yields the same responses, latencies
+    and token counts, so framework overhead can be measured without a network.
+    """
+
+    name = "fake"
+
+    DEFAULT_TEMPLATE = "Response {n} from {model}: acknowledged '{prompt}'."
+
+    def __init__(self, responses: Union[Sequence[str], Callable[[List[Dict[str, str]]], str]] = None,
+                 template: str = DEFAULT_TEMPLATE, latency: float = 0.0, latency_jitter: float = 0.0,
+                 output_tokens: Tuple[int, int] = None, error_rate: float = 0.0,
+                 chunk_tokens: int = 4, seed: int = 0, model: str = "fake-llm"):
+        """
+        Args:
+            responses: Scripted responses cycled in order, or a callable building one from the messages
+            template: Used without a script; formatted with n, model and prompt (start of the last message)
+            latency: Mean simulated latency in seconds
+            latency_jitter: Standard deviation of the latency (gaussian, clipped at 0)
+            output_tokens: Optional (min, max) completion length; shorter responses are padded up to it
+            error_rate: Probability of raising FakeBackendError instead of answering
+            chunk_tokens: Words per chunk when streaming
+            seed: Seed of the random generator behind latencies, lengths and errors
+            model: Model name reported in completions
+        """
+        self.responses = responses
+        self.template = template
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.chunk_tokens = max(chunk_tokens, 1)
+        self.model = model
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'streamed_calls': 0,
+            'errors': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'simulated_latency_total': 0.0
+        }
+
+    # Response planning
+    def _plan(self, messages: List[Dict[str, str]], streamed: bool = False) -> Tuple[str, float, CompletionUsage]:
+        """Pick the response text, latency and usage of the next call (raises injected errors)"""
+        with self._lock:
+            n = self.stats['calls'] + 1
+            self.stats['calls'] = n
+            if streamed:
+                self.stats['streamed_calls'] += 1
+
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                raise FakeBackendError()
+
+            latency = max(self._random.gauss(self.latency, self.latency_jitter) if self.latency_jitter
+                          else self.latency, 0.0)
+            target_tokens = self._random.randint(*self.output_tokens) if self.output_tokens else None
+
+        text = self._response_text(messages, n)
+        completion_tokens = estimate_tokens(text)
+        if target_tokens is not None and target_tokens > completion_tokens:
+            text = self._pad(text, target_tokens - completion_tokens)
+            completion_tokens = target_tokens
+
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        with self._lock:
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+            self.stats['simulated_latency_total'] += latency
+
+        usage = CompletionUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                total_tokens=prompt_tokens + completion_tokens)
+        return text, latency, usage
+
+    def _response_text(self, messages: List[Dict[str, str]], n: int) -> str:
+        if callable(self.responses):
+            return self.responses(messages)
+        if self.responses:
+            return self.responses[(n - 1) % len(self.responses)]
+        last = messages[-1].get("content") or "" if messages else ""
+        return self.template.format(n=n, model=self.model, prompt=" ".join(last.split()[:8]))
+
+    @staticmethod
+    def _pad(text: str, missing_tokens: int) -> str:
+        """Append roughly missing_tokens filler words (usage reports the sampled length)"""
+        return text + " " + " ".join(["lorem"] * missing_tokens)
+
+    def _completion(self, text: str, usage: CompletionUsage, model: str = None) -> ChatCompletion:
+        return ChatCompletion(
+            id=f"fake-{uuid.uuid4().hex[:12]}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=model or self.model,
+            choices=[Choice(index=0, finish_reason="stop",
+                            message=ChatCompletionMessage(role="assistant", content=text))],
+            usage=usage
+        )
+
+    def _chunks(self, text: str, usage: CompletionUsage, model: str = None) -> List[ChatCompletionChunk]:
+        completion_id = f"fake-{uuid.uuid4().hex[:12]}"
+        words = text.split(" ")
+        pieces = [" ".join(words[i:i + self.chunk_tokens]) for i in range(0, len(words), self.chunk_tokens)]
+        pieces = [piece if i == 0 else " " + piece for i, piece in enumerate(pieces)]
+
+        def chunk(choices, chunk_usage=None):
+            return ChatCompletionChunk(id=completion_id, object="chat.completion.chunk", created=int(time.time()),
+                                       model=model or self.model, choices=choices, usage=chunk_usage)
+
+        chunks = [chunk([ChunkChoice(index=0, delta=ChoiceDelta(content=piece))]) for piece in pieces]
+        # Final usage-only chunk, as sent with stream_options={"include_usage": True}
+        chunks.append(chunk([], usage))
+        return chunks
+
+    # LLMBackend interface
+    def complete(self, messages, model=None, temperature=0):
+        text, latency, usage = self._plan(messages)
+        if latency:
+            time.sleep(latency)
+        return self._completion(text, usage, model)
+
+    async def acomplete(self, messages, model=None, temperature=0):
+        text, latency, usage = self._plan(messages)
+        if latency:
+            await asyncio.sleep(latency)
+        return self._completion(text, usage, model)
+
+    def stream(self, messages, model=None, temperature=0):
+        text, latency, usage = self._plan(messages, streamed=True)
+        if latency:
+            # Time to first token
+            time.sleep(latency)
+        return iter(self._chunks(text, usage, model))
+
+    async def astream(self, messages, model=None, temperature=0):
+        text, latency, usage = self._plan(messages, streamed=True)
+        if latency:
+            await asyncio.sleep(latency)
+        for chunk in self._chunks(text, usage, model):
+            yield chunk
+
+    def chat_model(self):
+        return FakeChatModel(backend=self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Call counts, simulated tokens and latency"""
+        with self._lock:
+            return dict(self.stats)
+
+
+class FakeChatModel(BaseChatModel):
+    """LangChain chat model answering from a FakeLLMBackend (never requests tools)"""
+
+    backend: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "collab-arena-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs) -> ChatResult:
+        completion = self.backend.complete([{"role": m.type, "content": str(m.content)} for m in messages])
+        usage = completion.usage
+        message = AIMessage(
+            content=completion.choices[0].message.content,
+            usage_metadata={
+                "input_tokens": usage.prompt_tokens,
+                "output_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+_default_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+
+def set_llm_backend(backend: Optional[LLMBackend]) -> None:
+    """Set the backend used by agents created without an explicit one (None restores the endpoint)"""
+    global _default_backend
+    with _backend_lock:
+        _default_backend = backend
+
+
+def get_llm_backend() -> LLMBackend:
+    """Get the process-wide default backend (the NVIDIA endpoint unless set_llm_backend was called)"""
+    global _default_backend
+    with _backend_lock:
+        if _default_backend is None:
+            _default_backend = OpenAIBackend()
+        return _default_backend
@@ -0,0 +1,145 @@
+"""
+Context Builder for CollabArena
+Packs prompt sections by priority into a per-model token budget,
+keeping whole items and recording what had to be dropped
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# Context window (in tokens) of the models used by CollabArena
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "qwen/qwen3-235b-a22b": 32768,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local token estimate (no tokenizer download needed).
+    Counts words and punctuation, and falls back to ~4 characters per token
+    for long words and non-latin text.
+    """
+    if not text:
+        return 0
+    pieces = len(_TOKEN_PATTERN.findall(text))
+    return max(pieces, math.ceil(len(text) / 4))
+
+
+@dataclass
+class ContextSection:
+    """A prompt section made of whole items, packed according to its priority"""
+    name: str
+    items: List[str]
+    priority: int
+    header: str = ""
+    required: bool = False  # required sections are truncated instead of dropped
+    token_counts: Optional[List[int]] = None  # precomputed estimate_tokens of each item
+
+
+@dataclass
+class BuiltContext:
+    """Result of packing sections into the token budget"""
+    text: str
+    token_count: int
+    budget: int
+    dropped_items: List[Dict[str, object]] = field(default_factory=list)
+
+
+class ContextBuilder:
+    """
+    Token-budgeted context assembly.
+    Sections are filled in priority order (lower value first); inside a section the
+    newest (last) items are kept first and whole items are never cut in half.
+    """
+
+    def __init__(self, model: str, max_context_tokens: Optional[int] = 6000,
+                 reserve_output_tokens: int = 2048):
+        """
+        Args:
+            model: Model name used to look up its context window
+            max_context_tokens: Upper bound for the prompt, keeps prompts small and predictable
+            reserve_output_tokens: Tokens left free for the completion
+        """
+        self.model = model
+        window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+        self.budget = window - reserve_output_tokens
+        if max_context_tokens is not None:
+            self.budget = min(self.budget, max_context_tokens)
+
+    def build(self, sections: List[ContextSection], reserved_tokens: int = 0) -> BuiltContext:
+        """
+        Pack sections into the budget
+
+        Args:
+            sections: Sections in display order
+            reserved_tokens: Tokens already used elsewhere in the request (e.g. system prompt)
+
+        Returns:
+            BuiltContext with the assembled text and the dropped items
+        """
+        remaining = max(self.budget - reserved_tokens, 0)
+        kept: Dict[str, List[str]] = {}
+        dropped: List[Dict[str, object]] = []
+
+        for section in sorted(sections, key=lambda s: s.priority):
+            kept_items: List[str] = []
+            header_cost = estimate_tokens(section.header)
+
+            counts = section.token_counts
+            for index in range(len(section.items) - 1, -1, -1):
+                item = section.items[index]
+                item_cost = counts[index] if counts is not None else estimate_tokens(item)
+                cost = item_cost + (header_cost if not kept_items else 0)
+
+                if cost <= remaining:
+                    kept_items.append(item)
+                    remaining -= cost
+                elif section.required and not kept_items:
+                    item = self._truncate(item, remaining - header_cost)
+                    kept_items.append(item)
+                    remaining -= estimate_tokens(item) + header_cost
+                else:
+                    # Keep a contiguous tail: everything older than this item goes too
+                    for dropped_index in range(index, -1, -1):
+                        dropped.append({
+                            'section': section.name,
+                            'index': dropped_index,
+                            'tokens': (counts[dropped_index] if counts is not None
+                                       else estimate_tokens(section.items[dropped_index])),
+                            'preview': section.items[dropped_index][:60]
+                        })
+                    break
+
+            kept[section.name] = list(reversed(kept_items))
+
+        parts = []
+        for section in sections:
+            items = kept.get(section.name)
+            if not items:
+                continue
+            if section.header:
+                parts.append(section.header)
+            parts.extend(items)
+
+        text = "\n".join(parts)
+        return BuiltContext(
+            text=text,
+            token_count=estimate_tokens(text),
+            budget=self.budget,
+            dropped_items=dropped
+        )
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut a required item so that it fits, keeping its beginning"""
+        if max_tokens <= 0:
+            return ""
+        max_chars = max_tokens * 4
+        while max_chars > 0 and estimate_tokens(text[:max_chars]) > max_tokens:
+            max_chars = int(max_chars * 0.8)
+        return text[:max_chars]
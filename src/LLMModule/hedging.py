@@ -0,0 +1,125 @@
+"""
+Hedged LLM Requests for CollabArena
+A duplicate request is fired when an async call runs longer than a percentile of
+recent latencies; whichever finishes first is used and the other is cancelled.
+Blocking callers are hedged by running the async request on a shared background loop
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .streaming import percentile
+
+
+class HedgingPolicy:
+    """
+    Opt-in tail-latency hedging for deterministic (temperature-0) calls.
+    Once enough latencies have been observed, a call that has not returned after
+    the configured percentile of them gets one duplicate; the first successful
+    result wins and the loser is cancelled (freeing its governor slot).
+    Blocking callers use call(), which runs the async request on a background event
+    loop instead of racing two threads, since a losing thread could not be cancelled.
+    """
+
+    def __init__(self, latency_percentile: float = 95, min_samples: int = 20, min_delay: float = 0.05,
+                 max_delay: Optional[float] = None):
+        """
+        Args:
+            latency_percentile: Percentile of recent latencies after which the hedge is fired
+            min_samples: Latencies needed before hedging starts
+            min_delay: Lower bound for the hedge delay in seconds
+            max_delay: Optional upper bound for the hedge delay in seconds
+        """
+        self.latency_percentile = latency_percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'hedged_calls': 0,
+            'hedge_wins': 0
+        }
+
+    def hedge_delay(self, latencies: List[float]) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little history"""
+        if len(latencies) < self.min_samples:
+            return None
+        delay = max(percentile(latencies, self.latency_percentile), self.min_delay)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], latencies: List[float]) -> Tuple[Any, bool]:
+        """
+        Run an async call with a hedge; the losing request is cancelled
+
+        Returns:
+            (result, hedged) where hedged is True when the duplicate request won
+        """
+        delay = self.hedge_delay(latencies)
+        self._count('calls')
+        if delay is None:
+            return await fn(), False
+
+        primary = asyncio.ensure_future(fn())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result(), False
+
+        self._count('hedged_calls')
+        hedge = asyncio.ensure_future(fn())
+        attempts = {primary: False, hedge: True}
+        pending = set(attempts)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        return self._won(task.result(), attempts[task])
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+        raise primary.exception()
+
+    def call(self, fn: Callable[[], Awaitable[Any]], latencies: List[float]) -> Tuple[Any, bool]:
+        """
+        Blocking version of acall(): the hedged async call runs on the shared
+        background event loop and the calling thread waits for the winner
+        """
+        return asyncio.run_coroutine_threadsafe(self.acall(fn, latencies), _background_loop()).result()
+
+    def _won(self, result: Any, hedged: bool) -> Tuple[Any, bool]:
+        if hedged:
+            self._count('hedge_wins')
+        return result, hedged
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hedging statistics"""
+        with self._lock:
+            calls = self.stats['calls']
+            return {
+                **self.stats,
+                'hedge_rate': self.stats['hedged_calls'] / calls if calls > 0 else 0.0
+            }
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop of the daemon thread running hedged calls for blocking callers"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="hedging-loop", daemon=True).start()
+        return _loop
@@ -0,0 +1,322 @@
+"""
+LLM Governor for CollabArena
+Process-wide rate limiter and concurrency governor shared by every LLM call site
+(agents, orchestrator, action executor and the environment agent)
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Continuously refilling token bucket (capacity per minute)"""
+
+    def __init__(self, per_minute: Optional[float]):
+        self.per_minute = per_minute
+        self.capacity = per_minute or 0
+        self.available = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self.available = min(self.capacity, self.available + elapsed * self.capacity / 60.0)
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 when it is available now)"""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        # Requests larger than the whole bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if self.per_minute:
+            self.available -= amount
+
+
+class LLMGovernor:
+    """
+    Token-bucket governor for requests/minute and tokens/minute with a bounded
+    number of in-flight calls and Retry-After aware exponential backoff with jitter.
+    The time callers spend waiting on the governor is exposed as a metric so that
+    throttling can be told apart from slow model responses.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                 max_in_flight: int = 8, max_retries: int = 4, base_backoff: float = 1.0,
+                 max_backoff: float = 30.0):
+        """
+        Args:
+            requests_per_minute: Request quota (None for unlimited)
+            tokens_per_minute: Token quota (None for unlimited)
+            max_in_flight: Maximum number of concurrent LLM calls
+            max_retries: Retries for rate-limit / transient server errors
+            base_backoff: First backoff delay in seconds
+            max_backoff: Upper bound for a single backoff delay
+        """
+        self._lock = threading.Lock()
+        # Callers waiting for an in-flight slot: threads on the condition, coroutines on futures
+        self._slot_freed = threading.Condition(self._lock)
+        self._async_waiters: List[asyncio.Future] = []
+        self.request_bucket = TokenBucket(None)
+        self.token_bucket = TokenBucket(None)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.configure(requests_per_minute, tokens_per_minute)
+        self.in_flight = 0
+        self.metrics = {
+            'calls': 0,
+            'throttled_calls': 0,
+            'retries': 0,
+            'failed_calls': 0,
+            'wait_time_total': 0.0,
+            'backoff_time_total': 0.0,
+            'max_in_flight_seen': 0
+        }
+
+    def configure(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                  max_in_flight: int = None, max_retries: int = None, base_backoff: float = None,
+                  max_backoff: float = None) -> None:
+        """Change the quotas and retry policy (None leaves a setting unchanged; a quota of 0 removes it)"""
+        with self._lock:
+            if requests_per_minute is not None:
+                self.request_bucket = TokenBucket(requests_per_minute)
+            if tokens_per_minute is not None:
+                self.token_bucket = TokenBucket(tokens_per_minute)
+            if max_in_flight is not None:
+                self.max_in_flight = max_in_flight
+            if max_retries is not None:
+                self.max_retries = max_retries
+            if base_backoff is not None:
+                self.base_backoff = base_backoff
+            if max_backoff is not None:
+                self.max_backoff = max_backoff
+            # A larger in-flight bound may admit waiting callers
+            self._notify_slot_freed()
+
+    # Permits
+    def _try_acquire(self, estimated_tokens: int) -> Optional[float]:
+        """
+        Take a permit if possible (caller holds the lock)
+
+        Returns:
+            0 once acquired, the seconds until the quotas allow the call, or None
+            when every in-flight slot is taken (wait for release())
+        """
+        if self.in_flight >= self.max_in_flight:
+            return None
+        now = time.monotonic()
+        wait = max(self.request_bucket.wait_time(1, now),
+                   self.token_bucket.wait_time(estimated_tokens, now))
+        if wait > 0:
+            return wait
+        self.request_bucket.take(1)
+        self.token_bucket.take(estimated_tokens)
+        self.in_flight += 1
+        self.metrics['max_in_flight_seen'] = max(self.metrics['max_in_flight_seen'], self.in_flight)
+        return 0.0
+
+    def _notify_slot_freed(self) -> None:
+        """Wake every caller waiting for a slot (caller holds the lock); they compete again"""
+        self._slot_freed.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for future in waiters:
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """Block until the call may start; returns the time spent waiting"""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                wait = self._try_acquire(estimated_tokens)
+                if wait is None:
+                    self._slot_freed.wait()
+                    continue
+            if wait == 0:
+                break
+            time.sleep(wait)
+        return self._account_wait(time.monotonic() - started)
+
+    async def aacquire(self, estimated_tokens: int = 0) -> float:
+        """Await until the call may start; returns the time spent waiting"""
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            future = None
+            with self._lock:
+                wait = self._try_acquire(estimated_tokens)
+                if wait is None:
+                    future = loop.create_future()
+                    self._async_waiters.append(future)
+            if future is not None:
+                try:
+                    await future
+                finally:
+                    with self._lock:
+                        if future in self._async_waiters:
+                            self._async_waiters.remove(future)
+                continue
+            if wait == 0:
+                break
+            await asyncio.sleep(wait)
+        return self._account_wait(time.monotonic() - started)
+
+    def release(self, estimated_tokens: int = 0, actual_tokens: Optional[int] = None) -> None:
+        """Free the in-flight slot and charge the token bucket for the real usage"""
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if actual_tokens is not None:
+                self.token_bucket.take(actual_tokens - estimated_tokens)
+            self._notify_slot_freed()
+
+    def _account_wait(self, waited: float) -> float:
+        with self._lock:
+            self.metrics['calls'] += 1
+            self.metrics['wait_time_total'] += waited
+            if waited > 0.001:
+                self.metrics['throttled_calls'] += 1
+        return waited
+
+    # Calls with retry
+    def call(self, fn: Callable[[], Any], estimated_tokens: int = 0,
+             usage_of: Callable[[Any], Optional[int]] = None) -> Any:
+        """
+        Run a blocking LLM call under the governor with retries
+
+        Args:
+            fn: Zero-argument callable performing the request
+            estimated_tokens: Expected prompt + completion tokens
+            usage_of: Optional function reading the real token count from the result
+        """
+        result = self.call_held(fn, estimated_tokens)
+        self.release(estimated_tokens, usage_of(result) if usage_of else None)
+        return result
+
+    def call_held(self, fn: Callable[[], Any], estimated_tokens: int = 0) -> Any:
+        """
+        Like call(), but the in-flight slot stays taken after fn succeeds: for opening a
+        stream, which holds its slot until the last chunk (the caller must release())
+        """
+        attempt = 0
+        while True:
+            self.acquire(estimated_tokens)
+            try:
+                return fn()
+            except Exception as e:
+                self.release(estimated_tokens)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], estimated_tokens: int = 0,
+                    usage_of: Callable[[Any], Optional[int]] = None) -> Any:
+        """Awaitable version of call() for coroutine-returning callables"""
+        result = await self.acall_held(fn, estimated_tokens)
+        self.release(estimated_tokens, usage_of(result) if usage_of else None)
+        return result
+
+    async def acall_held(self, fn: Callable[[], Awaitable[Any]], estimated_tokens: int = 0) -> Any:
+        """Awaitable version of call_held()"""
+        attempt = 0
+        while True:
+            await self.aacquire(estimated_tokens)
+            try:
+                return await fn()
+            except asyncio.CancelledError:
+                # e.g. the losing side of a hedged request
+                self.release(estimated_tokens)
+                raise
+            except Exception as e:
+                self.release(estimated_tokens)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None when the error must be raised"""
+        if attempt >= self.max_retries or not is_retryable_error(error):
+            with self._lock:
+                self.metrics['failed_calls'] += 1
+            return None
+
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            delay = min(retry_after, self.max_backoff)
+        else:
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+        with self._lock:
+            self.metrics['retries'] += 1
+            self.metrics['backoff_time_total'] += delay
+        return delay
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Governor metrics, including total and average wait time per call"""
+        with self._lock:
+            calls = self.metrics['calls']
+            return {
+                **self.metrics,
+                'in_flight': self.in_flight,
+                'avg_wait_time': self.metrics['wait_time_total'] / calls if calls > 0 else 0.0
+            }
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(True)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Rate-limit and transient server errors are retried"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in ('RateLimitError', 'APITimeoutError', 'APIConnectionError')
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Read Retry-After (seconds) or retry-after-ms from the error's HTTP response"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms') is not None:
+            return float(headers.get('retry-after-ms')) / 1000.0
+        if headers.get('retry-after') is not None:
+            return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+_governor = LLMGovernor()
+
+
+def get_llm_governor() -> LLMGovernor:
+    """Get the process-wide LLM governor"""
+    return _governor
+
+
+def configure_llm_governor(**kwargs) -> LLMGovernor:
+    """Change the quotas of the process-wide governor (see LLMGovernor.configure)"""
+    _governor.configure(**kwargs)
+    return _governor
@@ -0,0 +1,229 @@
+"""
+LLM Response Cache for CollabArena
+Content-addressed cache for deterministic (temperature-0) LLM completions
+with an in-memory LRU tier and an optional on-disk SQLite tier
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class LLMResponseCache:
+    """
+    Two-tier response cache keyed on a hash of (model, system prompt, user content, temperature).
+    The memory tier is an LRU bounded by entry count; the disk tier is a SQLite file
+    bounded by total stored bytes, evicting least recently used rows first.
+    Only temperature-0 calls are cached since only those are reproducible.
+    """
+
+    def __init__(self, max_memory_entries: int = 512, disk_path: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_memory_entries: Maximum number of responses kept in the memory tier
+            disk_path: SQLite file for the disk tier (None disables the disk tier)
+            max_disk_bytes: Maximum total size of responses stored on disk
+        """
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if disk_path:
+            self._open_disk_tier(disk_path)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+        """
+        Build the content address of a request
+
+        Args:
+            model: Model name
+            messages: Chat messages (system prompt and user content)
+            temperature: Sampling temperature
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps({
+            'model': model,
+            'messages': [[m.get('role'), m.get('content')] for m in messages],
+            'temperature': temperature
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        """Only deterministic calls can be served from cache"""
+        return temperature == 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Returns:
+            Dictionary with 'content' and 'usage' or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats['hits'] += 1
+                self.stats['memory_hits'] += 1
+                return entry
+
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._memory_put(key, entry)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return entry
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key: str, content: str, usage: Dict[str, int] = None) -> None:
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Request key from make_key()
+            content: Completion text
+            usage: Token usage of the original call
+        """
+        if content is None:
+            return
+
+        entry = {'content': content, 'usage': usage or {}}
+        with self._lock:
+            self._memory_put(key, entry)
+            self._disk_put(key, entry)
+            self.stats['stores'] += 1
+
+    def clear(self) -> None:
+        """Drop every cached response from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': self.stats['hits'] / lookups if lookups > 0 else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_enabled': self._db is not None,
+                'disk_bytes': self._disk_bytes
+            }
+
+    def close(self) -> None:
+        """Close the disk tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # Memory tier
+    def _memory_put(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats['memory_evictions'] += 1
+
+    # Disk tier
+    def _open_disk_tier(self, disk_path: str) -> None:
+        Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(disk_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        self._db.commit()
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._disk_bytes = row[0]
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT payload FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+        return json.loads(row[0])
+
+    def _disk_put(self, key: str, entry: Dict[str, Any]) -> None:
+        if self._db is None:
+            return
+        payload = json.dumps(entry, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_disk_bytes:
+            return
+
+        old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if old is not None:
+            self._disk_bytes -= old[0]
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, payload, size, time.time())
+        )
+        self._disk_bytes += size
+        self._evict_disk()
+        self._db.commit()
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used rows until the disk tier fits its byte budget"""
+        while self._disk_bytes > self.max_disk_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._disk_bytes = 0
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._disk_bytes -= row[1]
+            self.stats['disk_evictions'] += 1
+
+
+_default_cache: Optional[LLMResponseCache] = None
+
+
+def set_default_response_cache(cache: Optional[LLMResponseCache]) -> None:
+    """
+    Opt every Agent created without an explicit cache into a shared response cache
+    (pass None to turn caching off again)
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+def get_default_response_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide response cache, if one was enabled"""
+    return _default_cache
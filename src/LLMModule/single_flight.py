@@ -0,0 +1,127 @@
+"""
+Single-Flight Request Coalescing for CollabArena
+Concurrent identical LLM requests share one underlying call and its result
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _InFlightCall:
+    """A blocking call that other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Request coalescing keyed on the request content.
+    The first caller for a key runs the request; callers arriving while it is in flight
+    wait for it and receive the same result (or the same exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._async_calls: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.stats = {
+            'executions': 0,
+            'coalesced': 0
+        }
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key (thread based)
+
+        Returns:
+            (result, shared) where shared is True when the result came from another caller's request
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Awaitable version of do() for callers in the same event loop
+
+        Returns:
+            (result, shared) where shared is True when the result came from another caller's request
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                future = loop.create_future()
+                self._async_calls[loop_key] = future
+                self.stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            # shield: a cancelled follower must not cancel the shared request
+            return await asyncio.shield(future), True
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            with self._lock:
+                self._async_calls.pop(loop_key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing statistics"""
+        with self._lock:
+            total = self.stats['executions'] + self.stats['coalesced']
+            return {
+                **self.stats,
+                'in_flight': len(self._calls) + len(self._async_calls),
+                'coalesced_rate': self.stats['coalesced'] / total if total > 0 else 0.0
+            }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group used for LLM calls"""
+    return _single_flight
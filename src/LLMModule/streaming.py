@@ -0,0 +1,130 @@
+"""
+Streaming helpers for CollabArena
+Incremental parsing of streamed LLM output and per-call latency metrics
+"""
+
+import json
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class JSONObjectStream:
+    """
+    Incremental detector for top-level JSON objects in streamed text.
+    Feed it chunks as they arrive; every time a top-level {...} closes it is parsed
+    and returned, so consumers can act before the completion has finished.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of text
+
+        Returns:
+            JSON objects completed by this chunk (objects that fail to parse are skipped)
+        """
+        completed = []
+        for char in chunk or "":
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads("".join(self._buffer))
+                        if isinstance(obj, dict):
+                            completed.append(obj)
+                    except json.JSONDecodeError:
+                        pass
+                    self._buffer = []
+        return completed
+
+
+class GenerationMetrics:
+    """
+    Rolling per-call latency metrics for one agent: time-to-first-token,
+    total latency and output tokens/sec for the most recent calls
+    """
+
+    def __init__(self, max_calls: int = 200):
+        self.calls: deque = deque(maxlen=max_calls)
+
+    def record(self, latency: float, output_tokens: int, time_to_first_token: Optional[float] = None,
+               streamed: bool = False) -> Dict[str, Any]:
+        """
+        Record one completed LLM call
+
+        Args:
+            latency: Seconds from request to last token
+            output_tokens: Completion tokens produced
+            time_to_first_token: Seconds until the first chunk (equals latency when not streamed)
+            streamed: Whether the call was streamed
+        """
+        ttft = latency if time_to_first_token is None else time_to_first_token
+        generation_time = latency - ttft
+        if generation_time <= 0:
+            generation_time = latency
+        entry = {
+            'streamed': streamed,
+            'time_to_first_token': ttft,
+            'latency': latency,
+            'output_tokens': output_tokens,
+            'tokens_per_sec': output_tokens / generation_time if generation_time > 0 else 0.0
+        }
+        self.calls.append(entry)
+        return entry
+
+    def latencies(self) -> List[float]:
+        """Latencies of the recent calls, oldest first"""
+        return [call['latency'] for call in self.calls]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Summary over the recent calls"""
+        if not self.calls:
+            return {
+                'calls': 0,
+                'avg_time_to_first_token': 0.0,
+                'avg_tokens_per_sec': 0.0,
+                'p50_latency': 0.0,
+                'p95_latency': 0.0
+            }
+
+        latencies = self.latencies()
+        return {
+            'calls': len(self.calls),
+            'avg_time_to_first_token': sum(c['time_to_first_token'] for c in self.calls) / len(self.calls),
+            'avg_tokens_per_sec': sum(c['tokens_per_sec'] for c in self.calls) / len(self.calls),
+            'p50_latency': percentile(latencies, 50),
+            'p95_latency': percentile(latencies, 95)
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0.0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
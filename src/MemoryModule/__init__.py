@@ -1,19 +1,37 @@
 """
 Memory Module for CollabArena
-Implements comprehensive memory architecture including shared memory, short-term memory, and RBAC memory
+Implements comprehensive memory architecture including shared memory, short-term memory, RBAC memory
+and their SQLite-backed persistent variants
 """
 
 from .base_memory import BaseMemory
+from .access_log import AccessLog
 from .memory_manager import MemoryManager
 from .shared_memory import SharedMemory
+from .concurrent_memory import ConcurrentSharedMemory, AtomicCounter
 from .short_term_memory import ShortTermMemory
 from .rbac_memory import RBACMemory, AccessLevel
+from .persistent_memory import PersistentMemory, PersistentRBACMemory, SQLiteMemoryStore
+from .lexical_index import BM25Index
+from .vector_memory import VectorMemory, HashedNgramEmbedder
+from .memory_snapshot import MemorySnapshot, PersistentMap
 
 __all__ = [
     'BaseMemory',
+    'AccessLog',
     'MemoryManager', 
     'SharedMemory',
+    'ConcurrentSharedMemory',
+    'AtomicCounter',
     'ShortTermMemory',
     'RBACMemory',
-    'AccessLevel'
+    'AccessLevel',
+    'PersistentMemory',
+    'PersistentRBACMemory',
+    'SQLiteMemoryStore',
+    'BM25Index',
+    'VectorMemory',
+    'HashedNgramEmbedder',
+    'MemorySnapshot',
+    'PersistentMap'
 ]
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Access Log for CollabArena memory
+Fixed-capacity ring buffer of memory accesses with incremental counters
+and an optional on-disk spill of the entries that fall out of the buffer
+"""
+
+import json
+import os
+import threading
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+DEFAULT_ACCESS_LOG_CAPACITY = 10000
+
+
+class AccessLog:
+    """
+    Bounded audit trail of memory accesses.
+    Keeps the most recent `capacity` entries; older ones are dropped or, when a
+    spill path is given, appended to a JSON-lines file. Totals per operation and
+    per agent are counted as entries arrive, so statistics never scan the log.
+    Appends are serialized by a short internal lock so concurrent writers keep exact counts.
+    The spill file is opened on the first eviction and kept open until clear() / close().
+    """
+
+    def __init__(self, capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, spill_path: Optional[str] = None):
+        """
+        Args:
+            capacity: Number of entries kept in memory
+            spill_path: Optional JSON-lines file receiving entries evicted from the buffer
+        """
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._entries: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._spill_file = None
+        self._finalizer = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.total_operations = 0
+        self.successful_operations = 0
+        self.spilled_entries = 0
+        self.operation_counts: Dict[str, int] = {}
+        self.agent_counts: Dict[str, Dict[str, int]] = {}
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Record one access entry (agent_id, operation, key, success, timestamp)"""
+        with self._lock:
+            if len(self._entries) == self.capacity and self.capacity > 0:
+                self._spill(self._entries[0])
+            self._entries.append(entry)
+
+            operation = entry['operation']
+            self.total_operations += 1
+            if entry['success']:
+                self.successful_operations += 1
+            self.operation_counts[operation] = self.operation_counts.get(operation, 0) + 1
+
+            agent = self.agent_counts.get(entry['agent_id'])
+            if agent is None:
+                agent = self.agent_counts[entry['agent_id']] = {'total': 0}
+            agent['total'] += 1
+            agent[operation] = agent.get(operation, 0) + 1
+
+    def _spill(self, entry: Dict[str, Any]) -> None:
+        """Write an entry about to be evicted to the spill file"""
+        if self.spill_path is None:
+            return
+        try:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+                # Flush and close the handle if the log is garbage collected or the process exits
+                self._finalizer = weakref.finalize(self, self._spill_file.close)
+            self._spill_file.write(json.dumps(entry, default=_serialize) + "\n")
+            self.spilled_entries += 1
+        except OSError as e:
+            print(f"Error spilling access log entry to {self.spill_path}: {e}")
+
+    def entries(self, agent_id: str = None) -> List[Dict[str, Any]]:
+        """Entries still in the buffer, oldest first, optionally for one agent"""
+        with self._lock:
+            entries = list(self._entries)
+        if agent_id is None:
+            return entries
+        return [entry for entry in entries if entry['agent_id'] == agent_id]
+
+    def iter_spilled(self) -> Iterator[Dict[str, Any]]:
+        """Read back the entries spilled to disk (timestamps as ISO strings)"""
+        if self.spill_path is None:
+            return
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+        if not os.path.exists(self.spill_path):
+            return
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def get_agent_counts(self, agent_id: str) -> Dict[str, int]:
+        """Operation counts of one agent ('total' plus one count per operation)"""
+        with self._lock:
+            return dict(self.agent_counts.get(agent_id, {'total': 0}))
+
+    def clear(self) -> None:
+        """Drop the buffered entries and reset every counter (the spill file is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._reset_counters()
+            self._close_spill_file()
+
+    def close(self) -> None:
+        """Flush and close the spill file (a later eviction reopens it)"""
+        with self._lock:
+            self._close_spill_file()
+
+    def _close_spill_file(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer()
+        self._spill_file = None
+        self._finalizer = None
+
+    def copy(self) -> List[Dict[str, Any]]:
+        return self.entries()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.entries())
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
@@ -6,6 +6,9 @@ Defines the abstract interface that all memory implementations must follow
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from .access_log import AccessLog, DEFAULT_ACCESS_LOG_CAPACITY
+from .memory_snapshot import MemorySnapshot, PersistentMap, SnapshotDict
+from .key_index import SortedKeyIndex
 
 
 class BaseMemory(ABC):
@@ -14,10 +17,20 @@ class BaseMemory(ABC):
     Defines the interface that all memory types must implement
     """
     
-    def __init__(self):
-        self.memory: Dict[str, Any] = {}
-        self.access_log: List[Dict[str, Any]] = []
+    def __init__(self, access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None):
+        """
+        Args:
+            access_log_capacity: Number of recent accesses kept in the audit trail
+            access_log_spill_path: Optional JSON-lines file receiving older accesses
+        """
+        self.memory: Dict[str, Any] = SnapshotDict()
+        # Sorted view of the keys for prefix / range scans
+        self.key_index = SortedKeyIndex()
+        # Bounded audit trail; its counters back the O(1) statistics below
+        self.access_log = AccessLog(access_log_capacity, access_log_spill_path)
         self.agents: List[str] = []
+        # Bumped on every change that can alter what agents see (used to invalidate cached views)
+        self.version: int = 0
     
     @abstractmethod
     def read(self, key: str, agent_id: str) -> Optional[Any]:
@@ -95,6 +108,7 @@ class BaseMemory(ABC):
     def get_access_log(self, agent_id: str = None) -> List[Dict[str, Any]]:
         """
         Get access log, optionally filtered by agent
+        Only the most recent entries kept in the ring buffer are returned
         
         Args:
             agent_id: If provided, filter log for this agent only
@@ -102,26 +116,93 @@ class BaseMemory(ABC):
         Returns:
             List of log entries
         """
-        if agent_id is None:
-            return self.access_log.copy()
+        return self.access_log.entries(agent_id)
+    
+    def get_agent_activity(self, agent_id: str) -> Dict[str, Any]:
+        """
+        Get activity summary for a specific agent (from running counters)
+        """
+        if agent_id not in self.agents:
+            return {}
+        
+        counts = self.access_log.get_agent_counts(agent_id)
+        return {
+            'agent_id': agent_id,
+            'total_reads': counts.get('read', 0),
+            'total_writes': counts.get('write', 0),
+            'total_operations': counts['total'],
+            'memory_type': self.__class__.__name__
+        }
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Get overall memory usage statistics (from running counters)
+        """
+        log = self.access_log
+        total_operations = log.total_operations
+        success_rate = log.successful_operations / total_operations if total_operations > 0 else 0.0
+        
+        return {
+            'total_keys': len(self.memory),
+            'total_agents': len(self.agents),
+            'total_operations': total_operations,
+            'successful_operations': log.successful_operations,
+            'success_rate': success_rate,
+            'operation_breakdown': {
+                'reads': log.operation_counts.get('read', 0),
+                'writes': log.operation_counts.get('write', 0),
+                'deletes': log.operation_counts.get('delete', 0)
+            },
+            'access_log_entries': len(log),
+            'access_log_spilled': log.spilled_entries,
+            'memory_type': self.__class__.__name__
+        }
+    
+    def evict(self, key: str, reason: str = 'budget') -> bool:
+        """
+        Remove an entry on behalf of the memory system (capacity budgets), bypassing
+        agent permissions; logged as an 'evict' access by 'memory_budget'
+        """
+        if key not in self.memory:
+            return False
         
-        return [entry for entry in self.access_log if entry['agent_id'] == agent_id]
+        del self.memory[key]
+        self.key_index.remove(key)
+        self.version += 1
+        self.log_access('memory_budget', 'evict', f"{key} ({reason})", success=True)
+        return True
     
     def clear_memory(self) -> None:
         """Clear all memory contents and logs"""
         self.memory.clear()
+        self.key_index.clear()
         self.access_log.clear()
+        self.version += 1
+    
+    def snapshot(self) -> MemorySnapshot:
+        """
+        Immutable view of the memory contents at the current version.
+        O(1) for in-RAM memory (structurally shared with the live entries); stores
+        without snapshot support (SQLite-backed) are copied once per call.
+        """
+        if isinstance(self.memory, SnapshotDict):
+            contents = self.memory.snapshot_map()
+        else:
+            contents = PersistentMap.from_items((key, self.memory[key]) for key in list(self.memory))
+        return MemorySnapshot(contents, self.version, tuple(self.agents))
     
     def get_memory_state(self) -> Dict[str, Any]:
         """
         Get current state of memory for debugging/monitoring
         
         Returns:
-            Dictionary containing memory contents and metadata
+            Dictionary containing memory contents (a plain dict copied from one snapshot) and metadata
         """
+        snapshot = self.snapshot()
         return {
-            'memory_contents': self.memory.copy(),
-            'registered_agents': self.agents.copy(),
+            'memory_contents': snapshot.to_dict(),
+            'memory_version': snapshot.version,
+            'registered_agents': list(snapshot.agents),
             'access_log_count': len(self.access_log),
             'memory_type': self.__class__.__name__
         }
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Concurrent Shared Memory for CollabArena
+Shared memory safe for agents writing from parallel threads, without a global lock
+"""
+
+import threading
+import zlib
+from typing import Any, ContextManager, Dict, List
+
+from .access_log import DEFAULT_ACCESS_LOG_CAPACITY
+from .shared_memory import SharedMemory
+
+
+DEFAULT_LOCK_STRIPES = 64
+
+
+class AtomicCounter:
+    """Integer counter whose increments are atomic across threads"""
+
+    def __init__(self, value: int = 0):
+        self._value = value
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def set(self, value: int) -> None:
+        with self._lock:
+            self._value = value
+
+    def increment(self, amount: int = 1) -> int:
+        """Add amount and return the new value"""
+        with self._lock:
+            self._value += amount
+            return self._value
+
+
+class ConcurrentSharedMemory(SharedMemory):
+    """
+    Shared memory with lock striping.
+    Each key hashes to one of `stripes` locks, so writers of different keys rarely
+    wait on each other while read-modify-write of a single key (the per-key version,
+    compare-and-swap) stays atomic. The memory-wide version is an atomic counter.
+    Reads take no lock. The store itself (a SnapshotDict) still takes its own short
+    lock for each mutation, so snapshots never see a half-written dict.
+    """
+
+    def __init__(self, stripes: int = DEFAULT_LOCK_STRIPES,
+                 access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None):
+        """
+        Args:
+            stripes: Number of key locks
+            access_log_capacity: Number of recent accesses kept in the audit trail
+            access_log_spill_path: Optional JSON-lines file receiving older accesses
+        """
+        self._version_counter = AtomicCounter()
+        super().__init__(access_log_capacity, access_log_spill_path)
+        self._stripes: List[threading.Lock] = [threading.Lock() for _ in range(max(stripes, 1))]
+        self._registration_lock = threading.Lock()
+        self.cas_conflicts = AtomicCounter()
+
+    # The memory-wide version lives in the atomic counter
+    @property
+    def version(self) -> int:
+        return self._version_counter.value
+
+    @version.setter
+    def version(self, value: int) -> None:
+        self._version_counter.set(value)
+
+    def _bump_version(self) -> None:
+        self._version_counter.increment()
+
+    def _key_lock(self, key: str) -> ContextManager:
+        return self._stripes[zlib.crc32(key.encode("utf-8")) % len(self._stripes)]
+
+    def register_agent(self, agent_id: str) -> bool:
+        with self._registration_lock:
+            return super().register_agent(agent_id)
+
+    def write_if_version(self, key: str, value: Any, expected_version: int, agent_id: str) -> bool:
+        success = super().write_if_version(key, value, expected_version, agent_id)
+        if not success and agent_id in self.agents:
+            self.cas_conflicts.increment()
+        return success
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        stats = super().get_memory_stats()
+        stats['lock_stripes'] = len(self._stripes)
+        stats['cas_conflicts'] = self.cas_conflicts.value
+        return stats
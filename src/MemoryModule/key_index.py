@@ -0,0 +1,89 @@
+"""
+Key Index for CollabArena memory
+Sorted index over memory keys for prefix / range scans in either direction
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable, List, Optional
+
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def prefix_successor(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix (None if unbounded)"""
+    prefix = prefix.rstrip(_MAX_CHAR)
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SortedKeyIndex:
+    """
+    Memory keys in sorted order, kept up to date on every insert / delete.
+    Scans bisect straight to the first key of a prefix range and walk only the
+    keys they return (plus any rejected by the visibility filter).
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._keys: List[str] = sorted(set(keys))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        index = bisect_left(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            index = bisect_left(self._keys, key)
+            if index == len(self._keys) or self._keys[index] != key:
+                self._keys.insert(index, key)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            index = bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = []
+
+    def scan(self, prefix: str = "", start: str = None, end: str = None, limit: int = None,
+             reverse: bool = False, accept: Callable[[str], bool] = None) -> List[str]:
+        """
+        Keys starting with prefix, in sorted (or reverse) order
+
+        Args:
+            prefix: Key prefix
+            start: Inclusive lower bound on the rest of the key after the prefix
+            end: Exclusive upper bound on the rest of the key after the prefix
+            limit: Maximum number of keys returned
+            reverse: Walk from the largest key down (e.g. latest timestamps first)
+            accept: Optional filter on keys (e.g. visibility)
+        """
+        if limit is not None and limit <= 0:
+            return []
+
+        with self._lock:
+            keys = self._keys
+            low = bisect_left(keys, prefix + start) if start is not None else bisect_left(keys, prefix)
+            upper = prefix_successor(prefix)
+            high = bisect_left(keys, upper) if upper is not None else len(keys)
+            if end is not None:
+                high = min(high, bisect_left(keys, prefix + end))
+
+            results = []
+            positions = range(high - 1, low - 1, -1) if reverse else range(low, high)
+            for position in positions:
+                key = keys[position]
+                if accept is not None and not accept(key):
+                    continue
+                results.append(key)
+                if limit is not None and len(results) == limit:
+                    break
+            return results
@@ -0,0 +1,216 @@
+"""
+Lexical Index for CollabArena memory
+Inverted index over memory entries ranked with BM25, scored with NumPy
+"""
+
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with"
+})
+
+
+# Entry fields repeated verbatim in every entry of a run (indexing them makes every entry match the problem)
+UNINDEXED_FIELDS = frozenset({"problem_context"})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric terms without stopwords"""
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+def memory_text(key: str, value: Any) -> str:
+    """
+    Searchable text of a memory entry: its key plus every string / number nested in the value
+    (except the UNINDEXED_FIELDS of dict values)
+    """
+    parts = [key.replace("_", " ")]
+
+    def collect(item: Any) -> None:
+        if isinstance(item, dict):
+            for field, nested in item.items():
+                if field not in UNINDEXED_FIELDS:
+                    collect(nested)
+        elif isinstance(item, (list, tuple, set)):
+            for nested in item:
+                collect(nested)
+        elif item is not None:
+            parts.append(str(item))
+
+    collect(value)
+    return " ".join(parts)
+
+
+class BM25Index:
+    """
+    Incrementally maintained inverted index with BM25 ranking.
+    Each term keeps a postings dict (document slot -> term frequency); documents
+    live in numbered slots and removed ones are tombstoned until enough of them pile
+    up to compact the slots. A query is scored for all matching documents at once
+    with NumPy over the postings arrays.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, compact_ratio: float = 0.5):
+        """
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            compact_ratio: Fraction of tombstoned slots that triggers compaction
+        """
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # Postings as (slots, frequencies) arrays, rebuilt lazily after a change to the term
+        self._posting_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._slot_of: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._terms: List[Tuple[str, ...]] = []
+        self._lengths = np.zeros(64, dtype=np.float64)
+        self._total_length = 0.0
+        self.tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def add(self, key: str, text: str) -> None:
+        """Index (or re-index) a document"""
+        if key in self._slot_of:
+            self.remove(key)
+
+        terms = tokenize(text)
+        slot = len(self._keys)
+        if slot >= len(self._lengths):
+            self._lengths = np.concatenate([self._lengths, np.zeros(len(self._lengths), dtype=np.float64)])
+
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[slot] = frequency
+            self._posting_arrays.pop(term, None)
+
+        self._slot_of[key] = slot
+        self._keys.append(key)
+        self._terms.append(tuple(frequencies))
+        self._lengths[slot] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, key: str) -> bool:
+        """Drop a document (its slot is tombstoned)"""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+
+        for term in self._terms[slot]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._posting_arrays.pop(term, None)
+
+        self._total_length -= self._lengths[slot]
+        self._lengths[slot] = 0.0
+        self._keys[slot] = None
+        self._terms[slot] = ()
+        self.tombstones += 1
+        if self.tombstones > self.compact_ratio * max(len(self._keys), 1):
+            self.compact()
+        return True
+
+    def clear(self) -> None:
+        self.__init__(self.k1, self.b, self.compact_ratio)
+
+    def compact(self) -> None:
+        """Drop tombstoned slots, keeping the indexing order of the live documents"""
+        live = [slot for slot, key in enumerate(self._keys) if key is not None]
+        new_slot = {slot: index for index, slot in enumerate(live)}
+
+        self._postings = {term: {new_slot[slot]: frequency for slot, frequency in postings.items()}
+                          for term, postings in self._postings.items()}
+        self._posting_arrays.clear()
+        self._keys = [self._keys[slot] for slot in live]
+        self._terms = [self._terms[slot] for slot in live]
+        self._slot_of = {key: slot for slot, key in enumerate(self._keys)}
+        lengths = np.zeros(len(self._lengths), dtype=np.float64)
+        lengths[:len(live)] = self._lengths[live]
+        self._lengths = lengths
+        self.tombstones = 0
+
+    def _arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if not postings:
+                return None
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+            self._posting_arrays[term] = arrays
+        return arrays
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document slot for the query (0 for non-matching / removed)"""
+        scores = np.zeros(len(self._keys), dtype=np.float64)
+        document_count = len(self._slot_of)
+        if document_count == 0:
+            return scores
+
+        average_length = self._total_length / document_count or 1.0
+        for term in set(tokenize(query)):
+            arrays = self._arrays(term)
+            if arrays is None:
+                continue
+            slots, frequencies = arrays
+            idf = math.log(1 + (document_count - len(slots) + 0.5) / (len(slots) + 0.5))
+            norms = self.k1 * (1 - self.b + self.b * self._lengths[slots] / average_length)
+            scores[slots] += idf * frequencies * (self.k1 + 1) / (frequencies + norms)
+        return scores
+
+    def search(self, query: str, k: int = 5,
+               accept: Callable[[str], bool] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k documents for a query (equal scores: most recently indexed first)
+
+        Args:
+            query: Free-text query
+            k: Number of results
+            accept: Optional filter on keys (e.g. visibility); candidates are checked best first
+
+        Returns:
+            (key, score) pairs, best first
+        """
+        scores = self.scores(query)
+        matches = np.flatnonzero(scores > 0)
+        if len(matches) == 0 or k <= 0:
+            return []
+
+        if accept is None and len(matches) > k:
+            # Keep every document tied with the k-th best so the recency tie-break sees them all
+            kth_score = np.partition(scores[matches], len(matches) - k)[len(matches) - k]
+            top = matches[scores[matches] >= kth_score]
+        else:
+            top = matches
+        # Slots grow with every (re)index, so a higher slot is a newer document
+        ordered = top[np.lexsort((-top, -scores[top]))]
+
+        results = []
+        for slot in ordered:
+            key = self._keys[slot]
+            if accept is not None and not accept(key):
+                continue
+            results.append((key, float(scores[slot])))
+            if len(results) == k:
+                break
+        return results
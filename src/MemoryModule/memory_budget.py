@@ -0,0 +1,337 @@
+"""
+Memory Budget for CollabArena
+Byte / entry budgets for shared memory with pluggable eviction policies
+"""
+
+import bisect
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Rough per-entry cost of the metadata wrapper (dict, timestamp, version, author)
+ENTRY_OVERHEAD_BYTES = 400
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate deep size of a value in bytes (containers are walked, shared objects counted once)"""
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+def entry_size(key: str, value: Any) -> int:
+    """Estimated bytes held by one memory entry"""
+    return sys.getsizeof(key) + estimate_size(value) + ENTRY_OVERHEAD_BYTES
+
+
+class EvictionPolicy:
+    """
+    Chooses which key to evict when a budget is exceeded.
+    Policies are told about every write / read / delete and answer victims() with
+    candidate keys, best victim first. victims() is consumed lazily and may walk the
+    policy's own structures, so the policy must not be updated while iterating it.
+    """
+
+    name = "base"
+
+    def on_write(self, key: str) -> None:
+        pass
+
+    def on_read(self, key: str) -> None:
+        pass
+
+    def on_delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def victims(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def expired(self, now: float) -> List[str]:
+        """Keys that must go regardless of the budget (TTL)"""
+        return []
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evict the least recently read or written key"""
+
+    name = "lru"
+
+    def __init__(self):
+        self._order: OrderedDict = OrderedDict()
+
+    def on_write(self, key: str) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def on_read(self, key: str) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def on_delete(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def clear(self) -> None:
+        self._order.clear()
+
+    def victims(self) -> Iterable[str]:
+        return iter(self._order)
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evict the least frequently used key (ties: least recently used).
+    Keys sit in per-frequency buckets so every update is O(1); the bucket frequencies
+    are kept sorted as buckets come and go, so victims() never sorts.
+    """
+
+    name = "lfu"
+
+    def __init__(self):
+        self._frequency: Dict[str, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._frequencies: List[int] = []  # keys of _buckets, ascending
+
+    def _remove_from_bucket(self, key: str, frequency: int) -> None:
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            del self._frequencies[bisect.bisect_left(self._frequencies, frequency)]
+
+    def _touch(self, key: str) -> None:
+        frequency = self._frequency.get(key, 0)
+        if frequency:
+            self._remove_from_bucket(key, frequency)
+        self._frequency[key] = frequency + 1
+        bucket = self._buckets.get(frequency + 1)
+        if bucket is None:
+            bucket = self._buckets[frequency + 1] = OrderedDict()
+            bisect.insort(self._frequencies, frequency + 1)
+        bucket[key] = None
+
+    def on_write(self, key: str) -> None:
+        self._touch(key)
+
+    def on_read(self, key: str) -> None:
+        if key in self._frequency:
+            self._touch(key)
+
+    def on_delete(self, key: str) -> None:
+        frequency = self._frequency.pop(key, None)
+        if frequency:
+            self._remove_from_bucket(key, frequency)
+
+    def clear(self) -> None:
+        self._frequency.clear()
+        self._buckets.clear()
+        self._frequencies.clear()
+
+    def victims(self) -> Iterable[str]:
+        for frequency in self._frequencies:
+            yield from self._buckets[frequency]
+
+
+class TTLPolicy(EvictionPolicy):
+    """Expire keys `ttl` seconds after their last write; over budget, evict the oldest write"""
+
+    name = "ttl"
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._written_at: OrderedDict = OrderedDict()
+
+    def on_write(self, key: str) -> None:
+        self._written_at[key] = time.monotonic()
+        self._written_at.move_to_end(key)
+
+    def on_delete(self, key: str) -> None:
+        self._written_at.pop(key, None)
+
+    def clear(self) -> None:
+        self._written_at.clear()
+
+    def is_expired(self, key: str, now: float) -> bool:
+        written_at = self._written_at.get(key)
+        return written_at is not None and now - written_at >= self.ttl
+
+    def expired(self, now: float) -> List[str]:
+        keys = []
+        for key, written_at in self._written_at.items():
+            if now - written_at < self.ttl:
+                break
+            keys.append(key)
+        return keys
+
+    def victims(self) -> Iterable[str]:
+        return iter(self._written_at)
+
+
+class PrefixPolicy(EvictionPolicy):
+    """
+    Evict the oldest write among keys with the given prefixes (earlier prefixes first),
+    e.g. ("team_messages_",) drops old message summaries before anything else.
+    Keys matching no prefix are evicted last, oldest first.
+    """
+
+    name = "prefix"
+
+    def __init__(self, prefixes: Tuple[str, ...]):
+        self.prefixes = tuple(prefixes)
+        self._groups: List[OrderedDict] = [OrderedDict() for _ in range(len(self.prefixes) + 1)]
+        self._group_of: Dict[str, int] = {}
+
+    def _group(self, key: str) -> int:
+        for index, prefix in enumerate(self.prefixes):
+            if key.startswith(prefix):
+                return index
+        return len(self.prefixes)
+
+    def on_write(self, key: str) -> None:
+        group = self._group_of.get(key)
+        if group is None:
+            group = self._group_of[key] = self._group(key)
+        self._groups[group][key] = None
+        self._groups[group].move_to_end(key)
+
+    def on_delete(self, key: str) -> None:
+        group = self._group_of.pop(key, None)
+        if group is not None:
+            self._groups[group].pop(key, None)
+
+    def clear(self) -> None:
+        for group in self._groups:
+            group.clear()
+        self._group_of.clear()
+
+    def victims(self) -> Iterable[str]:
+        for group in self._groups:
+            yield from group
+
+
+def make_eviction_policy(policy: str, ttl: Optional[float] = None,
+                         prefixes: Optional[Tuple[str, ...]] = None) -> EvictionPolicy:
+    """Build a policy by name ("lru", "lfu", "ttl" or "prefix")"""
+    policy = policy.lower()
+    if policy == "lfu":
+        return LFUPolicy()
+    if policy == "ttl":
+        if ttl is None:
+            raise ValueError("The ttl eviction policy needs a ttl")
+        return TTLPolicy(ttl)
+    if policy == "prefix":
+        if not prefixes:
+            raise ValueError("The prefix eviction policy needs at least one prefix")
+        return PrefixPolicy(tuple(prefixes))
+    if policy == "lru":
+        return LRUPolicy()
+    raise ValueError(f"Unknown eviction policy: {policy}")
+
+
+class MemoryBudget:
+    """
+    Byte and/or entry budget over memory entries.
+    Entry sizes are estimated once per write and summed incrementally; when a write
+    pushes the totals over budget, over_budget_victims() names the keys to evict.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None,
+                 policy: EvictionPolicy = None):
+        """
+        Args:
+            max_bytes: Estimated bytes allowed across all entries (None = unbounded)
+            max_entries: Number of entries allowed (None = unbounded)
+            policy: Eviction policy (LRU by default)
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.policy = policy or LRUPolicy()
+        self._sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.evictions: Dict[str, int] = {}
+        self.evicted_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def size_of(self, key: str) -> int:
+        return self._sizes.get(key, 0)
+
+    def record_write(self, key: str, value: Any) -> None:
+        size = entry_size(key, value)
+        self.total_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self.policy.on_write(key)
+
+    def record_read(self, key: str) -> None:
+        self.policy.on_read(key)
+
+    def record_delete(self, key: str) -> None:
+        self.total_bytes -= self._sizes.pop(key, 0)
+        self.policy.on_delete(key)
+
+    def record_eviction(self, key: str, reason: str) -> int:
+        """Account for an evicted key; returns its estimated size"""
+        size = self._sizes.get(key, 0)
+        self.record_delete(key)
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        self.evicted_bytes += size
+        return size
+
+    def clear(self) -> None:
+        self._sizes.clear()
+        self.total_bytes = 0
+        self.policy.clear()
+
+    def is_over_budget(self) -> bool:
+        return ((self.max_bytes is not None and self.total_bytes > self.max_bytes)
+                or (self.max_entries is not None and len(self._sizes) > self.max_entries))
+
+    def is_expired(self, key: str) -> bool:
+        return isinstance(self.policy, TTLPolicy) and self.policy.is_expired(key, time.monotonic())
+
+    def expired_keys(self) -> List[str]:
+        return self.policy.expired(time.monotonic())
+
+    def over_budget_victims(self, keep: str = None) -> List[str]:
+        """Keys to evict, in order, to get back within budget (never `keep`)"""
+        victims = []
+        total_bytes, entries = self.total_bytes, len(self._sizes)
+        for key in self.policy.victims():
+            if ((self.max_bytes is None or total_bytes <= self.max_bytes)
+                    and (self.max_entries is None or entries <= self.max_entries)):
+                break
+            if key == keep or key not in self._sizes:
+                continue
+            victims.append(key)
+            total_bytes -= self._sizes[key]
+            entries -= 1
+        return victims
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Budget usage and eviction counts"""
+        return {
+            'policy': self.policy.name,
+            'entries': len(self._sizes),
+            'max_entries': self.max_entries,
+            'estimated_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': dict(self.evictions),
+            'evicted_bytes': self.evicted_bytes
+        }
@@ -3,10 +3,19 @@ Memory Manager for CollabArena
 Provides unified interface for shared memory operations, short-term memory, and RBAC memory
 """
 
+import threading
 from typing import Any, Dict, List, Optional, Union
 from .shared_memory import SharedMemory
+from .concurrent_memory import ConcurrentSharedMemory
 from .short_term_memory import ShortTermMemory
 from .rbac_memory import RBACMemory, AccessLevel
+from .access_log import DEFAULT_ACCESS_LOG_CAPACITY
+from .persistent_memory import PersistentMemory, PersistentRBACMemory, DEFAULT_MEMORY_PATH
+from .lexical_index import BM25Index, memory_text
+from .vector_memory import VectorMemory
+from .memory_snapshot import MemorySnapshot
+from .memory_budget import EvictionPolicy, MemoryBudget, make_eviction_policy
+from src.SharedLog.event_type import EventType
 
 class MemoryManager:
     """
@@ -14,22 +23,70 @@ class MemoryManager:
     Supports composition with different memory implementations based on security requirements.
     """
     
-    def __init__(self, memory_type: str = "shared", short_term_max_size: int = 50):
+    def __init__(self, memory_type: str = "shared", short_term_max_size: int = 50,
+                 access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None,
+                 memory_path: str = DEFAULT_MEMORY_PATH, max_memory_bytes: Optional[int] = None,
+                 max_memory_entries: Optional[int] = None, eviction_policy: Union[str, EvictionPolicy] = "lru",
+                 memory_ttl: Optional[float] = None, eviction_prefixes: Optional[tuple] = None, shared_log=None):
         """
         Initialize with specified memory implementation and short-term memory
         
         Args:
-            memory_type: Type of memory implementation ("shared" or "rbac")
+            memory_type: Type of memory implementation ("shared", "concurrent", "rbac", "persistent"
+                or "persistent_rbac")
             short_term_max_size: Maximum size for short-term memory per agent
+            access_log_capacity: Number of recent accesses kept in the audit trail
+            access_log_spill_path: Optional JSON-lines file receiving older accesses
+            memory_path: SQLite file used by the persistent memory types
+            max_memory_bytes: Estimated byte budget for shared memory entries (None = unbounded)
+            max_memory_entries: Entry budget for shared memory (None = unbounded)
+            eviction_policy: "lru", "lfu", "ttl", "prefix" or an EvictionPolicy instance
+            memory_ttl: Seconds an entry lives after its last write (implies the "ttl" policy)
+            eviction_prefixes: Key prefixes evicted first, oldest first (implies the "prefix" policy)
+            shared_log: Optional SharedLog receiving a MEMORY_EVICT event per eviction
         """
         # Initialize primary memory implementation based on type
-        if memory_type.lower() == "rbac":
-            self.memory_impl = RBACMemory()
+        memory_type = memory_type.lower()
+        if memory_type == "rbac":
+            self.memory_impl = RBACMemory(access_log_capacity, access_log_spill_path)
             self.memory_type = "rbac"
+        elif memory_type == "concurrent":
+            self.memory_impl = ConcurrentSharedMemory(access_log_capacity=access_log_capacity,
+                                                      access_log_spill_path=access_log_spill_path)
+            self.memory_type = "concurrent"
+        elif memory_type == "persistent":
+            self.memory_impl = PersistentMemory(memory_path, access_log_capacity=access_log_capacity,
+                                                access_log_spill_path=access_log_spill_path)
+            self.memory_type = "persistent"
+        elif memory_type == "persistent_rbac":
+            self.memory_impl = PersistentRBACMemory(memory_path, access_log_capacity=access_log_capacity,
+                                                    access_log_spill_path=access_log_spill_path)
+            self.memory_type = "persistent_rbac"
         else:
-            self.memory_impl = SharedMemory()
+            self.memory_impl = SharedMemory(access_log_capacity, access_log_spill_path)
             self.memory_type = "shared"
         
+        # Relevance indexes over memory entries (lexical and semantic), maintained on every write / delete
+        self.lexical_index = BM25Index()
+        self.vector_memory = VectorMemory()
+        self._index_lock = threading.Lock()
+        
+        # Optional capacity budget (evictions are reported to the shared log)
+        self.shared_log = shared_log
+        self.budget: Optional[MemoryBudget] = None
+        if isinstance(eviction_policy, str) and memory_ttl is not None:
+            eviction_policy = "ttl"
+        elif isinstance(eviction_policy, str) and eviction_prefixes:
+            eviction_policy = "prefix"
+        if max_memory_bytes is not None or max_memory_entries is not None or eviction_policy == "ttl" \
+                or isinstance(eviction_policy, EvictionPolicy):
+            if isinstance(eviction_policy, str):
+                eviction_policy = make_eviction_policy(eviction_policy, memory_ttl, eviction_prefixes)
+            self.budget = MemoryBudget(max_memory_bytes, max_memory_entries, eviction_policy)
+        self._budget_lock = threading.Lock()
+        
+        self._index_existing_entries()
+        
         # Short-term memory composition (same for all types)
         self.short_term_memories: Dict[str, ShortTermMemory] = {}
         self.short_term_max_size = short_term_max_size
@@ -43,7 +100,7 @@ class MemoryManager:
             role: Agent role (used for RBAC memory, ignored for shared memory)
         """
         # Register with primary memory implementation
-        if self.memory_type == "rbac":
+        if self.is_rbac_enabled():
             success = self.memory_impl.register_agent(agent_id, role or "Guest")
         else:
             success = self.memory_impl.register_agent(agent_id)
@@ -56,35 +113,233 @@ class MemoryManager:
     
     def write(self, key: str, value: Any, agent_id: str) -> bool:
         """Write data to shared memory"""
-        return self.memory_impl.write(key, value, agent_id)
+        success = self.memory_impl.write(key, value, agent_id)
+        if success:
+            self._reindex(key)
+            self._track_write(key, value)
+        return success
+    
+    def write_if_version(self, key: str, value: Any, expected_version: int, agent_id: str) -> bool:
+        """
+        Compare-and-swap write (shared memory types only)
+        
+        Args:
+            key: Memory key to write
+            value: Value to store
+            expected_version: Entry version the agent last read (0 if the key must not exist)
+            agent_id: Writing agent
+            
+        Returns:
+            True if written, False if the version moved on (re-read and retry) or CAS is unsupported
+        """
+        if not hasattr(self.memory_impl, 'write_if_version'):
+            return False
+        
+        success = self.memory_impl.write_if_version(key, value, expected_version, agent_id)
+        if success:
+            self._reindex(key)
+            self._track_write(key, value)
+        return success
     
     def read(self, key: str, agent_id: str) -> Any:
         """Read data from shared memory"""
+        self._track_read(key)
         return self.memory_impl.read(key, agent_id)
     
     def get_value(self, key: str, agent_id: str) -> Any:
         """Get raw value without metadata"""
+        self._track_read(key)
         return self.memory_impl.get_value(key, agent_id)
     
     def delete_key(self, key: str, agent_id: str) -> bool:
         """Delete a key from memory"""
-        return self.memory_impl.delete_key(key, agent_id)
+        success = self.memory_impl.delete_key(key, agent_id)
+        if success:
+            self._reindex(key)
+            if self.budget is not None:
+                with self._budget_lock:
+                    self.budget.record_delete(key)
+        return success
     
-    def get_memory_keys(self) -> List[str]:
-        """Get all available memory keys"""
+    def get_memory_keys(self, agent_id: str = None) -> List[str]:
+        """Get all available memory keys (filtered by the agent's visibility in RBAC mode)"""
+        if self.is_rbac_enabled():
+            return self.memory_impl.get_memory_keys(agent_id)
         return self.memory_impl.get_memory_keys()
     
+    def scan_prefix(self, prefix: str = "", start: str = None, end: str = None, limit: int = None,
+                    reverse: bool = False, agent_id: str = None) -> List[str]:
+        """
+        Scan memory keys by prefix in sorted order, e.g. the latest 5 analyst insights:
+        scan_prefix("problem_analyst_", limit=5, reverse=True, agent_id=...)
+        
+        Args:
+            prefix: Key prefix
+            start: Inclusive lower bound on the rest of the key after the prefix
+            end: Exclusive upper bound on the rest of the key after the prefix
+            limit: Maximum number of keys
+            reverse: Largest keys first
+            agent_id: Scanning agent; only keys it may read are returned (RBAC)
+        """
+        return self.memory_impl.scan_prefix(prefix, start, end, limit, reverse, agent_id)
+    
+    def search(self, query: str, k: int = 5, agent_id: str = None) -> List[Dict[str, Any]]:
+        """
+        Rank memory entries by BM25 relevance to a query
+        
+        Args:
+            query: Free-text query (e.g. the current problem)
+            k: Maximum number of entries returned
+            agent_id: Searching agent; only entries it may read are returned
+            
+        Returns:
+            List of {'key', 'score', 'value'} dicts, most relevant first
+        """
+        return self._search_index(self.lexical_index, query, k, agent_id)
+    
+    def semantic_search(self, query: str, k: int = 5, agent_id: str = None,
+                        min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Rank memory entries by embedding similarity to a query (finds related wording
+        that shares no exact terms); same arguments and results as search(), and hits
+        must score above min_score (cosine similarity)
+        """
+        return self._search_index(self.vector_memory, query, k, agent_id, min_score=min_score)
+    
+    def _search_index(self, index, query: str, k: int, agent_id: str, **options) -> List[Dict[str, Any]]:
+        """Query an index and read the hits the agent is allowed to see"""
+        if self.is_rbac_enabled():
+            accept = self.memory_impl.get_visible_key_set(agent_id).__contains__
+        elif agent_id in self.memory_impl.agents:
+            accept = None
+        else:
+            return []
+        
+        with self._index_lock:
+            hits = index.search(query, k, accept, **options)
+        
+        results = []
+        for key, score in hits:
+            value = self.get_value(key, agent_id)
+            if value is not None:
+                results.append({'key': key, 'score': score, 'value': value})
+        return results
+    
+    def _reindex(self, key: str) -> None:
+        """
+        Bring the indexes in line with the entry currently stored under key.
+        The entry is re-read under the index lock, so concurrent writers of one key
+        always leave its latest value indexed.
+        """
+        with self._index_lock:
+            entry = self.memory_impl.memory.get(key)
+            if entry is None:
+                self.lexical_index.remove(key)
+                self.vector_memory.remove(key)
+            else:
+                self._index_entry(key, entry['value'] if isinstance(entry, dict) and 'value' in entry else entry)
+    
+    def _index_entry(self, key: str, value: Any) -> None:
+        text = memory_text(key, value)
+        self.lexical_index.add(key, text)
+        self.vector_memory.add(key, text)
+    
+    def _index_existing_entries(self) -> None:
+        """Index entries already stored (persistent memory reopened from disk)"""
+        for key in list(self.memory_impl.memory):
+            entry = self.memory_impl.memory[key]
+            value = entry['value'] if isinstance(entry, dict) and 'value' in entry else entry
+            self._index_entry(key, value)
+            if self.budget is not None:
+                self.budget.record_write(key, value)
+        if self.budget is not None:
+            with self._budget_lock:
+                self._enforce_budget()
+    
+    # Capacity budget
+    def _track_write(self, key: str, value: Any) -> None:
+        """Account for a write and evict expired / over-budget entries (never the one just written)"""
+        if self.budget is None:
+            return
+        with self._budget_lock:
+            self.budget.record_write(key, value)
+            self._enforce_budget(keep=key)
+    
+    def _track_read(self, key: str) -> None:
+        """Count a read for the eviction policy; expired entries are evicted before they are read"""
+        if self.budget is None:
+            return
+        with self._budget_lock:
+            if self.budget.is_expired(key):
+                self._evict(key, 'ttl')
+            else:
+                self.budget.record_read(key)
+    
+    def _enforce_budget(self, keep: str = None) -> None:
+        for key in self.budget.expired_keys():
+            if key != keep:
+                self._evict(key, 'ttl')
+        for key in self.budget.over_budget_victims(keep):
+            self._evict(key, self.budget.policy.name)
+    
+    def _evict(self, key: str, reason: str) -> None:
+        """Evict one entry (caller holds the budget lock) and report it to the shared log"""
+        size = self.budget.record_eviction(key, reason)
+        self.memory_impl.evict(key, reason)
+        self._reindex(key)
+        
+        if self.shared_log is not None:
+            self.shared_log.record_event("memory_manager", {
+                "key": key,
+                "reason": reason,
+                "estimated_bytes": size,
+                "memory_entries": len(self.budget),
+                "memory_bytes": self.budget.total_bytes
+            }, EventType.MEMORY_EVICT)
+    
+    def evict_expired(self) -> int:
+        """Evict every entry past its TTL now (otherwise done lazily on writes / reads); returns the count"""
+        if self.budget is None:
+            return 0
+        with self._budget_lock:
+            expired = self.budget.expired_keys()
+            for key in expired:
+                self._evict(key, 'ttl')
+        return len(expired)
+    
+    def get_budget_stats(self) -> Optional[Dict[str, Any]]:
+        """Budget usage and eviction counts (None without a budget)"""
+        if self.budget is None:
+            return None
+        with self._budget_lock:
+            return self.budget.get_stats()
+    
+    def get_memory_version(self, agent_id: str = None) -> tuple:
+        """
+        Get a version stamp of everything an agent can see in memory:
+        (shared memory version, agent's short-term memory version)
+        """
+        short_term = self.short_term_memories.get(agent_id)
+        return (self.memory_impl.version, short_term.version if short_term else 0)
+    
     def get_memory_state(self) -> Dict[str, Any]:
         """Get current memory state"""
         return self.memory_impl.get_memory_state()
     
+    def snapshot(self) -> MemorySnapshot:
+        """O(1) immutable snapshot of shared memory; diff two with old.diff(new)"""
+        return self.memory_impl.snapshot()
+    
     def get_access_log(self) -> List[Dict[str, Any]]:
         """Get access log for audit purposes"""
         return self.memory_impl.get_access_log()
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory usage statistics"""
-        return self.memory_impl.get_memory_stats()
+        stats = self.memory_impl.get_memory_stats()
+        if self.budget is not None:
+            stats['budget'] = self.get_budget_stats()
+        return stats
     
     def get_agent_activity(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get activity statistics for a specific agent"""
@@ -92,7 +347,19 @@ class MemoryManager:
     
     def clear_memory(self) -> bool:
         """Clear all memory contents"""
-        return self.memory_impl.clear_memory()
+        result = self.memory_impl.clear_memory()
+        with self._index_lock:
+            self.lexical_index.clear()
+            self.vector_memory.clear()
+        if self.budget is not None:
+            with self._budget_lock:
+                self.budget.clear()
+        return result
+    
+    def flush(self) -> None:
+        """Commit pending writes of persistent memory types (no-op otherwise)"""
+        if hasattr(self.memory_impl, 'flush'):
+            self.memory_impl.flush()
     
     def get_memory_type(self) -> str:
         """Get the type of memory implementation"""
@@ -157,12 +424,12 @@ class MemoryManager:
         
         return self.short_term_memories[agent_id].is_full()
     
-    # RBAC-specific methods (only work when memory_type is "rbac")
+    # RBAC-specific methods (only work with the "rbac" and "persistent_rbac" memory types)
     def set_agent_role(self, agent_id: str, new_role: str, admin_agent_id: str) -> bool:
         """
         Change an agent's role (RBAC only, requires admin privileges)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return False
         
         return self.memory_impl.set_agent_role(agent_id, new_role, admin_agent_id)
@@ -176,7 +443,7 @@ class MemoryManager:
             permission: Permission name ("read", "write", "delete", "admin")
             admin_agent_id: Agent performing the action (must have admin access)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return False
         
         try:
@@ -189,7 +456,7 @@ class MemoryManager:
         """
         Remove permission from a role (RBAC only, requires admin privileges)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return False
         
         try:
@@ -202,7 +469,7 @@ class MemoryManager:
         """
         Mark a memory key as protected (RBAC only, requires admin access)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return False
         
         return self.memory_impl.protect_key(key, admin_agent_id)
@@ -211,7 +478,7 @@ class MemoryManager:
         """
         Remove protection from a memory key (RBAC only, requires admin access)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return False
         
         return self.memory_impl.unprotect_key(key, admin_agent_id)
@@ -220,7 +487,7 @@ class MemoryManager:
         """
         Get permissions for a specific agent (RBAC only)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return []
         
         permissions = self.memory_impl.get_agent_permissions(agent_id)
@@ -230,7 +497,7 @@ class MemoryManager:
         """
         Get information about a specific role (RBAC only)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return None
         
         return self.memory_impl.get_role_info(role)
@@ -239,7 +506,7 @@ class MemoryManager:
         """
         Get all available roles (RBAC only)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return []
         
         return self.memory_impl.get_all_roles()
@@ -248,7 +515,7 @@ class MemoryManager:
         """
         Get list of protected keys (RBAC only, requires admin access)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return []
         
         return self.memory_impl.get_protected_keys(agent_id)
@@ -257,7 +524,7 @@ class MemoryManager:
         """
         Get RBAC system statistics (RBAC only)
         """
-        if self.memory_type != "rbac":
+        if not self.is_rbac_enabled():
             return None
         
         return self.memory_impl.get_rbac_stats()
@@ -266,4 +533,4 @@ class MemoryManager:
         """
         Check if RBAC memory is enabled
         """
-        return self.memory_type == "rbac"
\ No newline at end of file
+        return isinstance(self.memory_impl, RBACMemory)
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""
+Memory Snapshots for CollabArena
+Immutable, structurally shared views of memory: a persistent hash trie (HAMT-style)
+kept alongside the live dict, so a snapshot is O(1) and a diff touches only changed keys
+"""
+
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+_EMPTY_NODE = (None,) * _WIDTH
+_MISSING = object()
+
+
+class _Leaf:
+    __slots__ = ('hash', 'key', 'value')
+
+    def __init__(self, key_hash: int, key: Any, value: Any):
+        self.hash = key_hash
+        self.key = key
+        self.value = value
+
+
+class _Collision:
+    """Keys whose full hashes are equal"""
+    __slots__ = ('hash', 'items')
+
+    def __init__(self, key_hash: int, items: Tuple[Tuple[Any, Any], ...]):
+        self.hash = key_hash
+        self.items = items
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _merge(a, b, shift: int) -> tuple:
+    """Node holding two leaves / collisions with different hashes"""
+    index_a = (a.hash >> shift) & _MASK
+    index_b = (b.hash >> shift) & _MASK
+    node = list(_EMPTY_NODE)
+    if index_a == index_b:
+        node[index_a] = _merge(a, b, shift + _BITS)
+    else:
+        node[index_a] = a
+        node[index_b] = b
+    return tuple(node)
+
+
+def _assoc(node: tuple, shift: int, key_hash: int, key: Any, value: Any) -> Tuple[tuple, bool]:
+    """Node with key set (path copied); second item tells whether the key was added"""
+    index = (key_hash >> shift) & _MASK
+    slot = node[index]
+    added = True
+    if slot is None:
+        new = _Leaf(key_hash, key, value)
+    elif type(slot) is tuple:
+        new, added = _assoc(slot, shift + _BITS, key_hash, key, value)
+        if new is slot:
+            return node, False
+    elif slot.hash != key_hash:
+        new = _merge(slot, _Leaf(key_hash, key, value), shift + _BITS)
+    elif type(slot) is _Leaf:
+        if slot.key == key:
+            if slot.value is value:
+                return node, False
+            new, added = _Leaf(key_hash, key, value), False
+        else:
+            new = _Collision(key_hash, ((slot.key, slot.value), (key, value)))
+    else:
+        items = tuple(item for item in slot.items if item[0] != key)
+        added = len(items) == len(slot.items)
+        new = _Collision(key_hash, items + ((key, value),))
+    return node[:index] + (new,) + node[index + 1:], added
+
+
+def _dissoc(node: tuple, shift: int, key_hash: int, key: Any) -> Tuple[Optional[Any], bool]:
+    """Node without key (collapsed to None / a single leaf when it empties out)"""
+    index = (key_hash >> shift) & _MASK
+    slot = node[index]
+    if slot is None:
+        return node, False
+    if type(slot) is tuple:
+        new, removed = _dissoc(slot, shift + _BITS, key_hash, key)
+        if not removed:
+            return node, False
+    elif slot.hash != key_hash:
+        return node, False
+    elif type(slot) is _Leaf:
+        if slot.key != key:
+            return node, False
+        new = None
+    else:
+        items = tuple(item for item in slot.items if item[0] != key)
+        if len(items) == len(slot.items):
+            return node, False
+        new = _Collision(key_hash, items) if len(items) > 1 else _Leaf(key_hash, *items[0])
+
+    result = node[:index] + (new,) + node[index + 1:]
+    occupied = [child for child in result if child is not None]
+    if not occupied:
+        return None, True
+    if len(occupied) == 1 and type(occupied[0]) is not tuple and shift > 0:
+        return occupied[0], True
+    return result, True
+
+
+def _items(slot) -> Iterator[Tuple[Any, Any]]:
+    if slot is None:
+        return
+    if type(slot) is tuple:
+        for child in slot:
+            if child is not None:
+                yield from _items(child)
+    elif type(slot) is _Leaf:
+        yield slot.key, slot.value
+    else:
+        yield from slot.items
+
+
+def _diff(old, new) -> Iterator[Tuple[Any, Any, Any]]:
+    """(key, old value, new value) for keys that differ; shared subtrees are skipped"""
+    if old is new:
+        return
+    if type(old) is tuple and type(new) is tuple:
+        for old_child, new_child in zip(old, new):
+            if old_child is not new_child:
+                yield from _diff(old_child, new_child)
+        return
+
+    old_items = dict(_items(old))
+    for key, value in _items(new):
+        previous = old_items.pop(key, _MISSING)
+        if previous is not value:
+            yield key, previous, value
+    for key, value in old_items.items():
+        yield key, value, _MISSING
+
+
+class PersistentMap(Mapping):
+    """
+    Immutable hash trie map. set() / delete() return a new map sharing every
+    untouched node with the old one (O(log32 n) nodes copied).
+    """
+
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, root: tuple = _EMPTY_NODE, size: int = 0):
+        self._root = root
+        self._size = size
+
+    @classmethod
+    def from_items(cls, items) -> 'PersistentMap':
+        result = cls()
+        for key, value in items:
+            result = result.set(key, value)
+        return result
+
+    def set(self, key: Any, value: Any) -> 'PersistentMap':
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return PersistentMap(root, self._size + added)
+
+    def delete(self, key: Any) -> 'PersistentMap':
+        root, removed = _dissoc(self._root, 0, _hash(key), key)
+        if not removed:
+            return self
+        return PersistentMap(root if root is not None else _EMPTY_NODE, self._size - 1)
+
+    def __getitem__(self, key: Any) -> Any:
+        key_hash = _hash(key)
+        node, shift = self._root, 0
+        while True:
+            slot = node[(key_hash >> shift) & _MASK]
+            if slot is None:
+                raise KeyError(key)
+            if type(slot) is tuple:
+                node, shift = slot, shift + _BITS
+                continue
+            if type(slot) is _Leaf:
+                if slot.key == key:
+                    return slot.value
+                raise KeyError(key)
+            for item_key, value in slot.items:
+                if item_key == key:
+                    return value
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        for key, _ in _items(self._root):
+            yield key
+
+    def items(self):
+        return _items(self._root)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def diff(self, newer: 'PersistentMap') -> Iterator[Tuple[Any, Any, Any]]:
+        """(key, value here, value in newer) for every differing key; a missing side is _MISSING"""
+        return _diff(self._root, newer._root)
+
+
+class SnapshotDict(dict):
+    """
+    Dict that can hand out O(1) immutable snapshots of itself.
+    Mutations take a short lock; once the first snapshot has been taken they are also
+    mirrored into a PersistentMap whose current root is the snapshot.
+
+    The lock is one per dict, so it serializes every writer, including those that hold
+    different stripes of ConcurrentSharedMemory. It only covers the dict store and the
+    O(log32 n) path copy of the mirror, never the caller's read-modify-write, so striping
+    still decides how long writers of different keys wait on each other.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._map: Optional[PersistentMap] = None
+        self._lock = threading.Lock()
+
+    def snapshot_map(self) -> PersistentMap:
+        with self._lock:
+            if self._map is None:
+                self._map = PersistentMap.from_items(dict.items(self))
+            return self._map
+
+    def __setitem__(self, key, value) -> None:
+        # Writers always hold the lock so snapshot_map() never copies a dict that is changing
+        with self._lock:
+            dict.__setitem__(self, key, value)
+            if self._map is not None:
+                self._map = self._map.set(key, value)
+
+    def __delitem__(self, key) -> None:
+        with self._lock:
+            dict.__delitem__(self, key)
+            if self._map is not None:
+                self._map = self._map.delete(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self):
+        key, value = next(reversed(dict.items(self)))
+        del self[key]
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            dict.clear(self)
+            if self._map is not None:
+                self._map = PersistentMap()
+
+
+class MemorySnapshot(Mapping):
+    """
+    Read-only view of memory contents at one memory version.
+    Structurally shares its entries with the live memory and with other snapshots.
+    """
+
+    def __init__(self, contents: PersistentMap, version: int, agents: Tuple[str, ...]):
+        self.contents = contents
+        self.version = version
+        self.agents = agents
+        self.taken_at = datetime.now()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.contents[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.contents)
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def diff(self, newer: 'MemorySnapshot') -> Dict[str, Any]:
+        """
+        Changes from this snapshot to a newer one, in time proportional to the changes
+        
+        Returns:
+            {'added': {key: entry}, 'changed': {key: entry}, 'removed': [key, ...]}
+        """
+        added, changed, removed = {}, {}, []
+        for key, old, new in self.contents.diff(newer.contents):
+            if new is _MISSING:
+                removed.append(key)
+            elif old is _MISSING:
+                added[key] = new
+            else:
+                changed[key] = new
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the contents (O(n); for serialization)"""
+        return dict(self.contents.items())
+
+    def __repr__(self) -> str:
+        return f"MemorySnapshot(version={self.version}, entries={len(self.contents)})"
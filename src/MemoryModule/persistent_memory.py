@@ -0,0 +1,312 @@
+"""
+Persistent Memory Implementation for CollabArena
+SQLite-backed shared / RBAC memory that survives the process and is not bounded by RAM
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from .access_log import DEFAULT_ACCESS_LOG_CAPACITY
+from .key_index import SortedKeyIndex
+from .rbac_memory import RBACMemory
+from .shared_memory import SharedMemory
+
+
+DEFAULT_MEMORY_PATH = "collab_arena_memory.db"
+
+# Fixed SQL text so sqlite3's per-connection statement cache reuses the prepared statements
+_SELECT_ENTRY = "SELECT entry FROM memory WHERE key = ?"
+_UPSERT_ENTRY = ("INSERT INTO memory (key, entry, written_by, version, updated_at) VALUES (?, ?, ?, ?, ?) "
+                 "ON CONFLICT(key) DO UPDATE SET entry = excluded.entry, written_by = excluded.written_by, "
+                 "version = excluded.version, updated_at = excluded.updated_at")
+_DELETE_ENTRY = "DELETE FROM memory WHERE key = ?"
+_SELECT_META = "SELECT value FROM meta WHERE name = ?"
+_UPSERT_META = "INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": list(value)}
+    return str(value)
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__set__" in obj:
+            return set(obj["__set__"])
+    return obj
+
+
+def dumps_entry(entry: Any) -> str:
+    """
+    Serialize a memory entry as JSON (datetimes and sets are tagged, anything else
+    unknown is stored as its str()). JSON rather than pickle: loading never runs code.
+    """
+    return json.dumps(entry, default=_encode_value)
+
+
+def loads_entry(data: Any) -> Any:
+    return json.loads(data, object_hook=_decode_object)
+
+
+class SQLiteMemoryStore(MutableMapping):
+    """
+    Dict-like store of memory entries kept in SQLite (WAL mode).
+    Keys are indexed in RAM in insertion order; entries are stored as JSON and loaded on demand through a bounded LRU
+    read-through cache. Writes are committed in batches (every `batch_size`
+    writes or `flush_interval` seconds) and on flush() / close().
+    """
+
+    def __init__(self, path: str = DEFAULT_MEMORY_PATH, cache_size: int = 1024, batch_size: int = 64,
+                 flush_interval: float = 1.0):
+        """
+        Args:
+            path: SQLite database file
+            cache_size: Entries kept in the read-through cache
+            batch_size: Writes per commit
+            flush_interval: Maximum seconds a write stays uncommitted (checked on the next write)
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._cache: OrderedDict = OrderedDict()
+        self._pending_writes = 0
+        self._last_commit = time.monotonic()
+        self.stats = {
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'commits': 0
+        }
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            "key TEXT PRIMARY KEY, entry BLOB NOT NULL, written_by TEXT, version INTEGER, updated_at REAL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        # Insertion order, like the in-RAM stores (an upsert keeps the row, hence the position)
+        self._keys: Dict[str, None] = dict.fromkeys(
+            row[0] for row in self._conn.execute("SELECT key FROM memory ORDER BY rowid"))
+
+        # Commit pending writes when the store is garbage collected or the process exits
+        self._finalizer = weakref.finalize(self, _close_connection, self._conn)
+
+    # Mapping interface
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._keys:
+                raise KeyError(key)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return self._cache[key]
+
+            self.stats['cache_misses'] += 1
+            row = self._conn.execute(_SELECT_ENTRY, (key,)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            try:
+                entry = loads_entry(row[0])
+            except (ValueError, TypeError) as e:
+                # e.g. an entry written by an older, pickle-based version: never unpickled
+                print(f"Error decoding memory entry {key!r}: {e}")
+                raise KeyError(key) from e
+            self._remember(key, entry)
+            return entry
+
+    def __setitem__(self, key: str, entry: Any) -> None:
+        with self._lock:
+            written_by = entry.get('written_by') if isinstance(entry, dict) else None
+            version = entry.get('version') if isinstance(entry, dict) else None
+            self._conn.execute(_UPSERT_ENTRY, (key, dumps_entry(entry), written_by, version, time.time()))
+            self._keys[key] = None
+            self._remember(key, entry)
+            self._wrote()
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._conn.execute(_DELETE_ENTRY, (key,))
+            del self._keys[key]
+            self._cache.pop(key, None)
+            self._wrote()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM memory")
+            self._keys.clear()
+            self._cache.clear()
+            self._commit()
+
+    def copy(self) -> Dict[str, Any]:
+        """Materialize every entry (debugging / state dumps only)"""
+        with self._lock:
+            return {key: self[key] for key in list(self._keys)}
+
+    # Metadata (small JSON values such as protected keys)
+    def get_meta(self, name: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(_SELECT_META, (name,)).fetchone()
+            return json.loads(row[0]) if row else default
+
+    def set_meta(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(_UPSERT_META, (name, json.dumps(value)))
+            self._wrote()
+
+    # Cache and commits
+    def _remember(self, key: str, entry: Any) -> None:
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _wrote(self) -> None:
+        self._pending_writes += 1
+        if (self._pending_writes >= self.batch_size
+                or time.monotonic() - self._last_commit >= self.flush_interval):
+            self._commit()
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._pending_writes = 0
+        self._last_commit = time.monotonic()
+        self.stats['commits'] += 1
+
+    def flush(self) -> None:
+        """Commit pending writes"""
+        with self._lock:
+            if self._pending_writes:
+                self._commit()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        with self._lock:
+            self._finalizer()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'keys': len(self._keys),
+                'cached_entries': len(self._cache),
+                'pending_writes': self._pending_writes,
+                'path': self.path
+            }
+
+
+def _close_connection(conn: sqlite3.Connection) -> None:
+    try:
+        conn.commit()
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class PersistentMemory(SharedMemory):
+    """
+    Shared memory persisted in SQLite.
+    Same access rules and entry metadata (written_by, timestamp, version) as SharedMemory;
+    entries written in earlier runs against the same file are visible again.
+    """
+
+    def __init__(self, path: str = DEFAULT_MEMORY_PATH, cache_size: int = 1024, batch_size: int = 64,
+                 access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None):
+        super().__init__(access_log_capacity, access_log_spill_path)
+        self.memory = SQLiteMemoryStore(path, cache_size=cache_size, batch_size=batch_size)
+        self.key_index = SortedKeyIndex(self.memory)
+
+    def flush(self) -> None:
+        """Commit pending writes to disk"""
+        self.memory.flush()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        self.memory.close()
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        stats = super().get_memory_stats()
+        stats['storage'] = self.memory.get_stats()
+        return stats
+
+
+class PersistentRBACMemory(RBACMemory):
+    """
+    RBAC memory persisted in SQLite.
+    Entries and protected keys are stored; roles are assigned again when agents register.
+    """
+
+    def __init__(self, path: str = DEFAULT_MEMORY_PATH, cache_size: int = 1024, batch_size: int = 64,
+                 access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None):
+        super().__init__(access_log_capacity, access_log_spill_path)
+        self.memory = SQLiteMemoryStore(path, cache_size=cache_size, batch_size=batch_size)
+        self.key_index = SortedKeyIndex(self.memory)
+        self.protected_keys = set(self.memory.get_meta('protected_keys', []))
+
+    def protect_key(self, key: str, admin_agent_id: str) -> bool:
+        success = super().protect_key(key, admin_agent_id)
+        if success:
+            self._save_protected_keys()
+        return success
+
+    def unprotect_key(self, key: str, admin_agent_id: str) -> bool:
+        success = super().unprotect_key(key, admin_agent_id)
+        if success:
+            self._save_protected_keys()
+        return success
+
+    def delete_key(self, key: str, agent_id: str) -> bool:
+        success = super().delete_key(key, agent_id)
+        if success:
+            self._save_protected_keys()
+        return success
+
+    def evict(self, key: str, reason: str = 'budget') -> bool:
+        was_protected = key in self.protected_keys
+        evicted = super().evict(key, reason)
+        if evicted and was_protected:
+            self._save_protected_keys()
+        return evicted
+    
+    def _save_protected_keys(self) -> None:
+        self.memory.set_meta('protected_keys', sorted(self.protected_keys))
+
+    def flush(self) -> None:
+        """Commit pending writes to disk"""
+        self.memory.flush()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        self.memory.close()
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        stats = super().get_memory_stats()
+        stats['storage'] = self.memory.get_stats()
+        return stats
@@ -3,10 +3,12 @@ RBAC Memory Implementation for CollabArena
 Provides role-based access control for memory operations
 """
 
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, KeysView, List, Any, Optional, Set
 from datetime import datetime
 from enum import Enum
 from .base_memory import BaseMemory
+from .access_log import DEFAULT_ACCESS_LOG_CAPACITY
+from .memory_snapshot import SnapshotDict
 
 
 class AccessLevel(Enum):
@@ -17,19 +19,43 @@ class AccessLevel(Enum):
     ADMIN = "admin"
 
 
+# One bit per access level; agents' permissions are kept as precomputed masks of these bits
+PERMISSION_BITS = {level: 1 << index for index, level in enumerate(AccessLevel)}
+
+
+def permission_mask(permissions: Set[AccessLevel]) -> int:
+    """Bitmask of a set of access levels"""
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
 class RBACMemory(BaseMemory):
     """
     Role-Based Access Control memory implementation
     Controls memory access based on agent roles and permissions
+    
+    Permission checks use per-agent bitmasks recomputed only when roles or role
+    permissions change; role membership counts and the keys visible to each access
+    class (admin / reader) are maintained incrementally as well: writes and deletes
+    update the visible keys in place, and only unprotecting a key rebuilds the
+    reader list (to keep write order).
     """
     
-    def __init__(self):
-        super().__init__()
-        self.memory: Dict[str, Any] = {}
+    def __init__(self, access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None):
+        super().__init__(access_log_capacity, access_log_spill_path)
+        self.memory: Dict[str, Any] = SnapshotDict()
         self.role_permissions: Dict[str, Set[AccessLevel]] = {}
         self.agent_roles: Dict[str, str] = {}
         self.protected_keys: Set[str] = set()  # Keys requiring special permissions
         
+        # Derived state: role / agent permission masks, role members, visible keys per access class
+        self._role_masks: Dict[str, int] = {}
+        self._agent_masks: Dict[str, int] = {}
+        self._role_members: Dict[str, Dict[str, None]] = {}
+        self._visible_keys: Dict[str, Dict[str, None]] = {}  # access class -> visible keys, in write order
+        
         # Initialize default role permissions
         self._setup_default_roles()
     
@@ -43,6 +69,7 @@ class RBACMemory(BaseMemory):
             "Admin": {AccessLevel.READ, AccessLevel.WRITE, AccessLevel.DELETE, AccessLevel.ADMIN},
             "Guest": {AccessLevel.READ}
         }
+        self._role_masks = {role: permission_mask(perms) for role, perms in self.role_permissions.items()}
     
     def register_agent(self, agent_id: str, role: str = "Guest") -> bool:
         """
@@ -57,7 +84,7 @@ class RBACMemory(BaseMemory):
         """
         if agent_id not in self.agents:
             self.agents.append(agent_id)
-            self.agent_roles[agent_id] = role
+            self._assign_role(agent_id, role)
             self.on_agent_registered(agent_id)
             return True
         return False
@@ -80,7 +107,8 @@ class RBACMemory(BaseMemory):
         
         if agent_id in self.agent_roles and new_role in self.role_permissions:
             old_role = self.agent_roles[agent_id]
-            self.agent_roles[agent_id] = new_role
+            self._assign_role(agent_id, new_role)
+            self.version += 1
             self.log_access(admin_agent_id, 'role_change', 
                           f"{agent_id}: {old_role} -> {new_role}", success=True)
             return True
@@ -98,6 +126,8 @@ class RBACMemory(BaseMemory):
             self.role_permissions[role] = set()
         
         self.role_permissions[role].add(permission)
+        self._update_role_mask(role)
+        self.version += 1
         self.log_access(admin_agent_id, 'permission_add', f"{role}: {permission.value}", success=True)
         return True
     
@@ -110,6 +140,8 @@ class RBACMemory(BaseMemory):
         
         if role in self.role_permissions and permission in self.role_permissions[role]:
             self.role_permissions[role].discard(permission)
+            self._update_role_mask(role)
+            self.version += 1
             self.log_access(admin_agent_id, 'permission_remove', f"{role}: {permission.value}", success=True)
             return True
         
@@ -123,6 +155,8 @@ class RBACMemory(BaseMemory):
             return False
         
         self.protected_keys.add(key)
+        self._visible_keys.get('reader', {}).pop(key, None)
+        self.version += 1
         self.log_access(admin_agent_id, 'protect_key', key, success=True)
         return True
     
@@ -134,6 +168,9 @@ class RBACMemory(BaseMemory):
             return False
         
         self.protected_keys.discard(key)
+        # The key goes back to its place in write order: rebuild the reader list on next use
+        self._visible_keys.pop('reader', None)
+        self.version += 1
         self.log_access(admin_agent_id, 'unprotect_key', key, success=True)
         return True
     
@@ -166,6 +203,10 @@ class RBACMemory(BaseMemory):
             self.log_access(agent_id, 'write', key, success=False)
             return False
         
+        if key not in self.memory:
+            self.key_index.add(key)
+            self._add_visible_key(key)
+        
         # Write the value with metadata
         self.memory[key] = {
             'value': value,
@@ -174,10 +215,20 @@ class RBACMemory(BaseMemory):
             'version': self._get_next_version(key),
             'access_level': 'protected' if key in self.protected_keys else 'normal'
         }
+        self.version += 1
         
         self.log_access(agent_id, 'write', key, success=True)
         return True
     
+    def get_value(self, key: str, agent_id: str) -> Optional[Any]:
+        """
+        Get just the value without metadata (with permission check)
+        """
+        entry = self.read(key, agent_id)
+        if entry and isinstance(entry, dict) and 'value' in entry:
+            return entry['value']
+        return entry
+    
     def delete_key(self, key: str, agent_id: str) -> bool:
         """
         Delete a key from RBAC memory with permission check
@@ -193,29 +244,78 @@ class RBACMemory(BaseMemory):
         
         if key in self.memory:
             del self.memory[key]
+            self.key_index.remove(key)
+            self._remove_visible_key(key)
             self.protected_keys.discard(key)  # Remove protection if key is deleted
+            self.version += 1
             self.log_access(agent_id, 'delete', key, success=True)
             return True
         
         return False
     
+    def evict(self, key: str, reason: str = 'budget') -> bool:
+        evicted = super().evict(key, reason)
+        if evicted:
+            self._remove_visible_key(key)
+            self.protected_keys.discard(key)
+        return evicted
+    
     def get_memory_keys(self, agent_id: str) -> List[str]:
         """
-        Get accessible memory keys based on agent permissions
+        Get accessible memory keys based on agent permissions (in write order)
         """
-        if not self._has_permission(agent_id, AccessLevel.READ):
+        return list(self._get_visible_keys(agent_id))
+    
+    def scan_prefix(self, prefix: str = "", start: str = None, end: str = None, limit: int = None,
+                    reverse: bool = False, agent_id: str = None) -> List[str]:
+        """
+        Keys starting with prefix in sorted order, limited to what the agent can see
+        start / end bound the rest of the key after the prefix (inclusive / exclusive)
+        """
+        mask = self._agent_masks.get(agent_id, 0)
+        if not mask & PERMISSION_BITS[AccessLevel.READ]:
             return []
         
-        # Admins see all keys, others see only non-admin-only keys
-        if self._has_permission(agent_id, AccessLevel.ADMIN):
-            return list(self.memory.keys())
-        else:
-            # Filter out keys that might be admin-only based on content or protection
-            accessible_keys = []
-            for key in self.memory.keys():
-                if key not in self.protected_keys or self._has_permission(agent_id, AccessLevel.ADMIN):
-                    accessible_keys.append(key)
-            return accessible_keys
+        accept = None if mask & PERMISSION_BITS[AccessLevel.ADMIN] else self._is_unprotected
+        return self.key_index.scan(prefix, start, end, limit, reverse, accept)
+    
+    def _is_unprotected(self, key: str) -> bool:
+        return key not in self.protected_keys
+    
+    def get_visible_key_set(self, agent_id: str) -> KeysView:
+        """Live set-like view of the keys the agent can see (for fast membership checks)"""
+        return self._get_visible_keys(agent_id).keys()
+    
+    def _get_visible_keys(self, agent_id: str) -> Dict[str, None]:
+        """
+        Keys the agent can see, in write order, built once per access class and then
+        kept up to date by writes, deletes and protections.
+        Admins see all keys, other readers only unprotected ones, non-readers none.
+        """
+        mask = self._agent_masks.get(agent_id, 0)
+        if not mask & PERMISSION_BITS[AccessLevel.READ]:
+            return {}
+        
+        access_class = 'admin' if mask & PERMISSION_BITS[AccessLevel.ADMIN] else 'reader'
+        visible = self._visible_keys.get(access_class)
+        if visible is None:
+            if access_class == 'admin':
+                visible = dict.fromkeys(self.memory.keys())
+            else:
+                visible = dict.fromkeys(key for key in self.memory.keys() if key not in self.protected_keys)
+            self._visible_keys[access_class] = visible
+        return visible
+    
+    def _add_visible_key(self, key: str) -> None:
+        """A new key joins the end of every built visible-key list that may see it"""
+        if 'admin' in self._visible_keys:
+            self._visible_keys['admin'][key] = None
+        if 'reader' in self._visible_keys and key not in self.protected_keys:
+            self._visible_keys['reader'][key] = None
+    
+    def _remove_visible_key(self, key: str) -> None:
+        for visible in self._visible_keys.values():
+            visible.pop(key, None)
     
     def get_agent_permissions(self, agent_id: str) -> Set[AccessLevel]:
         """
@@ -234,7 +334,7 @@ class RBACMemory(BaseMemory):
         return {
             'role': role,
             'permissions': [perm.value for perm in self.role_permissions.get(role, set())],
-            'agents': [agent_id for agent_id, agent_role in self.agent_roles.items() if agent_role == role]
+            'agents': list(self._role_members.get(role, ()))
         }
     
     def get_all_roles(self) -> List[str]:
@@ -256,9 +356,7 @@ class RBACMemory(BaseMemory):
         """
         Get RBAC system statistics
         """
-        role_distribution = {}
-        for role in self.role_permissions.keys():
-            role_distribution[role] = len([a for a, r in self.agent_roles.items() if r == role])
+        role_distribution = {role: len(self._role_members.get(role, ())) for role in self.role_permissions}
         
         return {
             'total_agents': len(self.agents),
@@ -271,15 +369,29 @@ class RBACMemory(BaseMemory):
     
     def _has_permission(self, agent_id: str, required_permission: AccessLevel) -> bool:
         """
-        Check if agent has required permission
+        Check if agent has required permission (one mask lookup)
         """
-        if agent_id not in self.agent_roles:
-            return False
-        
-        role = self.agent_roles[agent_id]
-        role_permissions = self.role_permissions.get(role, set())
-        
-        return required_permission in role_permissions
+        return bool(self._agent_masks.get(agent_id, 0) & PERMISSION_BITS[required_permission])
+    
+    def _assign_role(self, agent_id: str, role: str) -> None:
+        """Set an agent's role, moving it between role member lists and refreshing its mask"""
+        old_role = self.agent_roles.get(agent_id)
+        if old_role is not None:
+            self._role_members.get(old_role, {}).pop(agent_id, None)
+        self.agent_roles[agent_id] = role
+        self._role_members.setdefault(role, {})[agent_id] = None
+        self._agent_masks[agent_id] = self._role_masks.get(role, 0)
+    
+    def _update_role_mask(self, role: str) -> None:
+        """Recompute a role's mask and the masks of its members"""
+        mask = permission_mask(self.role_permissions.get(role, set()))
+        self._role_masks[role] = mask
+        for agent_id in self._role_members.get(role, ()):
+            self._agent_masks[agent_id] = mask
+    
+    def clear_memory(self) -> None:
+        super().clear_memory()
+        self._visible_keys.clear()
     
     def _get_next_version(self, key: str) -> int:
         """Get next version number for a key"""
@@ -3,9 +3,12 @@ Shared Memory Implementation for CollabArena
 All registered agents can read and write to shared memory space
 """
 
-from typing import Dict, List, Any, Optional
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Any, Optional
 from datetime import datetime
 from .base_memory import BaseMemory
+from .access_log import DEFAULT_ACCESS_LOG_CAPACITY
+from .memory_snapshot import SnapshotDict
 
 
 class SharedMemory(BaseMemory):
@@ -14,9 +17,9 @@ class SharedMemory(BaseMemory):
     All agents have equal access to all memory locations
     """
     
-    def __init__(self):
-        super().__init__()
-        self.memory: Dict[str, Any] = {}
+    def __init__(self, access_log_capacity: int = DEFAULT_ACCESS_LOG_CAPACITY, access_log_spill_path: str = None):
+        super().__init__(access_log_capacity, access_log_spill_path)
+        self.memory: Dict[str, Any] = SnapshotDict()
     
     def read(self, key: str, agent_id: str) -> Optional[Any]:
         """
@@ -28,9 +31,9 @@ class SharedMemory(BaseMemory):
             self.log_access(agent_id, 'read', key, success=False)
             return None
         
-        # Try to read the value
-        if key in self.memory:
-            value = self.memory[key]
+        # Try to read the value (a single lookup, so a concurrent delete cannot interleave)
+        value = self.memory.get(key)
+        if value is not None:
             self.log_access(agent_id, 'read', key, success=True)
             return value
         else:
@@ -48,15 +51,57 @@ class SharedMemory(BaseMemory):
             return False
         
         # Write the value with metadata
+        with self._key_lock(key):
+            self._store(key, value, agent_id)
+        
+        self.log_access(agent_id, 'write', key, success=True)
+        return True
+    
+    def write_if_version(self, key: str, value: Any, expected_version: int, agent_id: str) -> bool:
+        """
+        Compare-and-swap write: store the value only if the key is still at expected_version
+        
+        Args:
+            key: Memory key to write
+            value: Value to store
+            expected_version: Version the writer last read (0 means the key must not exist yet)
+            agent_id: ID of the agent requesting write access
+            
+        Returns:
+            True if the value was written, False if the agent is unknown or the version moved on
+        """
+        if agent_id not in self.agents:
+            self.log_access(agent_id, 'write', key, success=False)
+            return False
+        
+        with self._key_lock(key):
+            entry = self.memory.get(key)
+            current_version = entry['version'] if entry is not None else 0
+            success = current_version == expected_version
+            if success:
+                self._store(key, value, agent_id)
+        
+        self.log_access(agent_id, 'write', key, success=success)
+        return success
+    
+    def _store(self, key: str, value: Any, agent_id: str) -> None:
+        """Store an entry with the next per-key version (caller holds the key's lock)"""
+        if key not in self.memory:
+            self.key_index.add(key)
         self.memory[key] = {
             'value': value,
             'written_by': agent_id,
             'timestamp': datetime.now(),
             'version': self._get_next_version(key)
         }
-        
-        self.log_access(agent_id, 'write', key, success=True)
-        return True
+        self._bump_version()
+    
+    def _key_lock(self, key: str) -> ContextManager:
+        """Lock guarding read-modify-write of one key (none needed single-threaded)"""
+        return nullcontext()
+    
+    def _bump_version(self) -> None:
+        self.version += 1
     
     def register_agent(self, agent_id: str) -> bool:
         """
@@ -75,6 +120,16 @@ class SharedMemory(BaseMemory):
         """
         return list(self.memory.keys())
     
+    def scan_prefix(self, prefix: str = "", start: str = None, end: str = None, limit: int = None,
+                    reverse: bool = False, agent_id: str = None) -> List[str]:
+        """
+        Keys starting with prefix in sorted order (reverse=True for largest first)
+        start / end bound the rest of the key after the prefix (inclusive / exclusive)
+        """
+        if agent_id is not None and agent_id not in self.agents:
+            return []
+        return self.key_index.scan(prefix, start, end, limit, reverse)
+    
     def get_memory_info(self, key: str, agent_id: str) -> Optional[Dict[str, Any]]:
         """
         Get metadata about a memory entry
@@ -98,14 +153,32 @@ class SharedMemory(BaseMemory):
         if agent_id not in self.agents:
             return False
         
-        if key in self.memory:
-            del self.memory[key]
+        with self._key_lock(key):
+            deleted = key in self.memory
+            if deleted:
+                del self.memory[key]
+                self.key_index.remove(key)
+                self._bump_version()
+        
+        if deleted:
             self.log_access(agent_id, 'delete', key, success=True)
             return True
         
         self.log_access(agent_id, 'delete', key, success=False)
         return False
     
+    def evict(self, key: str, reason: str = 'budget') -> bool:
+        with self._key_lock(key):
+            evicted = key in self.memory
+            if evicted:
+                del self.memory[key]
+                self.key_index.remove(key)
+                self._bump_version()
+        
+        if evicted:
+            self.log_access('memory_budget', 'evict', f"{key} ({reason})", success=True)
+        return evicted
+    
     def _get_next_version(self, key: str) -> int:
         """
         Get the next version number for a key
@@ -129,55 +202,12 @@ class SharedMemory(BaseMemory):
         """
         return self.agents.copy()
     
-    def get_agent_activity(self, agent_id: str) -> Dict[str, Any]:
-        """
-        Get activity summary for a specific agent
-        """
-        if agent_id not in self.agents:
-            return {}
-        
-        agent_logs = self.get_access_log(agent_id)
-        reads = len([log for log in agent_logs if log['operation'] == 'read'])
-        writes = len([log for log in agent_logs if log['operation'] == 'write'])
-        
-        return {
-            'agent_id': agent_id,
-            'total_reads': reads,
-            'total_writes': writes,
-            'total_operations': len(agent_logs),
-            'memory_type': 'SharedMemory'
-        }
-    
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """
-        Get overall memory usage statistics
-        """
-        total_operations = len(self.access_log)
-        successful_operations = len([log for log in self.access_log if log['success']])
-        success_rate = successful_operations / total_operations if total_operations > 0 else 0.0
-        
-        reads = len([log for log in self.access_log if log['operation'] == 'read'])
-        writes = len([log for log in self.access_log if log['operation'] == 'write'])
-        deletes = len([log for log in self.access_log if log['operation'] == 'delete'])
-        
-        return {
-            'total_keys': len(self.memory),
-            'total_agents': len(self.agents),
-            'total_operations': total_operations,
-            'successful_operations': successful_operations,
-            'success_rate': success_rate,
-            'operation_breakdown': {
-                'reads': reads,
-                'writes': writes,
-                'deletes': deletes
-            },
-            'memory_type': 'SharedMemory'
-        }
-    
     def clear_memory(self) -> bool:
         """
         Clear all memory contents
         """
         self.memory.clear()
+        self.key_index.clear()
         self.access_log.clear()
+        self._bump_version()
         return True
\ No newline at end of file
@@ -3,9 +3,9 @@ Short Term Memory Implementation for CollabArena
 Provides temporary memory storage with limited capacity and automatic cleanup
 """
 
+from bisect import bisect_right
 from typing import List, Any, Optional
 from datetime import datetime
-from collections import deque
 
 
 class ShortTermMemory:
@@ -13,29 +13,63 @@ class ShortTermMemory:
     Short-term memory implementation with bounded capacity.
     Automatically manages memory by removing oldest entries when capacity is exceeded.
     Ideal for storing recent events, conversations, and temporary context.
+    
+    Events live in a ring buffer of parallel preallocated arrays (timestamps and
+    payload references). Event ids are monotonic, tail reads cost O(limit) and
+    time range queries bisect the (non-decreasing) timestamps.
     """
     
     def __init__(self, max_size: int = 100):
         """
         Initialize short-term memory with specified capacity
         """
-        self.history: deque = deque(maxlen=max_size)
         self.max_size: int = max_size
+        capacity = max(max_size, 0)
+        self._timestamps: List[Optional[datetime]] = [None] * capacity
+        self._events: List[Any] = [None] * capacity
+        self._head: int = 0  # Slot of the oldest event
+        self._size: int = 0
+        self._next_event_id: int = 0
+        # Bumped on every add/clear so readers can tell when their cached view is stale
+        self.version: int = 0
+    
+    def _slot(self, position: int) -> int:
+        """Array slot of the event at a position (0 = oldest)"""
+        return (self._head + position) % self.max_size
+    
+    def _entry(self, position: int) -> dict:
+        """Event entry with metadata at a position"""
+        slot = self._slot(position)
+        return {
+            'timestamp': self._timestamps[slot],
+            'data': self._events[slot],
+            'event_id': self._next_event_id - self._size + position
+        }
     
     def add_event(self, event: Any) -> None:
         """
         Add an event to short-term memory
         
         """
-        # Create event entry with timestamp and metadata
-        event_entry = {
-            'timestamp': datetime.now(),
-            'data': event,
-            'event_id': len(self.history)  # Simple incremental ID
-        }
+        timestamp = datetime.now()
+        if self._size and timestamp < self._timestamps[self._slot(self._size - 1)]:
+            # Keep timestamps sorted for bisect even if the wall clock steps back
+            timestamp = self._timestamps[self._slot(self._size - 1)]
+        
+        self._next_event_id += 1
+        self.version += 1
+        if self.max_size <= 0:
+            return
         
-        # Add to history (automatically removes oldest if at capacity)
-        self.history.append(event_entry)
+        # Overwrite the oldest slot when at capacity
+        if self._size == self.max_size:
+            slot = self._head
+            self._head = (self._head + 1) % self.max_size
+        else:
+            slot = self._slot(self._size)
+            self._size += 1
+        self._timestamps[slot] = timestamp
+        self._events[slot] = event
     
     def get_recent(self, limit: int) -> List[Any]:
         """
@@ -45,11 +79,8 @@ class ShortTermMemory:
         if limit <= 0:
             return []
         
-        # Get the last 'limit' events
-        recent_events = list(self.history)[-limit:]
-        
         # Return just the event data, not the metadata
-        return [event['data'] for event in recent_events]
+        return [self._events[self._slot(position)] for position in range(max(self._size - limit, 0), self._size)]
     
     def get_recent_with_metadata(self, limit: int) -> List[dict]:
         """
@@ -58,52 +89,59 @@ class ShortTermMemory:
         if limit <= 0:
             return []
         
-        return list(self.history)[-limit:]
+        return [self._entry(position) for position in range(max(self._size - limit, 0), self._size)]
+    
+    @property
+    def history(self) -> List[dict]:
+        """All event entries with metadata, oldest first"""
+        return [self._entry(position) for position in range(self._size)]
     
     def clear(self) -> None:
         """
         Clear all events from short-term memory
         """
-        self.history.clear()
+        for slot in range(len(self._events)):
+            self._timestamps[slot] = None
+            self._events[slot] = None
+        self._head = 0
+        self._size = 0
+        self.version += 1
     
     def size(self) -> int:
         """
         Get current number of events in memory
         
         """
-        return len(self.history)
+        return self._size
     
     def is_full(self) -> bool:
         """
         Check if memory is at capacity
         """
-        return len(self.history) >= self.max_size
+        return self._size >= self.max_size
     
     def get_all_events(self) -> List[Any]:
         """
         Get all events currently in memory
         
         """
-        return [event['data'] for event in self.history]
+        return self.get_recent(self._size)
     
     def get_events_since(self, timestamp: datetime) -> List[Any]:
         """
         Get all events since a specific timestamp
         
-       
+        Timestamps are non-decreasing, so the first newer event is found by bisection.
         """
-        filtered_events = [
-            event['data'] for event in self.history
-            if event['timestamp'] > timestamp
-        ]
-        return filtered_events
+        first = bisect_right(range(self._size), timestamp, key=lambda position: self._timestamps[self._slot(position)])
+        return [self._events[self._slot(position)] for position in range(first, self._size)]
     
     def get_memory_info(self) -> dict:
         """
         Get information about the current memory state
         
         """
-        if not self.history:
+        if not self._size:
             return {
                 'size': 0,
                 'max_size': self.max_size,
@@ -113,22 +151,19 @@ class ShortTermMemory:
                 'utilization_percent': 0.0
             }
         
-        oldest_event = self.history[0]
-        newest_event = self.history[-1]
-        
         return {
-            'size': len(self.history),
+            'size': self._size,
             'max_size': self.max_size,
             'is_full': self.is_full(),
-            'oldest_event': oldest_event['timestamp'],
-            'newest_event': newest_event['timestamp'],
-            'utilization_percent': (len(self.history) / self.max_size) * 100
+            'oldest_event': self._timestamps[self._slot(0)],
+            'newest_event': self._timestamps[self._slot(self._size - 1)],
+            'utilization_percent': (self._size / self.max_size) * 100
         }
     
     def __str__(self) -> str:
         """String representation of the memory state"""
-        return f"ShortTermMemory(size={len(self.history)}/{self.max_size})"
+        return f"ShortTermMemory(size={self._size}/{self.max_size})"
     
     def __repr__(self) -> str:
         """Detailed string representation"""
-        return f"ShortTermMemory(history={len(self.history)} events, max_size={self.max_size})"
+        return f"ShortTermMemory(history={self._size} events, max_size={self.max_size})"
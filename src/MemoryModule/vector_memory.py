@@ -0,0 +1,200 @@
+"""
+Vector Memory for CollabArena
+Semantic memory tier: offline hashed n-gram embeddings kept in a contiguous NumPy matrix
+"""
+
+import re
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class HashedNgramEmbedder:
+    """
+    Local, deterministic text embedding with the hashing trick.
+    Character n-grams (within word boundaries) and whole words are hashed with a
+    stable hash into `dim` signed buckets; the vector is L2-normalized so a dot
+    product is a cosine similarity.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (3, 5), word_weight: float = 2.0):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+
+    def _features(self, text: str) -> Dict[str, float]:
+        features: Dict[str, float] = {}
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            features["w:" + word] = features.get("w:" + word, 0.0) + self.word_weight
+            padded = f" {word} "
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                for i in range(len(padded) - n + 1):
+                    gram = padded[i:i + n]
+                    features[gram] = features.get(gram, 0.0) + 1.0
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embedding of one text (all zeros when it has no words)"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(text).items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dim] += sign * weight
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class VectorMemory:
+    """
+    Embedding matrix with incremental append and tombstone deletion.
+    Rows are preallocated (capacity doubles when full); removed rows are zeroed and
+    masked until enough tombstones pile up to compact the matrix. A query is one
+    matrix-vector product followed by argpartition top-k selection.
+    """
+
+    def __init__(self, dim: int = 512, initial_capacity: int = 1024, embedder: HashedNgramEmbedder = None,
+                 compact_ratio: float = 0.5):
+        """
+        Args:
+            dim: Embedding dimension (ignored when an embedder is given)
+            initial_capacity: Rows preallocated for embeddings
+            embedder: Text embedder (hashed n-grams by default)
+            compact_ratio: Fraction of tombstoned rows that triggers compaction
+        """
+        self.embedder = embedder or HashedNgramEmbedder(dim)
+        self.dim = self.embedder.dim
+        self.compact_ratio = compact_ratio
+        self._matrix = np.zeros((initial_capacity, self.dim), dtype=np.float32)
+        self._alive = np.zeros(initial_capacity, dtype=bool)
+        self._keys: List[Optional[str]] = []
+        self._slot_of: Dict[str, int] = {}
+        self.tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def add(self, key: str, text: str) -> None:
+        """Embed a text and store it under key (replacing the previous embedding)"""
+        self.add_vector(key, self.embedder.embed(text))
+
+    def add_vector(self, key: str, vector: np.ndarray) -> None:
+        """Store a precomputed embedding under key"""
+        if key in self._slot_of:
+            self.remove(key)
+
+        slot = len(self._keys)
+        if slot >= len(self._matrix):
+            self._grow()
+        self._matrix[slot] = vector
+        self._alive[slot] = True
+        self._keys.append(key)
+        self._slot_of[key] = slot
+
+    def remove(self, key: str) -> bool:
+        """Tombstone the embedding of key"""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        self._matrix[slot] = 0.0
+        self._alive[slot] = False
+        self._keys[slot] = None
+        self.tombstones += 1
+        if self.tombstones > self.compact_ratio * max(len(self._keys), 1):
+            self.compact()
+        return True
+
+    def clear(self) -> None:
+        self._matrix[:] = 0.0
+        self._alive[:] = False
+        self._keys = []
+        self._slot_of = {}
+        self.tombstones = 0
+
+    def _grow(self) -> None:
+        capacity = max(len(self._matrix) * 2, 1)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:len(self._matrix)] = self._matrix
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._matrix, self._alive = matrix, alive
+
+    def compact(self) -> None:
+        """Drop tombstoned rows, keeping the insertion order of the live ones"""
+        used = len(self._keys)
+        live = np.flatnonzero(self._alive[:used])
+        count = len(live)
+        self._matrix[:count] = self._matrix[live]
+        self._matrix[count:used] = 0.0
+        self._alive[:count] = True
+        self._alive[count:used] = False
+        self._keys = [self._keys[slot] for slot in live]
+        self._slot_of = {key: slot for slot, key in enumerate(self._keys)}
+        self.tombstones = 0
+
+    def search(self, query: str, k: int = 5, accept: Callable[[str], bool] = None,
+               min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Top-k stored texts by cosine similarity to the query (equal scores: newest first)
+
+        Args:
+            query: Free-text query
+            k: Number of results
+            accept: Optional filter on keys (e.g. visibility)
+            min_score: Results must score above this similarity
+
+        Returns:
+            (key, score) pairs, best first
+        """
+        used = len(self._keys)
+        if used == 0 or k <= 0:
+            return []
+
+        scores = self._matrix[:used] @ self.embedder.embed(query)
+        scores[~self._alive[:used]] = -np.inf
+
+        # With a filter, widen the candidate pool and fall back to a full sort if it runs dry
+        pool = k if accept is None else k * 4
+        results = self._take(scores, min(pool, used), k, accept, min_score)
+        if accept is not None and len(results) < k and pool < used:
+            results = self._take(scores, used, k, accept, min_score)
+        return results
+
+    def _take(self, scores: np.ndarray, pool: int, k: int, accept: Callable[[str], bool],
+              min_score: float) -> List[Tuple[str, float]]:
+        if pool < len(scores):
+            # Keep every row tied with the pool-th best so the recency tie-break sees them all
+            kth_score = np.partition(scores, len(scores) - pool)[len(scores) - pool]
+            candidates = np.flatnonzero(scores >= kth_score)
+        else:
+            candidates = np.arange(len(scores))
+        # Rows keep insertion order (also through compaction), so a higher slot is newer
+        ordered = candidates[np.lexsort((-candidates, -scores[candidates]))]
+
+        results = []
+        for slot in ordered:
+            score = float(scores[slot])
+            if score <= min_score:
+                break
+            key = self._keys[slot]
+            if accept is not None and not accept(key):
+                continue
+            results.append((key, score))
+            if len(results) == k:
+                break
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """Matrix occupancy"""
+        return {
+            'entries': len(self._slot_of),
+            'tombstones': self.tombstones,
+            'capacity': len(self._matrix),
+            'dim': self.dim,
+            'matrix_bytes': int(self._matrix.nbytes)
+        }
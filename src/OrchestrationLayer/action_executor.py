@@ -20,6 +20,8 @@ from langgraph.checkpoint.memory import MemorySaver
 
 # Import existing components
 from src.agent import Agent
+from src.LLMModule.hedging import HedgingPolicy
+from src.LLMModule.streaming import JSONObjectStream
 from src.MemoryModule.memory_manager import MemoryManager
 from src.EnviromentModule.enviroment_agent import EnviromentAgent
 from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode, create_message
@@ -81,7 +83,12 @@ class ActionExecutor:
     LangGraph-based Action Executor with Agent-driven execution intelligence
     """
     
-    def __init__(self , shared_log : SharedLog):
+    def __init__(self , shared_log : SharedLog, hedging_policy: HedgingPolicy = None):
+        """
+        Args:
+            shared_log: Event log of the run
+            hedging_policy: Optional tail-latency hedging for the Action Executor agent's LLM calls
+        """
         self.memory = MemorySaver()  # In-memory storage for current session
         self.workflow = StateGraph(ActionExecutionState)
         self.app = None
@@ -90,7 +97,7 @@ class ActionExecutor:
         self.shared_log = shared_log
         
         # Create Action Executor agent with short-term memory
-        self.action_executor_agent = self._create_action_executor_agent()
+        self.action_executor_agent = self._create_action_executor_agent(hedging_policy)
         
         # Communication manager for agent interaction
         self.comm_manager = CommunicationManager(mode=CommunicationMode.DIRECT)
@@ -104,7 +111,7 @@ class ActionExecutor:
         
         self._setup_workflow()
     
-    def _create_action_executor_agent(self) -> Agent:
+    def _create_action_executor_agent(self, hedging_policy: HedgingPolicy = None) -> Agent:
         """Create the Action Executor agent with appropriate configuration"""
 
         tools_context = "\n".join([
@@ -170,7 +177,8 @@ class ActionExecutor:
             agent_id="action_executor",
             role="Action Executor",
             system_prompt=action_executor_system_prompt,
-            memory_manager=memory_manager
+            memory_manager=memory_manager,
+            hedging_policy=hedging_policy
         )
         
         logger.info("✅ Created Action Executor Agent with short-term memory")
@@ -1668,15 +1676,23 @@ class ActionExecutor:
     
     # Helper Methods for Response Parsing
     
-    def _parse_environment_analysis(self, response: str) -> Dict[str, Any]:
-        """Parse environment analysis from Action Executor agent response"""
+    def _extract_json(self, response: str) -> Optional[Dict[str, Any]]:
+        """First top-level JSON object of a response, else the {...} span of the text"""
+        for obj in JSONObjectStream().feed(response):
+            return obj
         try:
-            # Try to extract JSON from response
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 return json.loads(json_match.group())
         except:
             pass
+        return None
+
+    def _parse_environment_analysis(self, response: str) -> Dict[str, Any]:
+        """Parse environment analysis from Action Executor agent response"""
+        result = self._extract_json(response)
+        if result is not None:
+            return result
         
         # Fallback parsing
         return {
@@ -1690,16 +1706,10 @@ class ActionExecutor:
     
     def _parse_agent_selection(self, response: str, available_agents: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Parse agent selection from Action Executor agent response"""
-        try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-                # Validate selected agent exists
-                if result.get("selected_agent_id") in [agent.get("agent_id") for agent in available_agents]:
-                    return result
-        except:
-            pass
+        result = self._extract_json(response)
+        # Validate selected agent exists
+        if result is not None and result.get("selected_agent_id") in [agent.get("agent_id") for agent in available_agents]:
+            return result
         
         # Fallback: select first available agent
         if available_agents:
@@ -1717,14 +1727,9 @@ class ActionExecutor:
     
     def _parse_action_evaluation(self, response: str) -> Dict[str, Any]:
         """Parse action evaluation from Action Executor agent response"""
-        try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-                return result
-        except:
-            pass
+        result = self._extract_json(response)
+        if result is not None:
+            return result
         
         # Fallback evaluation - but be more accepting of search tool actions
         return {
@@ -1739,22 +1744,18 @@ class ActionExecutor:
     
     def _parse_completion_decision(self, response: str) -> Dict[str, Any]:
         """Parse completion decision from Action Executor agent response"""
-        try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-                
-                # Add pragmatic completion logic
-                # If we have a successful execution result, consider task complete
-                # even if the LLM thinks it's not perfect
+        result = self._extract_json(response)
+        if result is not None:
+            # Add pragmatic completion logic
+            # If we have a successful execution result, consider task complete
+            # even if the LLM thinks it's not perfect
+            try:
                 if result.get("completion_percentage", 0) >= 0.7:
                     result["complete"] = True
                     result["reasoning"] = f"Task sufficiently completed (≥70% complete): {result.get('reasoning', '')}"
-                
                 return result
-        except:
-            pass
+            except:
+                pass
         
         # Fallback completion decision - be more decisive
         return {
@@ -1022,11 +1022,11 @@ class LangGraphCoordinationEngine:
         """Create memory manager with configuration reasoning"""
         try:
             if memory_config == "rbac":
-                return MemoryManager(memory_type="rbac")
+                return MemoryManager(memory_type="rbac", shared_log=self.shared_log)
             elif memory_config == "isolated":
-                return MemoryManager(memory_type="isolated")
+                return MemoryManager(memory_type="isolated", shared_log=self.shared_log)
             else:
-                return MemoryManager(memory_type="shared")
+                return MemoryManager(memory_type="shared", shared_log=self.shared_log)
         except Exception:
             # Fallback to shared memory
             return MemoryManager(memory_type="shared")
@@ -11,4 +11,5 @@ class EventType(Enum):
     MEMORY_READ  = 7
     MESSAGE_SENT = 8
     HUMAN_FEEDBACK = 9
-    SYSTEM_END = 10
\ No newline at end of file
+    SYSTEM_END = 10
+    MEMORY_EVICT = 11
\ No newline at end of file
@@ -1,7 +1,30 @@
-from typing import Any
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator, List
 from src.CommunicationModule.communication_manager import CommunicationManager, create_message
-from src.clients import get_llm_client, get_llm
+from src.message import Message
 from src.MemoryModule.memory_manager import MemoryManager
+from src.LLMModule.response_cache import LLMResponseCache, get_default_response_cache
+from src.LLMModule.context_builder import ContextBuilder, ContextSection, estimate_tokens
+from src.LLMModule.streaming import GenerationMetrics, JSONObjectStream
+from src.LLMModule.rate_limiter import get_llm_governor
+from src.LLMModule.single_flight import get_single_flight
+from src.LLMModule.hedging import HedgingPolicy
+from src.LLMModule.backends import LLMBackend, get_llm_backend
+
+
+# Hashed n-gram embeddings of unrelated texts still score around 0.1; weaker hits are noise
+SEMANTIC_MIN_SCORE = 0.2
+
+
+@dataclass
+class MemoryContextSnapshot:
+    """Memory context read for one agent turn, tagged with the memory version and query it was read for"""
+    version: tuple
+    shared_memory_lines: List[str]
+    event_lines: List[str]
 
 
 class Agent:
@@ -9,20 +32,51 @@ class Agent:
     Simplified agent that works with any communication protocol through CommunicationManager
     and now includes memory functionality through MemoryManager
     """
-    def __init__(self, agent_id: str, role: str, system_prompt: str, memory_manager: MemoryManager = None):
+    def __init__(self, agent_id: str, role: str, system_prompt: str, memory_manager: MemoryManager = None,
+                 response_cache: LLMResponseCache = None, hedging_policy: HedgingPolicy = None,
+                 backend: LLMBackend = None):
         self.agent_id = agent_id
         self.role = role
         self.system_prompt = system_prompt
         self.step_count = 0
-        self.client = get_llm_client()
-        self.model = get_llm()
+        # Completion backend (the NVIDIA endpoint unless another one is given or set process-wide)
+        self.backend = backend or get_llm_backend()
+        self.model = self.backend.model
+        self.temperature = 0
+
+        # Process-wide rate limiter shared by every LLM call site
+        self.governor = get_llm_governor()
+        self.expected_output_tokens = 512
+
+        # Concurrent identical requests share one call (set to None to disable)
+        self.single_flight = get_single_flight()
+
+        # Optional tail-latency hedging for deterministic calls (off unless a policy is given)
+        self.hedging_policy = hedging_policy
+
+        # Token-budgeted prompt assembly (last build kept for inspection of dropped items)
+        self.context_builder = ContextBuilder(self.model)
+        self.last_context = None
+        # Rendered prompt line and token count per message id (messages never change once sent)
+        self._message_line_cache: OrderedDict = OrderedDict()
+        self.message_line_cache_size = 512
+
+        # Per-call latency metrics (time-to-first-token, tokens/sec), kept next to token_usage
+        self.generation_metrics = GenerationMetrics()
+
+        # Opt-in response cache (explicit or the process-wide default)
+        self.response_cache = response_cache or get_default_response_cache()
 
         # Just to for calculating token usage
         self.token_usage = {
             "input_tokens": 0,
             "output_tokens": 0,
             "total_tokens": 0,
-            "api_calls": 0
+            "api_calls": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "context_items_dropped": 0,
+            "coalesced_calls": 0
         }
         
         # Memory integration with RBAC support
@@ -33,6 +87,10 @@ class Agent:
         else:
             self.memory_manager.register_agent(self.agent_id)
         
+        # Per-turn memory context snapshot, invalidated by memory version
+        self._memory_snapshot = None
+        self.memory_context_stats = {"builds": 0, "reuses": 0}
+
         # Original conversation context - kept for backward compatibility
         self.conversation_context = []  # Keep local context for better LLM responses
 
@@ -48,56 +106,384 @@ class Agent:
 
         print(f"[{self.agent_id}] Generating response for problem: {problem}")
         try:
-            # Format recent messages into conversation history
-            conversation_history = self._format_conversation_history(recent_messages)
-            
-            # Get relevant memory context
-            memory_context = self._get_memory_context()
-            
-            # Combine contexts
-            full_context = conversation_history
-            if memory_context:
-                full_context += f"\n\n=== SHARED MEMORY CONTEXT ===\n{memory_context}"
-            
-            # Truncate if too long
-            max_history_length = 4000
-            if len(full_context) > max_history_length:
-                full_context = full_context[-max_history_length:]
-                
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": f"Problem: {problem}\n\n{full_context}\n"}
-                ],
-                temperature=0,
-            )
-            
-            # Extract response content safely
-            content = response.choices[0].message.content
-
-            print("="*80)
-            print(f"[{self.agent_id}] Generated response: {content}")
-
-            # Track token usage
-            if hasattr(response, 'usage'):
-                self.token_usage["input_tokens"] += response.usage.prompt_tokens
-                self.token_usage["output_tokens"] += response.usage.completion_tokens
-                self.token_usage["total_tokens"] += response.usage.total_tokens
-                self.token_usage["api_calls"] += 1
-            
-            # Handle None or empty responses
-            if content is None or content.strip() == "":
-                return f"[{self.role}] I'm processing the problem but have no specific response at this time."
-            
-            # Store important insights in memory
-            self._store_insights_to_memory(content, problem)
-            
-            return content.strip()
-            
+            messages = self._build_llm_messages(problem, recent_messages)
+            request_key = self._request_key(messages)
+            cache_key = self._cache_lookup_key(request_key)
+            content = self._get_cached_content(cache_key)
+
+            if content is None:
+                started = None
+
+                def request():
+                    nonlocal started
+                    if started is None:
+                        started = time.perf_counter()
+                    return self.backend.complete(messages, model=self.model, temperature=self.temperature)
+
+                async def arequest():
+                    nonlocal started
+                    if started is None:
+                        started = time.perf_counter()
+                    return await self.backend.acomplete(messages, model=self.model, temperature=self.temperature)
+
+                # Every call goes through the process-wide rate limiter / concurrency governor;
+                # identical requests already in flight are joined instead of sent again
+                def governed():
+                    return self.governor.call(
+                        request,
+                        estimated_tokens=self._estimate_request_tokens(messages),
+                        usage_of=self._total_tokens_of
+                    )
+
+                # Hedged requests run async so that the losing one can be cancelled
+                def agoverned():
+                    return self.governor.acall(
+                        arequest,
+                        estimated_tokens=self._estimate_request_tokens(messages),
+                        usage_of=self._total_tokens_of
+                    )
+
+                response, coalesced = self._coalesce(request_key,
+                                                     lambda: self._hedge(request_key, governed, agoverned))
+                content = self._record_llm_response(response, cache_key, started, coalesced)
+
+            return self._process_response_content(content, problem)
+
         except Exception as e:
             print(f"Error generating response for {self.agent_id}: {e}")
             return f"[{self.role}] I encountered an error while processing. Please try again."
+
+    async def agenerate_response(self, problem: str, recent_messages: list) -> str:
+        """
+        Awaitable version of generate_response built on the backend's async completion,
+        so several agents can wait on the LLM at the same time
+        """
+
+        print(f"[{self.agent_id}] Generating response (async) for problem: {problem}")
+        try:
+            messages = self._build_llm_messages(problem, recent_messages)
+            request_key = self._request_key(messages)
+            cache_key = self._cache_lookup_key(request_key)
+            content = self._get_cached_content(cache_key)
+
+            if content is None:
+                started = None
+
+                async def request():
+                    nonlocal started
+                    if started is None:
+                        started = time.perf_counter()
+                    return await self.backend.acomplete(messages, model=self.model, temperature=self.temperature)
+
+                def governed():
+                    return self.governor.acall(
+                        request,
+                        estimated_tokens=self._estimate_request_tokens(messages),
+                        usage_of=self._total_tokens_of
+                    )
+
+                response, coalesced = await self._acoalesce(request_key, lambda: self._ahedge(request_key, governed))
+                content = self._record_llm_response(response, cache_key, started, coalesced)
+
+            return self._process_response_content(content, problem)
+
+        except Exception as e:
+            print(f"Error generating response for {self.agent_id}: {e}")
+            return f"[{self.role}] I encountered an error while processing. Please try again."
+
+    def generate_response_stream(self, problem: str, recent_messages: list) -> Iterator[str]:
+        """
+        Streaming variant of generate_response: yields text chunks as they arrive.
+        Token usage, time-to-first-token and tokens/sec are recorded once the stream ends;
+        use generate_response_streaming to also get the post-processed response and stored insights.
+        """
+
+        print(f"[{self.agent_id}] Streaming response for problem: {problem}")
+        messages = self._build_llm_messages(problem, recent_messages)
+        cache_key = self._cache_lookup_key(self._request_key(messages))
+        content = self._get_cached_content(cache_key)
+        if content is not None:
+            yield content
+            return
+
+        started = None
+
+        def open_stream():
+            # Read the first chunk so errors raised lazily by the stream are retried too
+            nonlocal started
+            if started is None:
+                started = time.perf_counter()
+            stream = iter(self.backend.stream(messages, model=self.model, temperature=self.temperature))
+            first_chunk = next(stream, None)
+            return stream if first_chunk is None else itertools.chain([first_chunk], stream)
+
+        # Opening the stream is retried like any governed call; the stream then holds
+        # its governor slot until the last chunk has arrived
+        estimated_tokens = self._estimate_request_tokens(messages)
+        stream = self.governor.call_held(open_stream, estimated_tokens)
+        usage = {}
+        try:
+            first_token_at = None
+            chunks = []
+            for chunk in stream:
+                text = self._chunk_text(chunk)
+                if text:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(text)
+                    yield text
+                usage = self._usage_from_response(chunk) or usage
+        finally:
+            self.governor.release(estimated_tokens, usage.get("total_tokens"))
+
+        self._record_completion("".join(chunks), usage, cache_key, started, first_token_at, streamed=True)
+
+    async def agenerate_response_stream(self, problem: str, recent_messages: list) -> AsyncIterator[str]:
+        """
+        Async streaming variant: yields text chunks as they arrive from the backend
+        """
+
+        print(f"[{self.agent_id}] Streaming response (async) for problem: {problem}")
+        messages = self._build_llm_messages(problem, recent_messages)
+        cache_key = self._cache_lookup_key(self._request_key(messages))
+        content = self._get_cached_content(cache_key)
+        if content is not None:
+            yield content
+            return
+
+        started = None
+        stream = None
+
+        async def open_stream():
+            nonlocal started, stream
+            if started is None:
+                started = time.perf_counter()
+            stream = self.backend.astream(messages, model=self.model, temperature=self.temperature)
+            try:
+                return await stream.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        estimated_tokens = self._estimate_request_tokens(messages)
+        first_chunk = await self.governor.acall_held(open_stream, estimated_tokens)
+        usage = {}
+        try:
+            first_token_at = None
+            chunks = []
+            async for chunk in _prepend(first_chunk, stream):
+                text = self._chunk_text(chunk)
+                if text:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(text)
+                    yield text
+                usage = self._usage_from_response(chunk) or usage
+        finally:
+            self.governor.release(estimated_tokens, usage.get("total_tokens"))
+
+        self._record_completion("".join(chunks), usage, cache_key, started, first_token_at, streamed=True)
+
+    def generate_response_streaming(self, problem: str, recent_messages: list,
+                                    on_chunk: Callable[[str], None] = None,
+                                    on_json_object: Callable[[dict], None] = None) -> str:
+        """
+        Consume generate_response_stream and return the final response like generate_response.
+        on_chunk gets every text chunk; on_json_object gets each top-level JSON object
+        as soon as it is complete, so parsers can start before the completion ends.
+        """
+        try:
+            json_stream = JSONObjectStream()
+            chunks = []
+            for text in self.generate_response_stream(problem, recent_messages):
+                chunks.append(text)
+                if on_chunk:
+                    on_chunk(text)
+                if on_json_object:
+                    for obj in json_stream.feed(text):
+                        on_json_object(obj)
+
+            return self._process_response_content("".join(chunks), problem)
+
+        except Exception as e:
+            print(f"Error streaming response for {self.agent_id}: {e}")
+            return f"[{self.role}] I encountered an error while processing. Please try again."
+
+    def get_generation_stats(self) -> dict:
+        """Get latency stats (time-to-first-token, tokens/sec, p50/p95) of recent LLM calls"""
+        stats = self.generation_metrics.get_stats()
+        if self.hedging_policy is not None:
+            stats["hedging"] = self.hedging_policy.get_stats()
+        return stats
+
+    def _build_llm_messages(self, problem: str, recent_messages: list) -> list:
+        """
+        Build the chat messages (system + user prompt) sent to the LLM.
+        Sections are packed by priority into the model's token budget:
+        problem, recent messages, shared memory, then short-term events.
+        """
+        # Same query as prepare_turn, so the snapshot taken there is reused
+        shared_memory_lines, event_lines = self._get_memory_context_parts(self._memory_query(recent_messages, problem))
+        rendered = self._render_messages(recent_messages)
+        if rendered:
+            message_lines = [line for line, _ in rendered]
+            message_tokens = [tokens for _, tokens in rendered]
+        else:
+            message_lines, message_tokens = ["No previous messages."], None
+
+        sections = [
+            ContextSection("problem", [f"Problem: {problem}\n"], priority=0, required=True),
+            ContextSection("recent_messages", message_lines, priority=1,
+                           header="=== RECENT MESSAGES ===" if recent_messages else "",
+                           token_counts=message_tokens),
+            ContextSection("shared_memory", shared_memory_lines, priority=2,
+                           header="\n=== SHARED MEMORY CONTEXT ===\n=== SHARED TEAM MEMORY ==="),
+            ContextSection("short_term_events", event_lines, priority=3,
+                           header="\n=== RECENT PERSONAL EVENTS ===")
+        ]
+        built = self.context_builder.build(sections, reserved_tokens=estimate_tokens(self.system_prompt))
+        self.last_context = built
+
+        if built.dropped_items:
+            self.token_usage["context_items_dropped"] += len(built.dropped_items)
+
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": built.text}
+        ]
+
+    def _request_key(self, messages: list):
+        """Content address of a deterministic request, or None when results are not interchangeable"""
+        if not LLMResponseCache.is_cacheable(self.temperature):
+            return None
+        return LLMResponseCache.make_key(self.model, messages, self.temperature)
+
+    def _cache_lookup_key(self, request_key):
+        """Get the response cache key for this request, or None when caching is off"""
+        if self.response_cache is None:
+            return None
+        return request_key
+
+    def _coalesce(self, request_key, fn):
+        """Run fn through the single-flight group; returns (response, coalesced)"""
+        if request_key is None or self.single_flight is None:
+            return fn(), False
+        return self.single_flight.do(request_key, fn)
+
+    async def _acoalesce(self, request_key, fn):
+        """Awaitable version of _coalesce"""
+        if request_key is None or self.single_flight is None:
+            return await fn(), False
+        return await self.single_flight.ado(request_key, fn)
+
+    def _hedge(self, request_key, fn, afn):
+        """
+        Run a blocking call; when hedging applies, its async twin afn is hedged on the
+        policy's background event loop instead (deterministic requests only)
+        """
+        if request_key is None or self.hedging_policy is None:
+            return fn()
+        response, _ = self.hedging_policy.call(afn, self.generation_metrics.latencies())
+        return response
+
+    async def _ahedge(self, request_key, fn):
+        """Run an async fn under the hedging policy (deterministic requests only)"""
+        if request_key is None or self.hedging_policy is None:
+            return await fn()
+        response, _ = await self.hedging_policy.acall(fn, self.generation_metrics.latencies())
+        return response
+
+    def _get_cached_content(self, cache_key):
+        """Serve a response from the cache, counting hits and misses in token_usage"""
+        if cache_key is None:
+            return None
+
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            self.token_usage["cache_misses"] += 1
+            return None
+
+        self.token_usage["cache_hits"] += 1
+        return cached["content"]
+
+    def _record_llm_response(self, response, cache_key=None, started: float = None, coalesced: bool = False):
+        """Extract the content of an LLM completion, track token usage and fill the cache"""
+        # Extract response content safely
+        content = response.choices[0].message.content
+
+        if coalesced:
+            # Another caller paid for this completion (and already filled the cache)
+            self.token_usage["coalesced_calls"] += 1
+            return content
+
+        return self._record_completion(content, self._usage_from_response(response), cache_key, started)
+
+    def _record_completion(self, content, usage: dict, cache_key=None, started: float = None,
+                           first_token_at: float = None, streamed: bool = False):
+        """Track token usage and latency metrics of a finished call and fill the cache"""
+        # Track token usage
+        if usage:
+            self.token_usage["input_tokens"] += usage["prompt_tokens"]
+            self.token_usage["output_tokens"] += usage["completion_tokens"]
+            self.token_usage["total_tokens"] += usage["total_tokens"]
+        self.token_usage["api_calls"] += 1
+
+        if started is not None:
+            finished = time.perf_counter()
+            output_tokens = usage.get("completion_tokens") if usage else None
+            self.generation_metrics.record(
+                latency=finished - started,
+                output_tokens=output_tokens if output_tokens is not None else estimate_tokens(content or ""),
+                time_to_first_token=(first_token_at - started) if first_token_at is not None else None,
+                streamed=streamed
+            )
+
+        if cache_key is not None and content and content.strip():
+            self.response_cache.put(cache_key, content, usage)
+
+        return content
+
+    def _estimate_request_tokens(self, messages: list) -> int:
+        """Tokens a request is expected to use (prompt estimate + expected completion)"""
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        return prompt_tokens + self.expected_output_tokens
+
+    @classmethod
+    def _total_tokens_of(cls, response):
+        """Real total token count of a completion, if the endpoint reported it"""
+        return cls._usage_from_response(response).get("total_tokens")
+
+    @staticmethod
+    def _usage_from_response(response) -> dict:
+        """Read token usage from a completion (or the final chunk of a stream)"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return {}
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens
+        }
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """Text delta carried by a streamed chunk (empty for usage-only chunks)"""
+        if not getattr(chunk, 'choices', None):
+            return ""
+        return getattr(chunk.choices[0].delta, 'content', None) or ""
+
+    def _process_response_content(self, content, problem: str) -> str:
+        """Post-process generated content and store insights"""
+        print("="*80)
+        print(f"[{self.agent_id}] Generated response: {content}")
+        
+        # Handle None or empty responses
+        if content is None or content.strip() == "":
+            return f"[{self.role}] I'm processing the problem but have no specific response at this time."
+        
+        # Store important insights in memory
+        self._store_insights_to_memory(content, problem)
+        
+        return content.strip()
         
     # just a simple func to return the current token usage stats    
     def get_token_stats(self) -> dict:
@@ -110,51 +496,88 @@ class Agent:
         Now includes memory operations for persistent context
         """
         try:
-            # Get new messages (communication-agnostic)
-            recent_messages = comm_manager.receive(self.agent_id)
-            
-            # Store important messages in memory for team context
-            self._store_messages_to_memory(recent_messages, problem)
-            
-
-            # Store action event in short-term memory
-            action_event = {
-                "type": "action",
-                "content": f"Processing problem: {problem[:100]}...",
-                "message_count": len(recent_messages),
-                "step": self.step_count
-            }
-            self.add_to_short_term_memory(action_event)
-            
-            # Update local context (kept for backward compatibility)
-            # self.conversation_context.extend(recent_messages)
-            
-            # Use memory-enhanced context instead of just local context
-            memory_enhanced_context = self._get_enhanced_context(recent_messages)
+            memory_enhanced_context = self.prepare_turn(comm_manager, problem)
             
             # Generate response with memory-enhanced context
             response = self.generate_response(problem, memory_enhanced_context)
             
-            # Ensure response is not None or empty
-            if not response or response.strip() == "":
-                response = f"[{self.role}] No response generated."
+            return self.finish_turn(comm_manager, response, recipient_id)
+            
+        except Exception as e:
+            print(f"Error in agent {self.agent_id} act(): {e}")
+            return "error"
 
+    async def act_async(self, comm_manager: CommunicationManager, problem: str, recipient_id: str = "all") -> str:
+        """
+        Awaitable version of act(): same read / generate / send steps,
+        but the LLM call is awaited instead of blocking
+        """
+        try:
+            memory_enhanced_context = self.prepare_turn(comm_manager, problem)
             
-            # Send response (communication-agnostic)
-            message = create_message(
-                sender_id=self.agent_id,
-                recipient_id=recipient_id,
-                sender_role=self.role,
-                topic=self._determine_topic(response),
-                content=f"[{self.role}]: {response}"
-            )
+            response = await self.agenerate_response(problem, memory_enhanced_context)
             
-            success = comm_manager.send(message)
-            return "success" if success else "failed"
+            return await self.afinish_turn(comm_manager, response, recipient_id)
             
         except Exception as e:
-            print(f"Error in agent {self.agent_id} act(): {e}")
+            print(f"Error in agent {self.agent_id} act_async(): {e}")
             return "error"
+
+    def prepare_turn(self, comm_manager: CommunicationManager, problem: str) -> list:
+        """
+        First half of a turn: read new messages, update memory and
+        return the memory-enhanced context used to prompt the LLM
+        """
+        # Get new messages (communication-agnostic)
+        recent_messages = comm_manager.receive(self.agent_id)
+        
+        # Store important messages in memory for team context
+        self._store_messages_to_memory(recent_messages, problem)
+        
+
+        # Store action event in short-term memory
+        action_event = {
+            "type": "action",
+            "content": f"Processing problem: {problem[:100]}...",
+            "message_count": len(recent_messages),
+            "step": self.step_count
+        }
+        self.add_to_short_term_memory(action_event)
+        
+        # Update local context (kept for backward compatibility)
+        # self.conversation_context.extend(recent_messages)
+        
+        # Use memory-enhanced context instead of just local context
+        return self._get_enhanced_context(recent_messages, problem)
+
+    def finish_turn(self, comm_manager: CommunicationManager, response: str, recipient_id: str = "all") -> str:
+        """
+        Second half of a turn: send the generated response through the communication manager
+        """
+        success = comm_manager.send(self._response_message(response, recipient_id))
+        return "success" if success else "failed"
+
+    async def afinish_turn(self, comm_manager: CommunicationManager, response: str, recipient_id: str = "all") -> str:
+        """
+        Awaitable version of finish_turn(): the send goes through comm_manager.asend(),
+        so a BLOCK backpressure policy waits for queue space instead of dropping
+        """
+        success = await comm_manager.asend(self._response_message(response, recipient_id))
+        return "success" if success else "failed"
+
+    def _response_message(self, response: str, recipient_id: str) -> Message:
+        """Wrap a generated response in a message (communication-agnostic)"""
+        # Ensure response is not None or empty
+        if not response or response.strip() == "":
+            response = f"[{self.role}] No response generated."
+
+        return create_message(
+            sender_id=self.agent_id,
+            recipient_id=recipient_id,
+            sender_role=self.role,
+            topic=self._determine_topic(response),
+            content=f"[{self.role}]: {response}"
+        )
     
     def subscribe_to_topic(self, comm_manager: CommunicationManager, topic: str) -> bool:
         """
@@ -182,46 +605,110 @@ class Agent:
             return "No previous messages."
         
         history = "=== RECENT MESSAGES ===\n"
-        for msg in messages[-10:]:  # Only show last 10 messages
-            try:
-                timestamp = msg.timestamp.strftime("%H:%M:%S")
-                content = msg.content if msg.content else "[No content]"
-                history += f"[{timestamp}] {content}\n"
-            except Exception as e:
-                history += f"[Error formatting message: {e}]\n"
+        for line in self._format_message_lines(messages[-10:]):  # Only show last 10 messages
+            history += f"{line}\n"
         
         return history
+
+    def _format_message_lines(self, messages: list) -> list:
+        """Format each message as one whole line of conversation history"""
+        return [line for line, _ in self._render_messages(messages)]
+
+    def _render_messages(self, messages: list) -> list:
+        """
+        (line, token count) per message; each message is formatted and counted once
+        and then served from a bounded cache keyed by message id
+        """
+        cache = self._message_line_cache
+        rendered = []
+        for msg in messages:
+            message_id = getattr(msg, 'id', None)
+            cached = cache.get(message_id) if message_id is not None else None
+            if cached is None:
+                try:
+                    timestamp = msg.timestamp.strftime("%H:%M:%S")
+                    content = msg.content if msg.content else "[No content]"
+                    line = f"[{timestamp}] {content}"
+                except Exception as e:
+                    line = f"[Error formatting message: {e}]"
+                cached = (line, estimate_tokens(line))
+                if message_id is not None:
+                    cache[message_id] = cached
+                    if len(cache) > self.message_line_cache_size:
+                        cache.popitem(last=False)
+            rendered.append(cached)
+        return rendered
     
-    def _get_memory_context(self) -> str:
+    def _get_memory_context(self, query: str = None) -> str:
         """Get relevant context from shared memory and short-term memory"""
+        shared_memory_lines, event_lines = self._get_memory_context_parts(query)
+
+        context_parts = []
+        if shared_memory_lines:
+            context_parts.append("=== SHARED TEAM MEMORY ===")
+            context_parts.extend(shared_memory_lines)
+        if event_lines:
+            context_parts.append("\n=== RECENT PERSONAL EVENTS ===")
+            context_parts.extend(event_lines)
+
+        return "\n".join(context_parts) if context_parts else ""
+
+    def _get_memory_context_parts(self, query: str = None) -> tuple:
+        """Get shared memory lines and short-term event lines as separate lists"""
+        snapshot = self._get_memory_snapshot(query)
+        return snapshot.shared_memory_lines, snapshot.event_lines
+
+    def _get_memory_snapshot(self, query: str = None) -> MemoryContextSnapshot:
+        """
+        Get the memory context for the current turn.
+        Shared memory entries are the ones most relevant to the query (see _memory_query),
+        or the latest ones without a query or a match.
+        It is computed once and reused until shared or short-term memory or the query changes.
+        """
+        version = self.memory_manager.get_memory_version(self.agent_id) + (query,)
+        if self._memory_snapshot is not None and self._memory_snapshot.version == version:
+            self.memory_context_stats["reuses"] += 1
+            return self._memory_snapshot
+
+        shared_memory_lines = []
+        event_lines = []
         try:
-            context_parts = []
-            
-            # Get shared memory context (team-wide knowledge)
-            memory_keys = self.memory_manager.get_memory_keys()
-            if memory_keys:
-                context_parts.append("=== SHARED TEAM MEMORY ===")
-                for key in memory_keys[-5:]:  # Get last 5 shared memory entries
-                    value = self.memory_manager.get_value(key, self.agent_id)
-                    if value:
-                        context_parts.append(f"{key}: {str(value)[:100]}...")  # Truncate for brevity
+            # Get shared memory context (team-wide knowledge): top 5 entries by relevance,
+            # exact-term matches first, then semantically similar ones
+            entries = []
+            if query:
+                entries = [(hit['key'], hit['value'])
+                           for hit in self.memory_manager.search(query, 5, self.agent_id)]
+                if len(entries) < 5:
+                    seen = {key for key, _ in entries}
+                    for hit in self.memory_manager.semantic_search(query, 5, self.agent_id,
+                                                                   min_score=SEMANTIC_MIN_SCORE):
+                        if hit['key'] not in seen and len(entries) < 5:
+                            entries.append((hit['key'], hit['value']))
+            if not entries:
+                memory_keys = self.memory_manager.get_memory_keys(self.agent_id)
+                for key in memory_keys[-5:]:  # Fall back to the last 5 shared memory entries
+                    entries.append((key, self.memory_manager.get_value(key, self.agent_id)))
+            for key, value in entries:
+                if value:
+                    shared_memory_lines.append(f"{key}: {str(value)[:100]}...")  # Truncate for brevity
             
             # Get short-term memory context (recent personal events)
             recent_events = self.get_recent_short_term_events(5)
-            if recent_events:
-                context_parts.append("\n=== RECENT PERSONAL EVENTS ===")
-                for event in recent_events:
-                    if isinstance(event, dict):
-                        event_type = event.get('type', 'event')
-                        content = event.get('content', str(event))
-                        context_parts.append(f"[{event_type.upper()}] {str(content)[:80]}...")
-                    else:
-                        context_parts.append(f"[EVENT] {str(event)[:80]}...")
-            
-            return "\n".join(context_parts) if context_parts else ""
+            for event in recent_events:
+                if isinstance(event, dict):
+                    event_type = event.get('type', 'event')
+                    content = event.get('content', str(event))
+                    event_lines.append(f"[{event_type.upper()}] {str(content)[:80]}...")
+                else:
+                    event_lines.append(f"[EVENT] {str(event)[:80]}...")
         except Exception as e:
             print(f"Error getting memory context for {self.agent_id}: {e}")
-            return ""
+
+        # Reading memory does not bump the version, so the stamp taken above is still valid
+        self._memory_snapshot = MemoryContextSnapshot(version, shared_memory_lines, event_lines)
+        self.memory_context_stats["builds"] += 1
+        return self._memory_snapshot
     
     def _store_insights_to_memory(self, response_content: str, problem: str):
         """Store important insights from response to shared memory and short-term memory"""
@@ -285,29 +772,27 @@ class Agent:
         except Exception as e:
             print(f"Error storing messages to memory for {self.agent_id}: {e}")
     
-    def _get_enhanced_context(self, recent_messages: list) -> list:
-        """Get enhanced context combining recent messages with memory"""
+    def _get_enhanced_context(self, recent_messages: list, problem: str = None) -> list:
+        """
+        Get the context for this turn: recent messages, with the memory snapshot taken
+        once here and injected into the prompt by _build_llm_messages (not duplicated
+        as an extra pseudo-message)
+        """
         try:
-            # Use original conversation context as fallback
-            enhanced_context = list(recent_messages)
-            
-            # Add memory context if available
-            memory_context = self._get_memory_context()
-            if memory_context:
-                # Create a pseudo-message with memory context
-                class MemoryMessage:
-                    def __init__(self, content):
-                        self.content = f"[SHARED MEMORY] {content}"
-                        from datetime import datetime
-                        self.timestamp = datetime.now()
-                
-                enhanced_context.append(MemoryMessage(memory_context))
-            
-            return enhanced_context
+            self._get_memory_snapshot(self._memory_query(recent_messages, problem))
+            return list(recent_messages)
         except Exception as e:
             print(f"Error getting enhanced context for {self.agent_id}: {e}")
             return recent_messages
     
+    def _memory_query(self, recent_messages: list, problem: str = None) -> str:
+        """
+        Retrieval query for this turn: the latest messages, so memory follows the conversation
+        (the problem is the same every turn; it is only used before anyone has spoken)
+        """
+        texts = [msg.content[:500] for msg in list(recent_messages)[-3:] if getattr(msg, 'content', None)]
+        return "\n".join(texts) if texts else problem
+    
     # Memory-specific methods for external use
     def store_memory(self, key: str, value: any) -> bool:
         """Store data in shared memory"""
@@ -319,7 +804,7 @@ class Agent:
     
     def get_all_memory_keys(self) -> list:
         """Get all available memory keys"""
-        return self.memory_manager.get_memory_keys()
+        return self.memory_manager.get_memory_keys(self.agent_id)
     
     def get_memory_state(self) -> dict:
         """Get current memory state"""
@@ -453,4 +938,12 @@ class Agent:
             return "implementation"
         
         # Default topic
-        return "general"
\ No newline at end of file
+        return "general"
+
+
+async def _prepend(first_chunk, stream: AsyncIterator) -> AsyncIterator:
+    """The chunk read while opening a stream, then the rest of the stream"""
+    if first_chunk is not None:
+        yield first_chunk
+    async for chunk in stream:
+        yield chunk
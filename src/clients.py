@@ -1,21 +1,232 @@
+import asyncio
 import openai
 import os
+import threading
+from typing import Any, Dict, Tuple
+
+import httpx
 from dotenv import load_dotenv
 from tavily import TavilyClient
 from langchain_nvidia_ai_endpoints import ChatNVIDIA
 
 
+NVIDIA_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry handing out one pooled OpenAI client per (base_url, api_key).
+    Every Agent (orchestrator, action executor, sub-agents) shares the same HTTP
+    connection pool instead of opening its own.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str], openai.OpenAI] = {}
+        # async clients are bound to the event loop they were first used in:
+        # (base_url, api_key) -> (loop, client, async generator closing the client at loop shutdown)
+        self._async_clients: Dict[Tuple[str, str], Tuple[Any, openai.AsyncOpenAI, Any]] = {}
+        self._handouts: Dict[Tuple[str, str, str], int] = {}
+        self.clients_created = 0
+        self.configure(max_connections, max_keepalive_connections, keepalive_expiry)
+
+    def configure(self, max_connections: int = None, max_keepalive_connections: int = None,
+                  keepalive_expiry: float = None) -> None:
+        """Change the pool limits (applies to clients created afterwards)"""
+        with self._lock:
+            if max_connections is not None:
+                self.max_connections = max_connections
+            if max_keepalive_connections is not None:
+                self.max_keepalive_connections = max_keepalive_connections
+            if keepalive_expiry is not None:
+                self.keepalive_expiry = keepalive_expiry
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def get_client(self, base_url: str, api_key: str) -> openai.OpenAI:
+        """Get the shared sync client for (base_url, api_key), creating it on first use"""
+        key = (base_url, api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = openai.OpenAI(
+                    base_url=base_url,
+                    api_key=api_key,
+                    http_client=openai.DefaultHttpxClient(limits=self._limits()),
+                    # retries are owned by the LLM governor (Retry-After aware backoff)
+                    max_retries=0
+                )
+                self._clients[key] = client
+                self.clients_created += 1
+            self._count_handout("sync", key)
+            return client
+
+    def get_async_client(self, base_url: str, api_key: str) -> openai.AsyncOpenAI:
+        """
+        Get the shared async client for (base_url, api_key) in the running event loop.
+        A new client replaces the old one when called from a different event loop; the
+        old one is closed, and every client is closed when its event loop shuts down
+        (asyncio.run), so no connection pool outlives its loop.
+        """
+        key = (base_url, api_key)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        replaced = None
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is None or (loop is not None and entry[0] is not loop):
+                replaced = entry
+                client = openai.AsyncOpenAI(
+                    base_url=base_url,
+                    api_key=api_key,
+                    http_client=openai.DefaultAsyncHttpxClient(limits=self._limits()),
+                    # retries are owned by the LLM governor (Retry-After aware backoff)
+                    max_retries=0
+                )
+                entry = (loop, client, _close_at_loop_shutdown(client, loop))
+                self._async_clients[key] = entry
+                self.clients_created += 1
+            self._count_handout("async", key)
+
+        if replaced is not None:
+            _close_async_client(replaced[0], replaced[1])
+        return entry[1]
+
+    def _count_handout(self, kind: str, key: Tuple[str, str]) -> None:
+        handout_key = (kind,) + key
+        self._handouts[handout_key] = self._handouts.get(handout_key, 0) + 1
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get registry and connection pool statistics"""
+        with self._lock:
+            pools = []
+            for key, client in self._clients.items():
+                pools.append(self._describe_pool(key, client, "sync"))
+            for key, (_, client, _) in self._async_clients.items():
+                pools.append(self._describe_pool(key, client, "async"))
+
+            return {
+                'clients_created': self.clients_created,
+                'active_clients': len(self._clients) + len(self._async_clients),
+                'total_handouts': sum(self._handouts.values()),
+                'max_connections': self.max_connections,
+                'max_keepalive_connections': self.max_keepalive_connections,
+                'keepalive_expiry': self.keepalive_expiry,
+                'pools': pools
+            }
+
+    def _describe_pool(self, key: Tuple[str, str], client: Any, kind: str) -> Dict[str, Any]:
+        """Describe one client's pool (connection counts only when the transport exposes them)"""
+        pool = getattr(getattr(getattr(client, '_client', None), '_transport', None), '_pool', None)
+        connections = list(getattr(pool, 'connections', []) or [])
+        return {
+            'base_url': key[0],
+            'kind': kind,
+            'handouts': self._handouts.get((kind,) + key, 0),
+            'open_connections': len(connections),
+            'idle_connections': len([c for c in connections if getattr(c, 'is_idle', lambda: False)()])
+        }
+
+    def close(self) -> None:
+        """Close every pooled client (sync and async) and forget them"""
+        with self._lock:
+            sync_clients = list(self._clients.values())
+            async_entries = list(self._async_clients.values())
+            self._clients.clear()
+            self._async_clients.clear()
+            self._handouts.clear()
+        for client in sync_clients:
+            client.close()
+        for loop, client, _ in async_entries:
+            _close_async_client(loop, client)
+
+
+async def _close_on_shutdown(client: openai.AsyncOpenAI):
+    try:
+        yield
+    finally:
+        if not client.is_closed():
+            await client.close()
+
+
+def _close_at_loop_shutdown(client: openai.AsyncOpenAI, loop) -> Any:
+    """
+    Close the client when its loop shuts down: a started async generator is finalized by
+    loop.shutdown_asyncgens(), which asyncio.run calls before closing the loop
+    """
+    if loop is None:
+        return None
+    closer = _close_on_shutdown(client)
+    asyncio.ensure_future(closer.__anext__())
+    return closer
+
+
+def _close_async_client(loop, client: openai.AsyncOpenAI) -> None:
+    """Close an async client on the event loop its connections belong to"""
+    if client.is_closed():
+        return
+    if loop is not None and loop.is_running():
+        # Its loop (possibly this one) closes it as a task
+        loop.call_soon_threadsafe(lambda: loop.create_task(client.close()))
+        return
+    if loop is not None and loop.is_closed():
+        return  # already closed by the loop's shutdown
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is not None:
+        if loop is None:
+            running.create_task(client.close())
+        # else: an idle loop of this thread closes it when it shuts down
+    elif loop is not None:
+        loop.run_until_complete(client.close())
+    else:
+        asyncio.run(client.close())
+
+
+_client_registry = LLMClientRegistry()
+_env_loaded = False
+
+
+def _load_env_once():
+    """Load the .env file a single time per process"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_client_registry() -> LLMClientRegistry:
+    """Get the process-wide LLM client registry"""
+    return _client_registry
+
+
 def get_llm_client():
     
-    load_dotenv()
+    """"a simple function returning the shared (pooled) OpenAI client"""
+
+    _load_env_once()
+
+    return _client_registry.get_client(NVIDIA_BASE_URL, os.getenv("NVIDIA_API_KEY"))
+
+
+def get_async_llm_client():
+
+    """Async counterpart of get_llm_client, used for awaiting several agent turns concurrently"""
 
-    """"a simple function returning an OpenAI client"""
+    _load_env_once()
 
-    client = openai.OpenAI(
-        base_url="https://integrate.api.nvidia.com/v1", 
-        api_key=os.getenv("NVIDIA_API_KEY")
-    )
-    return client
+    return _client_registry.get_async_client(NVIDIA_BASE_URL, os.getenv("NVIDIA_API_KEY"))
 
 
 def get_llm():
@@ -42,6 +253,6 @@ def get_nvidia_llm():
     llm = ChatNVIDIA(model=model_name , 
                      nvidia_api_key = os.getenv("NVIDIA_API_KEY"),
                      temperature = 0,
-                     base_url="https://integrate.api.nvidia.com/v1")
+                     base_url=NVIDIA_BASE_URL)
 
     return llm
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Round Runner for CollabArena
+Runs rounds of agent turns (optionally with all LLM calls of a round awaited
+concurrently), or lets agents react to messages as they arrive
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from src.agent import Agent
+from src.CommunicationModule.communication_manager import CommunicationManager
+
+
+async def run_round_async(agents: List[Agent], comm_manager: CommunicationManager, problem: str,
+                          recipients: Optional[Dict[str, str]] = None, concurrent: bool = False,
+                          after_turn: Optional[Callable[[Agent, str], None]] = None) -> Dict[str, str]:
+    """
+    Run one round where every agent reads, thinks and sends, in agent order.
+
+    By default the turns are chained, as in a sequential round: each agent reads the
+    messages sent before its turn, including those of earlier agents in the same round.
+
+    With concurrent=True every agent reads its messages before anyone sends, all LLM
+    calls of the round are awaited together and the responses are sent in agent order.
+    The round then takes about as long as its slowest agent, but agents only see the
+    messages of the previous rounds.
+
+    Args:
+        agents: Agents taking part in the round, in speaking order
+        comm_manager: Communication manager shared by the agents
+        problem: Problem statement given to every agent
+        recipients: Optional agent_id -> recipient_id mapping (defaults to "all")
+        concurrent: Overlap the round's LLM calls (reads then exclude same-round sends)
+        after_turn: Optional callback run with (agent, result) right after each agent's send
+
+    Returns:
+        Dictionary mapping agent_id to the turn result ("success", "failed" or "error")
+    """
+    recipients = recipients or {}
+    results: Dict[str, str] = {}
+
+    if not concurrent:
+        for agent in agents:
+            results[agent.agent_id] = await _take_turn(agent, comm_manager, problem,
+                                                       recipients.get(agent.agent_id, "all"))
+            if after_turn:
+                after_turn(agent, results[agent.agent_id])
+        return results
+
+    # Read phase: every agent gets the messages available at the start of the round
+    contexts = {}
+    for agent in agents:
+        try:
+            contexts[agent.agent_id] = agent.prepare_turn(comm_manager, problem)
+        except Exception as e:
+            print(f"Error in agent {agent.agent_id} prepare_turn(): {e}")
+            results[agent.agent_id] = "error"
+
+    # Think phase: all LLM calls of the round are in flight together
+    thinking_agents = [agent for agent in agents if agent.agent_id in contexts]
+    responses = await asyncio.gather(
+        *(agent.agenerate_response(problem, contexts[agent.agent_id]) for agent in thinking_agents),
+        return_exceptions=True
+    )
+
+    # Send phase: deliver responses in agent order
+    for agent, response in zip(thinking_agents, responses):
+        if isinstance(response, BaseException):
+            print(f"Error in agent {agent.agent_id} agenerate_response(): {response}")
+            results[agent.agent_id] = "error"
+            continue
+        try:
+            results[agent.agent_id] = await agent.afinish_turn(
+                comm_manager, response, recipients.get(agent.agent_id, "all")
+            )
+        except Exception as e:
+            print(f"Error in agent {agent.agent_id} afinish_turn(): {e}")
+            results[agent.agent_id] = "error"
+        if after_turn:
+            after_turn(agent, results[agent.agent_id])
+
+    return results
+
+
+def run_rounds(agents: List[Agent], comm_manager: CommunicationManager, problem: str, rounds: int,
+               recipients: Optional[Dict[str, str]] = None, concurrent: bool = False,
+               after_turn: Optional[Callable[[Agent, str], None]] = None) -> List[Dict[str, str]]:
+    """
+    Blocking helper that runs several rounds inside a single event loop
+    (the async LLM client must not be shared across event loops)
+
+    Returns:
+        One result dictionary per round, as returned by run_round_async
+    """
+    async def _run_all() -> List[Dict[str, str]]:
+        all_results = []
+        for round_num in range(rounds):
+            print(f"Round {round_num + 1}/{rounds}")
+            round_results = await run_round_async(agents, comm_manager, problem, recipients, concurrent, after_turn)
+            for agent in agents:
+                print(f"  {agent.role} ({agent.agent_id}): {round_results.get(agent.agent_id)}")
+            all_results.append(round_results)
+        return all_results
+
+    return asyncio.run(_run_all())
+
+
+async def _take_turn(agent: Agent, comm_manager: CommunicationManager, problem: str, recipient_id: str) -> str:
+    """One complete turn: read, think, send"""
+    try:
+        context = agent.prepare_turn(comm_manager, problem)
+        response = await agent.agenerate_response(problem, context)
+        return await agent.afinish_turn(comm_manager, response, recipient_id)
+    except Exception as e:
+        print(f"Error in agent {agent.agent_id} turn: {e}")
+        return "error"
+
+
+async def run_event_driven_async(agents: List[Agent], comm_manager: CommunicationManager, problem: str,
+                                 max_turns: int = 3, idle_timeout: float = 5.0,
+                                 initiators: Optional[List[str]] = None,
+                                 recipients: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+    """
+    Run agents that react to messages instead of taking scripted rounds.
+
+    The initiators (every agent by default) open with one turn; after that an agent
+    sleeps in comm_manager.wait_for_messages() and takes a turn only when something
+    arrives for it, so idle agents make no LLM calls. An agent stops after max_turns
+    turns or once idle_timeout seconds pass without a message. In blackboard mode
+    every post (including the agent's own) wakes every agent.
+
+    Returns:
+        Dictionary mapping agent_id to its turn results, in order
+    """
+    recipients = recipients or {}
+    initiators = set(initiators if initiators is not None else (agent.agent_id for agent in agents))
+
+    async def run_agent(agent: Agent) -> List[str]:
+        turns = []
+        if agent.agent_id in initiators:
+            turns.append(await _take_turn(agent, comm_manager, problem, recipients.get(agent.agent_id, "all")))
+        while len(turns) < max_turns:
+            if not await comm_manager.wait_for_messages(agent.agent_id, idle_timeout):
+                break
+            turns.append(await _take_turn(agent, comm_manager, problem, recipients.get(agent.agent_id, "all")))
+        return turns
+
+    all_turns = await asyncio.gather(*(run_agent(agent) for agent in agents))
+    return {agent.agent_id: turns for agent, turns in zip(agents, all_turns)}
+
+
+def run_event_driven(agents: List[Agent], comm_manager: CommunicationManager, problem: str,
+                     max_turns: int = 3, idle_timeout: float = 5.0, initiators: Optional[List[str]] = None,
+                     recipients: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+    """Blocking helper around run_event_driven_async (one event loop for every LLM call)"""
+    return asyncio.run(run_event_driven_async(agents, comm_manager, problem, max_turns, idle_timeout,
+                                              initiators, recipients))
@@ -0,0 +1,111 @@
+"""
+Test cases for the bounded memory access log and its counters
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.MemoryModule.access_log import AccessLog
+from src.MemoryModule.memory_manager import MemoryManager
+from src.MemoryModule.shared_memory import SharedMemory
+
+
+def entry(agent_id, operation, success=True, key="k"):
+    return {'agent_id': agent_id, 'operation': operation, 'key': key, 'success': success, 'timestamp': None}
+
+
+class TestAccessLog(unittest.TestCase):
+    """Test cases for AccessLog"""
+
+    def test_ring_buffer_keeps_recent_entries(self):
+        log = AccessLog(capacity=3)
+        for i in range(5):
+            log.append(entry("a", "read", key=f"k{i}"))
+
+        self.assertEqual(len(log), 3)
+        self.assertEqual([e['key'] for e in log.entries()], ["k2", "k3", "k4"])
+
+    def test_counters_cover_evicted_entries(self):
+        log = AccessLog(capacity=2)
+        log.append(entry("a", "read"))
+        log.append(entry("a", "write"))
+        log.append(entry("b", "read", success=False))
+
+        self.assertEqual(log.total_operations, 3)
+        self.assertEqual(log.successful_operations, 2)
+        self.assertEqual(log.operation_counts, {'read': 2, 'write': 1})
+        self.assertEqual(log.get_agent_counts("a"), {'total': 2, 'read': 1, 'write': 1})
+        self.assertEqual(log.get_agent_counts("missing"), {'total': 0})
+
+    def test_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "access.jsonl")
+            log = AccessLog(capacity=2, spill_path=path)
+            for i in range(5):
+                log.append(entry("a", "write", key=f"k{i}"))
+
+            self.assertEqual(log.spilled_entries, 3)
+            self.assertEqual([e['key'] for e in log.iter_spilled()], ["k0", "k1", "k2"])
+
+    def test_spill_file_stays_open(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "access.jsonl")
+            log = AccessLog(capacity=1, spill_path=path)
+            log.append(entry("a", "write", key="k0"))
+            log.append(entry("a", "write", key="k1"))
+            handle = log._spill_file
+            log.append(entry("a", "write", key="k2"))
+            self.assertIs(log._spill_file, handle)
+            self.assertEqual([e['key'] for e in log.iter_spilled()], ["k0", "k1"])
+
+            log.clear()
+            self.assertTrue(handle.closed)
+            log.append(entry("a", "write", key="k3"))
+            log.append(entry("a", "write", key="k4"))
+            log.close()
+            self.assertIsNone(log._spill_file)
+            self.assertEqual([e['key'] for e in log.iter_spilled()], ["k0", "k1", "k3"])
+
+    def test_clear_resets_counters(self):
+        log = AccessLog(capacity=2)
+        log.append(entry("a", "read"))
+        log.clear()
+
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.total_operations, 0)
+
+
+class TestMemoryStatistics(unittest.TestCase):
+    """Memory statistics come from counters, not from the bounded log"""
+
+    def test_stats_exceed_log_capacity(self):
+        memory = SharedMemory(access_log_capacity=10)
+        memory.register_agent("agent_1")
+        for i in range(50):
+            memory.write(f"key_{i}", i, "agent_1")
+            memory.read(f"key_{i}", "agent_1")
+        memory.read("missing", "agent_1")
+
+        stats = memory.get_memory_stats()
+        self.assertEqual(stats['total_operations'], 101)
+        self.assertEqual(stats['operation_breakdown'], {'reads': 51, 'writes': 50, 'deletes': 0})
+        self.assertAlmostEqual(stats['success_rate'], 100 / 101)
+        self.assertEqual(stats['access_log_entries'], 10)
+
+        activity = memory.get_agent_activity("agent_1")
+        self.assertEqual(activity['total_reads'], 51)
+        self.assertEqual(activity['total_operations'], 101)
+
+    def test_rbac_memory_statistics(self):
+        manager = MemoryManager(memory_type="rbac", access_log_capacity=5)
+        manager.register_agent("writer", "Problem Analyst")
+        manager.write("plan", "v1", "writer")
+
+        self.assertEqual(manager.get_memory_stats()['operation_breakdown']['writes'], 1)
+        self.assertEqual(manager.get_agent_activity("writer")['total_writes'], 1)
+        self.assertEqual(manager.get_memory_stats()['memory_type'], 'RBACMemory')
+
+
+if __name__ == '__main__':
+    unittest.main()
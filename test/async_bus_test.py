@@ -0,0 +1,133 @@
+"""
+Test cases for awaitable receive, message subscriptions and event-driven agents
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.agent import Agent
+from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode, create_message
+from src.LLMModule.backends import FakeLLMBackend
+from src.round_runner import run_event_driven
+
+
+class StubAgent:
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+
+    def get_id(self):
+        return self.agent_id
+
+
+def make_manager(mode):
+    manager = CommunicationManager(mode)
+    for agent_id in ("a", "b", "c"):
+        manager.register_agent(StubAgent(agent_id))
+    if mode == CommunicationMode.PUBSUB:
+        manager.subscribe("b", "general")
+    return manager
+
+
+def message(content, sender="a", recipient="b"):
+    return create_message(sender_id=sender, sender_role="Tester", content=content,
+                          recipient_id=recipient, topic="general")
+
+
+class TestAwaitableReceive(unittest.TestCase):
+    """Test cases for areceive / iter_messages in every mode"""
+
+    def test_wakes_on_message_in_every_mode(self):
+        for mode in CommunicationMode:
+            with self.subTest(mode=mode):
+                manager = make_manager(mode)
+
+                async def scenario():
+                    waiter = asyncio.create_task(manager.areceive("b", timeout=5))
+                    await asyncio.sleep(0.01)
+                    self.assertEqual(manager.bus.waiting_agents(), ["b"])
+                    manager.send(message("hello"))
+                    return await waiter
+
+                started = time.perf_counter()
+                received = asyncio.run(scenario())
+                self.assertEqual([m.content for m in received], ["hello"])
+                self.assertLess(time.perf_counter() - started, 1.0)
+                self.assertEqual(manager.bus.waiting_agents(), [])
+
+    def test_timeout_returns_empty(self):
+        manager = make_manager(CommunicationMode.DIRECT)
+        self.assertEqual(asyncio.run(manager.areceive("b", timeout=0.01)), [])
+        self.assertFalse(asyncio.run(manager.wait_for_messages("b", timeout=0)))
+
+    def test_pending_messages_return_immediately(self):
+        manager = make_manager(CommunicationMode.DIRECT)
+        manager.send(message("queued"))
+        self.assertTrue(asyncio.run(manager.wait_for_messages("b", timeout=0)))
+        self.assertEqual([m.content for m in asyncio.run(manager.areceive("b"))], ["queued"])
+
+    def test_unrelated_message_does_not_wake(self):
+        manager = make_manager(CommunicationMode.DIRECT)
+
+        async def scenario():
+            waiter = asyncio.create_task(manager.areceive("b", timeout=0.1))
+            await asyncio.sleep(0.01)
+            manager.send(message("for c", recipient="c"))
+            return await waiter
+
+        self.assertEqual(asyncio.run(scenario()), [])
+        self.assertTrue(manager.has_pending("c"))
+
+    def test_send_from_another_thread(self):
+        manager = make_manager(CommunicationMode.PUBSUB)
+
+        async def scenario():
+            sender = threading.Timer(0.02, lambda: manager.send(message("threaded")))
+            sender.start()
+            received = await manager.areceive("b", timeout=5)
+            sender.join()
+            return received
+
+        self.assertEqual([m.content for m in asyncio.run(scenario())], ["threaded"])
+
+    def test_async_for_subscription(self):
+        manager = make_manager(CommunicationMode.BLACKBOARD)
+
+        async def producer():
+            for i in range(3):
+                await asyncio.sleep(0.005)
+                manager.send(message(f"m{i}"))
+
+        async def scenario():
+            task = asyncio.create_task(producer())
+            contents = [m.content async for m in manager.iter_messages("c", idle_timeout=0.2)]
+            await task
+            return contents
+
+        self.assertEqual(asyncio.run(scenario()), ["m0", "m1", "m2"])
+
+
+class TestEventDrivenRunner(unittest.TestCase):
+    """Test cases for run_event_driven"""
+
+    def test_idle_agents_make_no_llm_calls(self):
+        backend = FakeLLMBackend(responses=["reply"])
+        manager = CommunicationManager(CommunicationMode.DIRECT)
+        agents = [Agent(f"agent_{i}", f"Worker {i}", f"You are worker {i}.", backend=backend) for i in range(3)]
+        for agent in agents:
+            manager.register_agent(agent)
+
+        # agent_0 opens and talks to agent_1, which answers agent_0; agent_2 never hears anything
+        results = run_event_driven(agents, manager, "Plan the sprint", max_turns=2, idle_timeout=0.2,
+                                   initiators=["agent_0"],
+                                   recipients={"agent_0": "agent_1", "agent_1": "agent_0", "agent_2": "agent_0"})
+
+        self.assertEqual(results["agent_0"], ["success", "success"])
+        self.assertEqual(results["agent_1"], ["success", "success"])
+        self.assertEqual(results["agent_2"], [])
+        self.assertEqual(backend.get_stats()["calls"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Test cases for Blackboard read cursors and zero-copy message views
+"""
+
+import unittest
+
+from src.CommunicationModule.blackboard import Blackboard, MessageView
+from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode, create_message
+from src.agent import Agent
+
+
+def post(board, sender, content):
+    board.send(create_message(sender_id=sender, sender_role="Tester", content=content))
+
+
+class TestBlackboardCursors(unittest.TestCase):
+    """Test cases for per-agent cursors"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.board = Blackboard()
+        for i in range(3):
+            post(self.board, "a", f"m{i}")
+
+    def test_receive_returns_only_new_messages(self):
+        self.assertEqual([m.content for m in self.board.receive("x")], ["m0", "m1", "m2"])
+        self.assertEqual(len(self.board.receive("x")), 0)
+
+        post(self.board, "b", "m3")
+        self.assertEqual([m.content for m in self.board.receive("x")], ["m3"])
+        self.assertEqual([m.content for m in self.board.receive("y")], ["m0", "m1", "m2", "m3"])
+        self.assertEqual(self.board.get_cursor("x"), 4)
+
+    def test_read_range_and_seek(self):
+        self.assertEqual([m.content for m in self.board.read_range(1)], ["m1", "m2"])
+        self.assertEqual([m.content for m in self.board.read_range(0, 2)], ["m0", "m1"])
+        self.assertEqual(len(self.board.read_range(5, 9)), 0)
+
+        self.board.receive("x")
+        self.board.seek("x", 1)
+        self.assertEqual([m.content for m in self.board.receive("x")], ["m1", "m2"])
+
+    def test_views_are_stable(self):
+        view = self.board.receive("x")
+        post(self.board, "a", "m3")
+        self.assertEqual(len(view), 3)
+
+        self.board.clear()
+        self.assertEqual([m.content for m in view], ["m0", "m1", "m2"])
+        self.assertEqual(len(self.board.receive("x")), 0)
+
+    def test_view_sequence_behaviour(self):
+        view = self.board.read_range()
+        self.assertIsInstance(view[-2:], MessageView)
+        self.assertEqual([m.content for m in view[-2:]], ["m1", "m2"])
+        self.assertEqual(view[-1].content, "m2")
+        self.assertEqual([m.content for m in view[::2]], ["m0", "m2"])
+        with self.assertRaises(IndexError):
+            view[3]
+
+    def test_register_agent_uses_agent_id(self):
+        manager = CommunicationManager(CommunicationMode.BLACKBOARD)
+        agent = Agent("analyst", "Problem Analyst", "You analyze.")
+
+        self.assertTrue(manager.register_agent(agent))
+        self.assertFalse(manager.register_agent(agent))
+        self.assertIn("analyst", manager.blackboard_impl.agents)
+
+
+if __name__ == '__main__':
+    unittest.main()
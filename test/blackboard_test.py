@@ -4,6 +4,7 @@ from typing import List, Dict
 
 from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode
 from src.agent import Agent
+from src.round_runner import run_rounds
 from input_data.data import load_sample_datasets
 
 
@@ -32,11 +33,7 @@ def run_on_blackboard(problem: str, rounds: int = 3) -> CommunicationManager:
         comm_manager.register_agent(agent)
 
     # Run simulation rounds
-    for round_num in range(rounds):
-        print(f"Round {round_num + 1}/{rounds}")
-        for agent in agents:
-            result = agent.act(comm_manager, problem)
-            print(f"  {agent.role} ({agent.agent_id}): {result}")
+    run_rounds(agents, comm_manager, problem, rounds)
 
     return comm_manager, agents
 
@@ -0,0 +1,119 @@
+"""
+Test cases for lock-striped shared memory and compare-and-swap writes
+"""
+
+import threading
+import unittest
+
+from src.MemoryModule.concurrent_memory import AtomicCounter, ConcurrentSharedMemory
+from src.MemoryModule.memory_manager import MemoryManager
+from src.MemoryModule.shared_memory import SharedMemory
+from test.memory_contention_benchmark import run_contention
+
+
+class TestWriteIfVersion(unittest.TestCase):
+    """Compare-and-swap semantics (same for SharedMemory and ConcurrentSharedMemory)"""
+
+    def check_cas(self, memory):
+        memory.register_agent("a")
+
+        self.assertFalse(memory.write_if_version("k", "x", 1, "a"))
+        self.assertTrue(memory.write_if_version("k", "x", 0, "a"))
+        self.assertFalse(memory.write_if_version("k", "y", 0, "a"))
+        self.assertTrue(memory.write_if_version("k", "y", 1, "a"))
+        self.assertEqual(memory.get_value("k", "a"), "y")
+        self.assertEqual(memory.read("k", "a")['version'], 2)
+        self.assertFalse(memory.write_if_version("k", "z", 2, "unregistered"))
+
+    def test_shared_memory(self):
+        self.check_cas(SharedMemory())
+
+    def test_concurrent_memory(self):
+        memory = ConcurrentSharedMemory(stripes=4)
+        self.check_cas(memory)
+        self.assertEqual(memory.get_memory_stats()['cas_conflicts'], 2)
+
+    def test_failed_cas_is_logged(self):
+        memory = SharedMemory()
+        memory.register_agent("a")
+        memory.write_if_version("k", 1, 5, "a")
+
+        self.assertEqual(memory.get_access_log()[-1]['success'], False)
+        self.assertEqual(memory.version, 0)
+
+
+class TestConcurrentSharedMemory(unittest.TestCase):
+    """Parallel writers on ConcurrentSharedMemory"""
+
+    def test_version_counter_matches_changes(self):
+        memory = ConcurrentSharedMemory()
+        memory.register_agent("a")
+        memory.write("k", 1, "a")
+        memory.write("k", 2, "a")
+        memory.delete_key("k", "a")
+
+        self.assertEqual(memory.version, 3)
+        memory.clear_memory()
+        self.assertEqual(memory.version, 4)
+
+    def test_parallel_cas_increments_lose_nothing(self):
+        result = run_contention(ConcurrentSharedMemory(stripes=8), threads=8, increments=300, keys=2)
+
+        self.assertEqual(result['lost_updates'], 0)
+        self.assertEqual(result['increments'], 2400)
+
+    def test_parallel_writes_keep_exact_counts(self):
+        memory = ConcurrentSharedMemory()
+        for i in range(8):
+            memory.register_agent(f"agent_{i}")
+
+        def worker(agent_id):
+            for j in range(200):
+                memory.write(f"{agent_id}_{j % 10}", j, agent_id)
+
+        threads = [threading.Thread(target=worker, args=(f"agent_{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = memory.get_memory_stats()
+        self.assertEqual(memory.version, 1600)
+        self.assertEqual(stats['operation_breakdown']['writes'], 1600)
+        self.assertEqual(stats['total_keys'], 80)
+        self.assertEqual(memory.read("agent_0_0", "agent_0")['version'], 20)
+
+    def test_atomic_counter(self):
+        counter = AtomicCounter()
+        threads = [threading.Thread(target=lambda: [counter.increment() for _ in range(1000)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.value, 4000)
+
+
+class TestMemoryManagerCAS(unittest.TestCase):
+    """write_if_version through MemoryManager"""
+
+    def test_cas_keeps_search_index_current(self):
+        manager = MemoryManager(memory_type="concurrent")
+        manager.register_agent("a")
+
+        self.assertTrue(manager.write_if_version("plan", "use a cache", 0, "a"))
+        self.assertTrue(manager.write_if_version("plan", "use sharding", 1, "a"))
+        self.assertFalse(manager.write_if_version("plan", "use a queue", 1, "a"))
+
+        self.assertEqual([hit['key'] for hit in manager.search("sharding", agent_id="a")], ["plan"])
+        self.assertEqual(manager.search("cache", agent_id="a"), [])
+
+    def test_rbac_memory_does_not_support_cas(self):
+        manager = MemoryManager(memory_type="rbac")
+        manager.register_agent("a", "Admin")
+
+        self.assertFalse(manager.write_if_version("k", "v", 0, "a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test cases for token-budgeted context assembly
+"""
+
+import unittest
+
+from src.LLMModule.context_builder import ContextBuilder, ContextSection, estimate_tokens
+
+
+class TestContextBuilder(unittest.TestCase):
+    """Test cases for ContextBuilder"""
+
+    def test_estimate_tokens(self):
+        """The estimator grows with text and is zero for empty text"""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertGreater(estimate_tokens("hello world, this is a test"), 5)
+        self.assertGreater(estimate_tokens("x" * 400), 90)
+
+    def test_budget_comes_from_model_window(self):
+        builder = ContextBuilder("qwen/qwen3-235b-a22b", max_context_tokens=None, reserve_output_tokens=768)
+        self.assertEqual(builder.budget, 32768 - 768)
+
+        capped = ContextBuilder("qwen/qwen3-235b-a22b", max_context_tokens=1000)
+        self.assertEqual(capped.budget, 1000)
+
+    def test_everything_fits(self):
+        builder = ContextBuilder("test-model", max_context_tokens=1000)
+        built = builder.build([
+            ContextSection("problem", ["Problem: add two numbers"], priority=0, required=True),
+            ContextSection("messages", ["first", "second"], priority=1, header="=== MESSAGES ===")
+        ])
+
+        self.assertEqual(built.text, "Problem: add two numbers\n=== MESSAGES ===\nfirst\nsecond")
+        self.assertEqual(built.dropped_items, [])
+
+    def test_whole_items_dropped_oldest_first(self):
+        """Messages are never cut in half; the oldest ones are dropped and recorded"""
+        builder = ContextBuilder("test-model", max_context_tokens=40)
+        messages = [f"message number {i} " + "word " * 5 for i in range(6)]
+        built = builder.build([
+            ContextSection("problem", ["Problem: p"], priority=0, required=True),
+            ContextSection("messages", messages, priority=1)
+        ])
+
+        self.assertIn(messages[-1], built.text)
+        self.assertNotIn(messages[0], built.text)
+        self.assertLessEqual(built.token_count, 40)
+        dropped_indexes = [item['index'] for item in built.dropped_items]
+        self.assertIn(0, dropped_indexes)
+        for message in messages:
+            # Kept messages appear whole
+            if message[:16] in built.text:
+                self.assertIn(message, built.text)
+
+    def test_lower_priority_sections_dropped_first(self):
+        builder = ContextBuilder("test-model", max_context_tokens=20)
+        built = builder.build([
+            ContextSection("problem", ["Problem: p"], priority=0, required=True),
+            ContextSection("messages", ["short message"], priority=1),
+            ContextSection("events", ["event " * 30], priority=3)
+        ])
+
+        self.assertIn("short message", built.text)
+        self.assertNotIn("event", built.text)
+        self.assertEqual(built.dropped_items[0]['section'], "events")
+
+    def test_required_section_truncated(self):
+        """An oversized problem is truncated rather than dropped"""
+        builder = ContextBuilder("test-model", max_context_tokens=10)
+        built = builder.build([ContextSection("problem", ["word " * 100], priority=0, required=True)])
+
+        self.assertTrue(built.text.startswith("word"))
+        self.assertLessEqual(estimate_tokens(built.text), 10)
+
+    def test_precomputed_token_counts_are_used(self):
+        builder = ContextBuilder("test-model", max_context_tokens=10, reserve_output_tokens=0)
+        section = ContextSection("messages", ["old", "new"], priority=0, token_counts=[8, 8])
+        built = builder.build([section])
+
+        self.assertEqual(built.text, "new")
+        self.assertEqual(built.dropped_items[0]['tokens'], 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from typing import List, Dict
 
 from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode
 from src.agent import Agent
+from src.round_runner import run_rounds
 from input_data.data import load_sample_datasets
 
 
@@ -31,29 +32,25 @@ def run_on_direct_messenger(problem: str, rounds: int = 3) -> tuple:
     for agent in agents:
         comm_manager.register_agent(agent)
     
+    # In DirectMessenger, agents need to specify recipients
+    # Round-robin or coordinator-based messaging pattern:
+    # coordinator sends to all, other agents send to the next agent
+    recipients = {}
+    for i, agent in enumerate(agents):
+        if agent.agent_id == "coordinator":
+            recipients[agent.agent_id] = "all"
+        else:
+            recipients[agent.agent_id] = agents[(i + 1) % len(agents)].agent_id
+    
+    def send_status_update(agent, result):
+        # Also send to coordinator for coordination, right after the agent's turn
+        if agent.agent_id != "coordinator" and recipients[agent.agent_id] != "coordinator":
+            agent.send_direct_message(comm_manager, "coordinator", 
+                                    f"Update: {agent.role} completed analysis", 
+                                    topic="status_update")
+    
     # Run simulation rounds with direct messaging pattern
-    for round_num in range(rounds):
-        print(f"Round {round_num + 1}/{rounds}")
-        
-        # In DirectMessenger, agents need to specify recipients
-        # Round-robin or coordinator-based messaging pattern
-        for i, agent in enumerate(agents):
-            if agent.agent_id == "coordinator":
-                # Coordinator sends to all
-                result = agent.act(comm_manager, problem, recipient_id="all")
-            else:
-                # Other agents send to coordinator and next agent
-                next_agent_idx = (i + 1) % len(agents)
-                recipient = agents[next_agent_idx].agent_id
-                result = agent.act(comm_manager, problem, recipient_id=recipient)
-                
-                # Also send to coordinator for coordination
-                if recipient != "coordinator":
-                    agent.send_direct_message(comm_manager, "coordinator", 
-                                            f"Update: {agent.role} completed analysis", 
-                                            topic="status_update")
-            
-            print(f"  {agent.role} ({agent.agent_id}): {result}")
+    run_rounds(agents, comm_manager, problem, rounds, recipients, after_turn=send_status_update)
     
     return comm_manager, agents
 
@@ -0,0 +1,137 @@
+"""
+Test cases for hedged LLM requests
+"""
+
+import asyncio
+import time
+import unittest
+
+from src.agent import Agent
+from src.LLMModule.backends import FakeLLMBackend
+from src.LLMModule.hedging import HedgingPolicy
+from src.LLMModule.rate_limiter import LLMGovernor
+
+
+class SlowFirstBackend(FakeLLMBackend):
+    """Fake backend whose first async completion is stuck in the tail"""
+
+    started_calls = 0
+
+    async def acomplete(self, messages, model=None, temperature=0):
+        self.started_calls += 1
+        if self.started_calls == 1:
+            await asyncio.sleep(1.0)
+        return await super().acomplete(messages, model, temperature)
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    """Test cases for HedgingPolicy"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.policy = HedgingPolicy(latency_percentile=90, min_samples=5, min_delay=0.01)
+        self.history = [0.05] * 10
+
+    def test_no_hedging_without_history(self):
+        async def request():
+            return "ok"
+
+        self.assertIsNone(self.policy.hedge_delay([0.05] * 4))
+        self.assertEqual(asyncio.run(self.policy.acall(request, [])), ("ok", False))
+        self.assertEqual(self.policy.get_stats()['hedged_calls'], 0)
+
+    def test_hedge_delay_bounds(self):
+        self.assertEqual(self.policy.hedge_delay([0.001] * 10), 0.01)
+        bounded = HedgingPolicy(min_samples=1, max_delay=0.5)
+        self.assertEqual(bounded.hedge_delay([2.0, 3.0]), 0.5)
+
+    def test_fast_call_is_not_hedged(self):
+        async def request():
+            return "fast"
+
+        self.assertEqual(asyncio.run(self.policy.acall(request, self.history)), ("fast", False))
+        self.assertEqual(self.policy.get_stats()['hedged_calls'], 0)
+
+    def test_blocking_call_is_hedged(self):
+        """Blocking callers are hedged on the background loop, where the loser is cancelled"""
+        cancelled = []
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            attempt = len(attempts)
+            try:
+                await asyncio.sleep(1.0 if attempt == 1 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+            return attempt
+
+        self.assertEqual(self.policy.call(request, self.history), (2, True))
+        self.assertEqual(cancelled, [1])
+
+    def test_blocking_agent_call_is_hedged(self):
+        backend = SlowFirstBackend(responses=["ok"])
+        policy = HedgingPolicy(min_samples=1, min_delay=0.01, max_delay=0.05)
+        agent = Agent("a1", "Analyst", "You analyze.", hedging_policy=policy, backend=backend)
+        agent.response_cache = None
+        agent.governor = LLMGovernor()
+        agent.generation_metrics.record(0.01, 1)
+
+        started = time.perf_counter()
+        self.assertEqual(agent.generate_response("hedge the sprint plan", []), "ok")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(policy.get_stats()['hedge_wins'], 1)
+        self.assertEqual(agent.governor.get_metrics()['in_flight'], 0)
+
+    def test_async_loser_is_cancelled(self):
+        cancelled = []
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            attempt = len(attempts)
+            try:
+                await asyncio.sleep(1.0 if attempt == 1 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+            return attempt
+
+        result = asyncio.run(self.policy.acall(request, self.history))
+
+        self.assertEqual(result, (2, True))
+        self.assertEqual(cancelled, [1])
+
+    def test_hedge_used_when_primary_fails(self):
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            attempt = len(attempts)
+            await asyncio.sleep(0.1 if attempt == 1 else 0.2)
+            if attempt == 1:
+                raise RuntimeError("primary failed")
+            return "from hedge"
+
+        self.assertEqual(asyncio.run(self.policy.acall(request, self.history)), ("from hedge", True))
+
+    def test_cancelled_governed_call_releases_slot(self):
+        governor = LLMGovernor(max_in_flight=2)
+
+        async def slow():
+            await asyncio.sleep(1.0)
+
+        async def run():
+            task = asyncio.ensure_future(governor.acall(slow))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        self.assertEqual(governor.get_metrics()['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
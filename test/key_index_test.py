@@ -0,0 +1,107 @@
+"""
+Test cases for the sorted key index and prefix scans
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.MemoryModule.key_index import SortedKeyIndex, prefix_successor
+from src.MemoryModule.memory_manager import MemoryManager
+
+
+class TestSortedKeyIndex(unittest.TestCase):
+    """Test cases for SortedKeyIndex"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.index = SortedKeyIndex(["analyst_100", "analyst_200", "analyst_300", "coder_150", "analystic"])
+
+    def test_add_remove_keep_order(self):
+        self.index.add("analyst_250")
+        self.index.add("analyst_250")
+        self.index.remove("coder_150")
+        self.index.remove("missing")
+
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.index.scan(), ["analyst_100", "analyst_200", "analyst_250", "analyst_300", "analystic"])
+        self.assertIn("analyst_250", self.index)
+
+    def test_prefix_scan(self):
+        self.assertEqual(self.index.scan("analyst_"), ["analyst_100", "analyst_200", "analyst_300"])
+        self.assertEqual(self.index.scan("analyst_", limit=2, reverse=True), ["analyst_300", "analyst_200"])
+        self.assertEqual(self.index.scan("zzz"), [])
+
+    def test_range_bounds_apply_after_prefix(self):
+        self.assertEqual(self.index.scan("analyst_", start="150", end="300"), ["analyst_200"])
+        self.assertEqual(self.index.scan("analyst_", start="200"), ["analyst_200", "analyst_300"])
+        self.assertEqual(self.index.scan("analyst_", end="200", reverse=True), ["analyst_100"])
+
+    def test_accept_filter_and_limit(self):
+        keys = self.index.scan("analyst_", limit=1, accept=lambda key: key != "analyst_100")
+        self.assertEqual(keys, ["analyst_200"])
+        self.assertEqual(self.index.scan(limit=0), [])
+
+    def test_prefix_successor(self):
+        self.assertEqual(prefix_successor("ab"), "ac")
+        self.assertIsNone(prefix_successor(""))
+
+
+class TestMemoryPrefixScans(unittest.TestCase):
+    """Prefix scans through MemoryManager"""
+
+    def test_shared_memory_latest_entries(self):
+        manager = MemoryManager()
+        manager.register_agent("a")
+        for timestamp in (1700000300, 1700000100, 1700000200):
+            manager.write(f"problem_analyst_{timestamp}", "insight", "a")
+            manager.write(f"team_messages_{timestamp}", "summary", "a")
+        manager.delete_key("problem_analyst_1700000300", "a")
+
+        self.assertEqual(manager.scan_prefix("problem_analyst_", limit=1, reverse=True, agent_id="a"),
+                         ["problem_analyst_1700000200"])
+        self.assertEqual(manager.scan_prefix("team_messages_", start="1700000200", agent_id="a"),
+                         ["team_messages_1700000200", "team_messages_1700000300"])
+        self.assertEqual(manager.scan_prefix("team_messages_", agent_id="stranger"), [])
+
+        manager.clear_memory()
+        self.assertEqual(manager.scan_prefix(agent_id="a"), [])
+
+    def test_rbac_scan_hides_protected_keys(self):
+        manager = MemoryManager(memory_type="rbac")
+        manager.register_agent("admin", "Admin")
+        manager.register_agent("analyst", "Problem Analyst")
+        manager.register_agent("nobody", "No Such Role")
+        for key in ("insight_1", "insight_2", "insight_3"):
+            manager.write(key, "value", "admin")
+        manager.protect_key("insight_3", "admin")
+
+        self.assertEqual(manager.scan_prefix("insight_", reverse=True, limit=1, agent_id="analyst"), ["insight_2"])
+        self.assertEqual(manager.scan_prefix("insight_", reverse=True, limit=1, agent_id="admin"), ["insight_3"])
+        self.assertEqual(manager.scan_prefix("insight_", agent_id="nobody"), [])
+
+    def test_budget_eviction_updates_index(self):
+        manager = MemoryManager(max_memory_entries=2)
+        manager.register_agent("a")
+        for i in range(4):
+            manager.write(f"k{i}", i, "a")
+
+        self.assertEqual(manager.scan_prefix("k", agent_id="a"), ["k2", "k3"])
+
+    def test_persistent_memory_indexes_existing_keys(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memory.db")
+            manager = MemoryManager(memory_type="persistent", memory_path=path)
+            manager.register_agent("a")
+            manager.write("note_b", 1, "a")
+            manager.write("note_a", 2, "a")
+            manager.memory_impl.close()
+
+            reopened = MemoryManager(memory_type="persistent", memory_path=path)
+            reopened.register_agent("a")
+            self.assertEqual(reopened.scan_prefix("note_", agent_id="a"), ["note_a", "note_b"])
+            reopened.memory_impl.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Test cases for relevance-ranked memory retrieval
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.agent import Agent
+from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode, create_message
+from src.LLMModule.backends import FakeLLMBackend
+from src.MemoryModule.lexical_index import BM25Index, memory_text, tokenize
+from src.MemoryModule.memory_manager import MemoryManager
+
+
+class TestBM25Index(unittest.TestCase):
+    """Test cases for BM25Index"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.index = BM25Index()
+        self.index.add("db", "Use a database index to speed up slow queries")
+        self.index.add("cache", "Put a cache in front of the database for hot reads")
+        self.index.add("ui", "The login page needs a clearer button layout")
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("The Cache, and the DB!"), ["cache", "db"])
+
+    def test_ranking(self):
+        results = self.index.search("slow database queries", k=3)
+
+        self.assertEqual([key for key, _ in results], ["db", "cache"])
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_top_k_and_no_match(self):
+        self.assertEqual(len(self.index.search("database", k=1)), 1)
+        self.assertEqual(self.index.search("kubernetes"), [])
+
+    def test_reindex_and_remove(self):
+        self.index.add("ui", "Database migration plan")
+        self.assertIn("ui", [key for key, _ in self.index.search("migration")])
+
+        self.assertTrue(self.index.remove("ui"))
+        self.assertEqual(self.index.search("migration"), [])
+        self.assertEqual(len(self.index), 2)
+        self.assertFalse(self.index.remove("ui"))
+
+    def test_reindexing_compacts_tombstones(self):
+        for i in range(100):
+            self.index.add("db", f"Use a database index, revision {i}")
+
+        self.assertLessEqual(len(self.index._keys), 2 * len(self.index))
+        self.assertEqual(len(self.index.scores("database")), len(self.index._keys))
+        self.assertEqual([key for key, _ in self.index.search("database revision 99")], ["db", "cache"])
+        # Equal scores still go to the most recently indexed document
+        self.index.add("cache2", "Put a cache in front of the database for hot reads")
+        self.assertEqual([key for key, _ in self.index.search("hot reads", k=2)], ["cache2", "cache"])
+
+    def test_accept_filter(self):
+        results = self.index.search("database", k=2, accept=lambda key: key != "db")
+        self.assertEqual([key for key, _ in results], ["cache"])
+
+    def test_memory_text_flattens_values(self):
+        text = memory_text("analyst_insight", {"insight": "shard the table", "tags": ["scaling"], "n": 3})
+        self.assertEqual(tokenize(text), ["analyst", "insight", "shard", "table", "scaling", "3"])
+
+
+class TestMemoryManagerSearch(unittest.TestCase):
+    """Test cases for MemoryManager.search"""
+
+    def test_search_tracks_writes_and_deletes(self):
+        manager = MemoryManager()
+        manager.register_agent("a1")
+        manager.write("k1", {"insight": "rate limit the payment API"}, "a1")
+        manager.write("k2", {"insight": "improve onboarding emails"}, "a1")
+
+        hits = manager.search("payment rate limit", 5, "a1")
+        self.assertEqual([hit['key'] for hit in hits], ["k1"])
+        self.assertEqual(hits[0]['value'], {"insight": "rate limit the payment API"})
+
+        manager.delete_key("k1", "a1")
+        self.assertEqual(manager.search("payment", 5, "a1"), [])
+        self.assertEqual(manager.search("onboarding", 5, "stranger"), [])
+
+    def test_search_respects_rbac_visibility(self):
+        manager = MemoryManager(memory_type="rbac")
+        manager.register_agent("admin", "Admin")
+        manager.register_agent("analyst", "Problem Analyst")
+        manager.write("secret_plan", "merger plan details", "admin")
+        manager.write("public_plan", "public plan details", "admin")
+        manager.protect_key("secret_plan", "admin")
+
+        self.assertEqual([hit['key'] for hit in manager.search("plan", 5, "analyst")], ["public_plan"])
+        self.assertEqual(len(manager.search("plan", 5, "admin")), 2)
+
+    def test_persistent_entries_indexed_on_open(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memory.db")
+            first = MemoryManager(memory_type="persistent", memory_path=path)
+            first.register_agent("a1")
+            first.write("k1", "vector clocks resolve conflicts", "a1")
+            first.memory_impl.close()
+
+            second = MemoryManager(memory_type="persistent", memory_path=path)
+            second.register_agent("a1")
+            self.assertEqual([hit['key'] for hit in second.search("conflicts", 5, "a1")], ["k1"])
+            second.memory_impl.close()
+
+
+class TestAgentRelevantMemory(unittest.TestCase):
+    """The agent's memory context holds the entries relevant to the problem"""
+
+    def test_relevant_entries_beat_recent_ones(self):
+        manager = MemoryManager()
+        agent = Agent("a1", "Analyst", "You analyze.", manager, backend=FakeLLMBackend())
+        manager.write("old_insight", "Shard the orders table by customer id", "a1")
+        for i in range(10):
+            manager.write(f"recent_{i}", f"Unrelated note number {i} about team lunch", "a1")
+
+        context = agent._get_memory_context("How should we shard the orders table?")
+        self.assertIn("old_insight", context)
+
+    def test_agent_entries_follow_the_conversation(self):
+        problem = "Design a caching layer for a read-heavy web service."
+        manager = MemoryManager()
+        agent = Agent("a1", "Analyst", "You analyze.", manager, backend=FakeLLMBackend())
+        # Entries shaped like the ones agents store every turn, all carrying the same problem_context
+        for i in range(20):
+            manager.write(f"analyst_{1000 + i}", {"role": "Analyst", "agent_id": "a1", "problem_context": problem,
+                                                  "insight": f"Round {i}: put a read-through cache in front",
+                                                  "timestamp": 1000 + i}, "a1")
+        manager.write("team_messages_1020", {"problem_context": problem, "message_count": 1,
+                                             "last_messages": [{"sender": "a2", "content": "eviction policy?"}],
+                                             "stored_by": "a1", "stored_at": 1020}, "a1")
+
+        # The problem alone no longer matches every entry
+        self.assertEqual(manager.search("web service", 5, "a1"), [])
+        # Equally relevant entries come back newest first
+        hits = manager.search("read-through cache", 5, "a1")
+        self.assertEqual([hit['key'] for hit in hits], [f"analyst_{1019 - i}" for i in range(5)])
+
+        messages = [create_message(sender_id="a2", sender_role="Architect", content="Which eviction policy?")]
+        agent._get_enhanced_context(messages, problem)
+        lines = agent._memory_snapshot.shared_memory_lines
+        self.assertTrue(lines[0].startswith("team_messages_1020"))
+
+    def test_memory_context_built_once_per_turn(self):
+        manager = MemoryManager()
+        agent = Agent("a1", "Analyst", "You analyze.", manager, backend=FakeLLMBackend())
+        comm_manager = CommunicationManager(CommunicationMode.BLACKBOARD)
+        comm_manager.register_agent(agent)
+        problem = "Design a caching layer for a read-heavy web service."
+
+        for turn in range(3):
+            comm_manager.send(create_message(sender_id="a2", sender_role="Architect",
+                                             content=f"Which eviction policy for tier {turn}?"))
+            self.assertEqual(agent.act(comm_manager, problem), "success")
+
+        self.assertEqual(agent.memory_context_stats, {"builds": 3, "reuses": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Test cases for the pluggable LLM backends and the local fake backend
+"""
+
+import asyncio
+import unittest
+
+from langchain_core.messages import HumanMessage
+
+from src.agent import Agent
+from src.LLMModule.backends import FakeBackendError, FakeLLMBackend, OpenAIBackend, get_llm_backend, set_llm_backend
+from src.MemoryModule.memory_manager import MemoryManager
+
+
+MESSAGES = [{"role": "system", "content": "You are helpful."},
+            {"role": "user", "content": "Problem: plan the sprint"}]
+
+
+class TestFakeLLMBackend(unittest.TestCase):
+    """Test cases for FakeLLMBackend"""
+
+    def test_scripted_responses_cycle(self):
+        backend = FakeLLMBackend(responses=["first", "second"])
+        contents = [backend.complete(MESSAGES).choices[0].message.content for _ in range(3)]
+
+        self.assertEqual(contents, ["first", "second", "first"])
+
+    def test_callable_script_and_template(self):
+        backend = FakeLLMBackend(responses=lambda messages: messages[-1]["content"].upper())
+        self.assertEqual(backend.complete(MESSAGES).choices[0].message.content, "PROBLEM: PLAN THE SPRINT")
+
+        templated = FakeLLMBackend(template="#{n} {prompt}")
+        self.assertEqual(templated.complete(MESSAGES).choices[0].message.content, "#1 Problem: plan the sprint")
+
+    def test_seeded_runs_are_deterministic(self):
+        def run():
+            backend = FakeLLMBackend(responses=["ok"], latency_jitter=0.01, output_tokens=(10, 100), seed=7)
+            return [backend.complete(MESSAGES).usage.completion_tokens for _ in range(5)]
+
+        first = run()
+        self.assertEqual(first, run())
+        self.assertTrue(all(10 <= tokens <= 100 for tokens in first))
+
+    def test_usage_reported(self):
+        backend = FakeLLMBackend(responses=["short answer"])
+        usage = backend.complete(MESSAGES).usage
+
+        self.assertGreater(usage.prompt_tokens, 0)
+        self.assertEqual(usage.total_tokens, usage.prompt_tokens + usage.completion_tokens)
+        self.assertEqual(backend.get_stats()['completion_tokens'], usage.completion_tokens)
+
+    def test_stream_matches_completion(self):
+        backend = FakeLLMBackend(responses=["one two three four five six seven"], chunk_tokens=3)
+        chunks = list(backend.stream(MESSAGES))
+
+        text = "".join(chunk.choices[0].delta.content for chunk in chunks if chunk.choices)
+        self.assertEqual(text, "one two three four five six seven")
+        self.assertEqual(len(chunks), 4)
+        self.assertIsNotNone(chunks[-1].usage)
+
+    def test_async_completion_and_stream(self):
+        backend = FakeLLMBackend(responses=["async answer"], latency=0.01)
+
+        async def run():
+            completion = await backend.acomplete(MESSAGES)
+            chunks = [chunk async for chunk in backend.astream(MESSAGES)]
+            return completion, chunks
+
+        completion, chunks = asyncio.run(run())
+        self.assertEqual(completion.choices[0].message.content, "async answer")
+        self.assertEqual(backend.get_stats()['streamed_calls'], 1)
+        self.assertAlmostEqual(backend.get_stats()['simulated_latency_total'], 0.02)
+
+    def test_error_injection(self):
+        backend = FakeLLMBackend(error_rate=1.0)
+        with self.assertRaises(FakeBackendError):
+            backend.complete(MESSAGES)
+        self.assertEqual(backend.get_stats()['errors'], 1)
+
+    def test_chat_model_for_langgraph_agents(self):
+        backend = FakeLLMBackend(responses=["tool free answer"])
+        model = backend.chat_model().bind_tools([])
+        message = model.invoke([HumanMessage(content="list the files")])
+
+        self.assertEqual(message.content, "tool free answer")
+        self.assertEqual(message.tool_calls, [])
+        self.assertGreater(message.usage_metadata["total_tokens"], 0)
+
+
+class TestAgentWithBackend(unittest.TestCase):
+    """Agents run end to end against the fake backend"""
+
+    def test_agent_uses_given_backend(self):
+        backend = FakeLLMBackend(responses=["We should split the work."])
+        agent = Agent("planner", "Planner", "You plan.", MemoryManager(), backend=backend)
+
+        response = agent.generate_response("Plan the release", [])
+
+        self.assertIn("We should split the work.", response)
+        self.assertEqual(agent.model, "fake-llm")
+        self.assertEqual(agent.token_usage["api_calls"], 1)
+        self.assertGreater(agent.token_usage["total_tokens"], 0)
+
+    def test_default_backend_can_be_replaced(self):
+        backend = FakeLLMBackend()
+        set_llm_backend(backend)
+        try:
+            agent = Agent("worker", "Worker", "You work.", MemoryManager())
+            self.assertIs(agent.backend, backend)
+        finally:
+            set_llm_backend(None)
+        self.assertIsInstance(get_llm_backend(), OpenAIBackend)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Test cases for the process-wide pooled LLM client registry
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.clients import LLMClientRegistry
+
+
+class TestLLMClientRegistry(unittest.TestCase):
+    """Test cases for LLMClientRegistry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.registry = LLMClientRegistry(max_connections=8, max_keepalive_connections=4)
+
+    def tearDown(self):
+        self.registry.close()
+
+    def test_same_endpoint_shares_client(self):
+        """Agents on the same endpoint and key get the same client"""
+        client1 = self.registry.get_client("http://localhost:1/v1", "key-a")
+        client2 = self.registry.get_client("http://localhost:1/v1", "key-a")
+
+        self.assertIs(client1, client2)
+        self.assertEqual(self.registry.clients_created, 1)
+
+    def test_different_keys_get_different_clients(self):
+        """Different API keys never share a client"""
+        client1 = self.registry.get_client("http://localhost:1/v1", "key-a")
+        client2 = self.registry.get_client("http://localhost:1/v1", "key-b")
+
+        self.assertIsNot(client1, client2)
+        self.assertEqual(self.registry.clients_created, 2)
+
+    def test_async_client_shared_within_event_loop(self):
+        """Async clients are shared inside one event loop and replaced in a new one"""
+        async def get_pair():
+            return (self.registry.get_async_client("http://localhost:1/v1", "key-a"),
+                    self.registry.get_async_client("http://localhost:1/v1", "key-a"))
+
+        first, second = asyncio.run(get_pair())
+        self.assertIs(first, second)
+
+        third, _ = asyncio.run(get_pair())
+        self.assertIsNot(first, third)
+
+    def test_async_clients_closed_with_their_loop(self):
+        """A client does not outlive the asyncio.run loop it was created in"""
+        async def get_client():
+            return self.registry.get_async_client("http://localhost:1/v1", "key-a")
+
+        first = asyncio.run(get_client())
+        self.assertTrue(first.is_closed())
+
+        second = asyncio.run(get_client())
+        self.assertIsNot(first, second)
+        self.assertTrue(second.is_closed())
+
+    def test_replaced_async_client_closed(self):
+        """A client of a loop still running elsewhere is closed there when another loop replaces it"""
+        old_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=old_loop.run_forever)
+        thread.start()
+        try:
+            async def get_client():
+                return self.registry.get_async_client("http://localhost:1/v1", "key-a")
+
+            first = asyncio.run_coroutine_threadsafe(get_client(), old_loop).result(timeout=5)
+            asyncio.run(get_client())
+            deadline = time.monotonic() + 5
+            while not first.is_closed() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(first.is_closed())
+        finally:
+            old_loop.call_soon_threadsafe(old_loop.stop)
+            thread.join()
+            old_loop.close()
+
+    def test_close_covers_sync_and_async_clients(self):
+        sync_client = self.registry.get_client("http://localhost:1/v1", "key-a")
+        async_client = self.registry.get_async_client("http://localhost:1/v1", "key-a")
+
+        self.registry.close()
+        self.assertTrue(sync_client.is_closed())
+        self.assertTrue(async_client.is_closed())
+        self.assertEqual(self.registry.get_pool_stats()['active_clients'], 0)
+
+    def test_pool_stats(self):
+        """Pool stats report limits and handouts per pool"""
+        for _ in range(3):
+            self.registry.get_client("http://localhost:1/v1", "key-a")
+
+        stats = self.registry.get_pool_stats()
+        self.assertEqual(stats['max_connections'], 8)
+        self.assertEqual(stats['max_keepalive_connections'], 4)
+        self.assertEqual(stats['total_handouts'], 3)
+        self.assertEqual(stats['active_clients'], 1)
+        self.assertEqual(stats['pools'][0]['handouts'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+"""
+Test cases for the shared LLM rate limiter and concurrency governor
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from src.agent import Agent
+from src.LLMModule.backends import FakeLLMBackend
+from src.LLMModule.rate_limiter import LLMGovernor, get_retry_after, is_retryable_error
+
+
+class FakeRateLimitError(Exception):
+    """Mimics an SDK error carrying an HTTP response"""
+
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        self.status_code = 429
+        headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+class TestLLMGovernor(unittest.TestCase):
+    """Test cases for LLMGovernor"""
+
+    def test_unlimited_governor_does_not_wait(self):
+        governor = LLMGovernor()
+        for _ in range(20):
+            self.assertEqual(governor.call(lambda: "ok"), "ok")
+
+        metrics = governor.get_metrics()
+        self.assertEqual(metrics['calls'], 20)
+        self.assertEqual(metrics['throttled_calls'], 0)
+        self.assertEqual(metrics['in_flight'], 0)
+
+    def test_request_quota_throttles(self):
+        """With 600 requests/minute the bucket refills one request every 0.1s"""
+        governor = LLMGovernor(requests_per_minute=600)
+        governor.request_bucket.available = 1
+
+        started = time.monotonic()
+        governor.call(lambda: "first")
+        governor.call(lambda: "second")
+        elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.08)
+        metrics = governor.get_metrics()
+        self.assertEqual(metrics['throttled_calls'], 1)
+        self.assertGreater(metrics['wait_time_total'], 0.05)
+
+    def test_token_quota_reconciled_with_actual_usage(self):
+        governor = LLMGovernor(tokens_per_minute=1000)
+        governor.call(lambda: 300, estimated_tokens=100, usage_of=lambda result: result)
+
+        self.assertAlmostEqual(governor.token_bucket.available, 700, delta=5)
+
+    def test_in_flight_bound(self):
+        governor = LLMGovernor(max_in_flight=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_call():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return True
+
+        threads = [threading.Thread(target=governor.call, args=(slow_call,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(governor.get_metrics()['max_in_flight_seen'], 2)
+
+    def test_retry_after_respected(self):
+        governor = LLMGovernor(max_retries=2)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise FakeRateLimitError(retry_after=0.05)
+            return "done"
+
+        self.assertEqual(governor.call(flaky), "done")
+        metrics = governor.get_metrics()
+        self.assertEqual(metrics['retries'], 1)
+        self.assertAlmostEqual(metrics['backoff_time_total'], 0.05)
+
+    def test_non_retryable_error_raised(self):
+        governor = LLMGovernor()
+
+        def broken():
+            raise ValueError("bad request")
+
+        with self.assertRaises(ValueError):
+            governor.call(broken)
+        self.assertEqual(governor.get_metrics()['failed_calls'], 1)
+        self.assertEqual(governor.get_metrics()['in_flight'], 0)
+
+    def test_retries_exhausted(self):
+        governor = LLMGovernor(max_retries=1, base_backoff=0.01)
+
+        def always_limited():
+            raise FakeRateLimitError()
+
+        with self.assertRaises(FakeRateLimitError):
+            governor.call(always_limited)
+        self.assertEqual(governor.get_metrics()['retries'], 1)
+
+    def test_async_call(self):
+        governor = LLMGovernor(max_in_flight=1)
+
+        async def request():
+            await asyncio.sleep(0.01)
+            return "async ok"
+
+        async def run_many():
+            return await asyncio.gather(*(governor.acall(request) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(run_many()), ["async ok"] * 3)
+        self.assertEqual(governor.get_metrics()['max_in_flight_seen'], 1)
+
+    def test_waiters_wake_on_release(self):
+        """Queued calls start as soon as a slot frees up, not on a polling tick"""
+        governor = LLMGovernor(max_in_flight=1)
+
+        async def request():
+            await asyncio.sleep(0.002)
+            return True
+
+        async def run_many():
+            return await asyncio.gather(*(governor.acall(request) for _ in range(20)))
+
+        started = time.monotonic()
+        asyncio.run(run_many())
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(governor.get_metrics()['in_flight'], 0)
+
+    def test_configure_keeps_unspecified_settings(self):
+        governor = LLMGovernor(tokens_per_minute=1000, max_in_flight=3, max_retries=7)
+        governor.configure(requests_per_minute=60)
+
+        self.assertEqual(governor.request_bucket.per_minute, 60)
+        self.assertEqual(governor.token_bucket.per_minute, 1000)
+        self.assertEqual(governor.max_in_flight, 3)
+        self.assertEqual(governor.max_retries, 7)
+
+        governor.configure(tokens_per_minute=0)
+        self.assertEqual(governor.token_bucket.wait_time(10 ** 6, time.monotonic()), 0.0)
+
+    def test_error_helpers(self):
+        self.assertTrue(is_retryable_error(FakeRateLimitError()))
+        self.assertFalse(is_retryable_error(ValueError()))
+        self.assertEqual(get_retry_after(FakeRateLimitError(retry_after=3)), 3.0)
+        self.assertIsNone(get_retry_after(ValueError()))
+
+
+
+class RateLimitedOpenBackend(FakeLLMBackend):
+    """Fake backend whose first stream open is rejected with a 429"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stream_opens = 0
+
+    def stream(self, messages, model=None, temperature=0):
+        self.stream_opens += 1
+        if self.stream_opens == 1:
+            raise FakeRateLimitError(retry_after=0.01)
+        return super().stream(messages, model, temperature)
+
+    async def astream(self, messages, model=None, temperature=0):
+        self.stream_opens += 1
+        if self.stream_opens == 1:
+            raise FakeRateLimitError(retry_after=0.01)
+        async for chunk in super().astream(messages, model, temperature):
+            yield chunk
+
+
+class TestGovernedStreams(unittest.TestCase):
+    """Opening a stream goes through the governor's retry policy"""
+
+    def make_agent(self):
+        backend = RateLimitedOpenBackend(responses=["streamed answer"])
+        agent = Agent("a1", "Analyst", "You analyze.", backend=backend)
+        agent.response_cache = None
+        agent.governor = LLMGovernor(max_retries=2)
+        return agent, backend
+
+    def test_rate_limited_stream_open_is_retried(self):
+        agent, backend = self.make_agent()
+        self.assertEqual("".join(agent.generate_response_stream("Problem", [])), "streamed answer")
+        self.assertEqual(backend.stream_opens, 2)
+        self.assertEqual(agent.governor.get_metrics()['retries'], 1)
+        self.assertEqual(agent.governor.get_metrics()['in_flight'], 0)
+
+    def test_rate_limited_async_stream_open_is_retried(self):
+        agent, backend = self.make_agent()
+
+        async def consume():
+            return "".join([chunk async for chunk in agent.agenerate_response_stream("Problem", [])])
+
+        self.assertEqual(asyncio.run(consume()), "streamed answer")
+        self.assertEqual(backend.stream_opens, 2)
+        self.assertEqual(agent.governor.get_metrics()['retries'], 1)
+        self.assertEqual(agent.governor.get_metrics()['in_flight'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
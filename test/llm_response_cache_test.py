@@ -0,0 +1,95 @@
+"""
+Test cases for the content-addressed LLM response cache
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.LLMModule.response_cache import LLMResponseCache
+
+
+def make_messages(user_content: str) -> list:
+    return [
+        {"role": "system", "content": "You are a test agent."},
+        {"role": "user", "content": user_content}
+    ]
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test cases for LLMResponseCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.disk_path = os.path.join(self.temp_dir.name, "responses.sqlite")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_depends_on_request(self):
+        """Keys change with model, prompt and temperature"""
+        key = LLMResponseCache.make_key("model-a", make_messages("q"), 0)
+
+        self.assertEqual(key, LLMResponseCache.make_key("model-a", make_messages("q"), 0))
+        self.assertNotEqual(key, LLMResponseCache.make_key("model-b", make_messages("q"), 0))
+        self.assertNotEqual(key, LLMResponseCache.make_key("model-a", make_messages("other"), 0))
+        self.assertNotEqual(key, LLMResponseCache.make_key("model-a", make_messages("q"), 0.7))
+
+    def test_only_temperature_zero_is_cacheable(self):
+        self.assertTrue(LLMResponseCache.is_cacheable(0))
+        self.assertFalse(LLMResponseCache.is_cacheable(0.5))
+
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses"""
+        cache = LLMResponseCache()
+        key = cache.make_key("model-a", make_messages("q"), 0)
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "answer", {"total_tokens": 10})
+        self.assertEqual(cache.get(key)["content"], "answer")
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_memory_tier_lru_eviction(self):
+        """The least recently used entry leaves the memory tier first"""
+        cache = LLMResponseCache(max_memory_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get_stats()['memory_evictions'], 1)
+
+    def test_disk_tier_survives_restart(self):
+        """Responses written to disk are served by a new cache instance"""
+        cache = LLMResponseCache(disk_path=self.disk_path)
+        cache.put("key", "persisted answer", {"total_tokens": 3})
+        cache.close()
+
+        reopened = LLMResponseCache(disk_path=self.disk_path)
+        entry = reopened.get("key")
+        self.assertEqual(entry["content"], "persisted answer")
+        self.assertEqual(reopened.get_stats()['disk_hits'], 1)
+        reopened.close()
+
+    def test_disk_tier_size_eviction(self):
+        """The disk tier stays within its byte budget"""
+        cache = LLMResponseCache(max_memory_entries=1, disk_path=self.disk_path, max_disk_bytes=300)
+        for i in range(10):
+            cache.put(f"key_{i}", "x" * 100)
+
+        stats = cache.get_stats()
+        self.assertLessEqual(stats['disk_bytes'], 300)
+        self.assertGreater(stats['disk_evictions'], 0)
+        self.assertIsNotNone(cache.get("key_9"))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
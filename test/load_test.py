@@ -0,0 +1,126 @@
+import argparse
+import json
+import math
+import time
+from typing import Dict, List
+
+from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode
+from src.agent import Agent
+from src.LLMModule.backends import FakeLLMBackend, set_llm_backend
+from src.LLMModule.rate_limiter import get_llm_governor
+from src.round_runner import run_rounds
+
+
+def make_agents(num_agents: int, backend: FakeLLMBackend) -> List[Agent]:
+    """Create agents with distinct prompts (identical requests would be coalesced into one call)"""
+    return [Agent(f"agent_{i}", f"Worker {i}", f"You are worker {i} and solve one part of the problem.",
+                  backend=backend)
+            for i in range(num_agents)]
+
+
+def run_comm_mode_load(mode: CommunicationMode, backend: FakeLLMBackend, num_agents: int,
+                       rounds: int, problem: str, max_in_flight: int = None) -> Dict:
+    """
+    Run num_agents agents for a few rounds on one communication mode against the fake backend.
+    Framework overhead is the wall time not explained by the simulated LLM latency.
+
+    The governor is set to max_in_flight concurrent calls for the run (all agents at once
+    by default); with a lower bound, calls queue in waves and that queueing is counted as
+    expected LLM time, not overhead.
+    """
+    max_in_flight = max_in_flight or num_agents
+    governor = get_llm_governor()
+    previous_max_in_flight = governor.max_in_flight
+    governor.configure(max_in_flight=max_in_flight)
+    try:
+        return _run_comm_mode_load(mode, backend, num_agents, rounds, problem, max_in_flight, governor)
+    finally:
+        governor.configure(max_in_flight=previous_max_in_flight)
+
+
+def _run_comm_mode_load(mode, backend, num_agents, rounds, problem, max_in_flight, governor) -> Dict:
+    comm_manager = CommunicationManager(mode)
+    agents = make_agents(num_agents, backend)
+    for agent in agents:
+        comm_manager.register_agent(agent)
+
+    recipients = None
+    if mode == CommunicationMode.DIRECT:
+        recipients = {agent.agent_id: agents[(i + 1) % num_agents].agent_id for i, agent in enumerate(agents)}
+    elif mode == CommunicationMode.PUBSUB:
+        for agent in agents:
+            agent.subscribe_to_topic(comm_manager, "general")
+
+    calls_before = backend.get_stats()['calls']
+    governor_wait_before = governor.get_metrics()['wait_time_total']
+    started = time.perf_counter()
+    run_rounds(agents, comm_manager, problem, rounds, recipients, concurrent=True)
+    wall_time = time.perf_counter() - started
+
+    llm_calls = backend.get_stats()['calls'] - calls_before
+    # Agents of a round wait on the LLM concurrently, max_in_flight calls per wave
+    expected_llm_time = rounds * math.ceil(num_agents / max_in_flight) * backend.latency
+    return {
+        "mode": mode.value,
+        "agents": num_agents,
+        "rounds": rounds,
+        "max_in_flight": max_in_flight,
+        "llm_calls": llm_calls,
+        "wall_time": wall_time,
+        "governor_wait_time": governor.get_metrics()['wait_time_total'] - governor_wait_before,
+        "framework_overhead": max(wall_time - expected_llm_time, 0.0),
+        "overhead_per_call_ms": 1000 * max(wall_time - expected_llm_time, 0.0) / llm_calls if llm_calls else 0.0,
+        "messages_sent": comm_manager.communication_stats["messages_sent"]
+    }
+
+
+def run_action_executor_load(backend: FakeLLMBackend, num_agents: int, problem: str) -> Dict:
+    """Run ActionExecutor.execute_with_agents once with num_agents agents on the fake backend"""
+    from src.OrchestrationLayer.action_executor import ActionExecutor
+    from src.SharedLog.shared_log import SharedLog
+
+    executor = ActionExecutor(SharedLog("load_test.jsonl"))
+    agents = make_agents(num_agents, backend)
+
+    calls_before = backend.get_stats()['calls']
+    started = time.perf_counter()
+    executor.execute_with_agents(agents, {"task_description": problem}, problem)
+    return {
+        "agents": num_agents,
+        "llm_calls": backend.get_stats()['calls'] - calls_before,
+        "wall_time": time.perf_counter() - started
+    }
+
+
+# -------------------------------------------------------------
+# Main
+# -------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the framework against the local fake LLM backend")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean simulated LLM latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Concurrent LLM calls allowed by the governor (default: all agents)")
+    parser.add_argument("--action-executor", action="store_true", help="Also load test ActionExecutor")
+    args = parser.parse_args()
+
+    backend = FakeLLMBackend(latency=args.latency, latency_jitter=args.jitter, output_tokens=(50, 200))
+    # Agents created internally (orchestrator, action executor, environment agent) use it too
+    set_llm_backend(backend)
+    problem = "Design a caching layer for a read-heavy web service."
+
+    results = []
+    for mode in CommunicationMode:
+        result = run_comm_mode_load(mode, backend, args.agents, args.rounds, problem, args.max_in_flight)
+        results.append(result)
+        print(f"{mode.value:>10}: {result['llm_calls']} calls in {result['wall_time']:.2f}s "
+              f"(overhead {result['overhead_per_call_ms']:.2f} ms/call)")
+
+    if args.action_executor:
+        result = run_action_executor_load(backend, args.agents, problem)
+        results.append(result)
+        print(f"action executor: {result['llm_calls']} calls in {result['wall_time']:.2f}s")
+
+    print(json.dumps({"backend": backend.get_stats(), "runs": results}, indent=2, default=str))
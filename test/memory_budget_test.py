@@ -0,0 +1,202 @@
+"""
+Test cases for memory budgets, eviction policies and eviction reporting
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from src.MemoryModule.memory_budget import (LFUPolicy, LRUPolicy, MemoryBudget, PrefixPolicy, TTLPolicy,
+                                            estimate_size, make_eviction_policy)
+from src.MemoryModule.memory_manager import MemoryManager
+from src.SharedLog.shared_log import SharedLog
+
+
+class TestEvictionPolicies(unittest.TestCase):
+    """Victim order of each policy"""
+
+    def test_lru(self):
+        policy = LRUPolicy()
+        for key in ("a", "b", "c"):
+            policy.on_write(key)
+        policy.on_read("a")
+
+        self.assertEqual(list(policy.victims()), ["b", "c", "a"])
+
+    def test_lfu(self):
+        policy = LFUPolicy()
+        for key in ("a", "b", "c"):
+            policy.on_write(key)
+        policy.on_read("a")
+        policy.on_read("a")
+        policy.on_read("c")
+        policy.on_delete("b")
+
+        self.assertEqual(list(policy.victims()), ["c", "a"])
+
+    def test_lfu_buckets_stay_ordered(self):
+        policy = LFUPolicy()
+        policy.on_write("a")
+        for _ in range(3):
+            policy.on_read("a")
+        policy.on_write("b")
+        policy.on_read("b")
+        policy.on_write("c")
+        policy.on_delete("b")
+        policy.on_write("d")
+        policy.on_read("d")
+
+        self.assertEqual(list(policy.victims()), ["c", "d", "a"])
+        self.assertEqual(policy._frequencies, sorted(policy._buckets))
+
+    def test_ttl(self):
+        policy = TTLPolicy(ttl=10)
+        policy.on_write("a")
+        policy.on_write("b")
+        now = time.monotonic()
+
+        self.assertEqual(policy.expired(now), [])
+        self.assertEqual(policy.expired(now + 11), ["a", "b"])
+        self.assertTrue(policy.is_expired("a", now + 11))
+
+    def test_prefix(self):
+        policy = PrefixPolicy(("team_messages_", "scratch_"))
+        for key in ("plan", "scratch_1", "team_messages_1", "team_messages_2"):
+            policy.on_write(key)
+
+        self.assertEqual(list(policy.victims()), ["team_messages_1", "team_messages_2", "scratch_1", "plan"])
+
+    def test_make_eviction_policy(self):
+        self.assertIsInstance(make_eviction_policy("LFU"), LFUPolicy)
+        with self.assertRaises(ValueError):
+            make_eviction_policy("ttl")
+        with self.assertRaises(ValueError):
+            make_eviction_policy("random")
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Incremental size accounting"""
+
+    def test_estimate_size_walks_containers(self):
+        self.assertGreater(estimate_size({"text": "x" * 1000}), 1000)
+        self.assertGreater(estimate_size(["x" * 500, ["y" * 500]]), 1000)
+
+    def test_rewrite_replaces_size(self):
+        budget = MemoryBudget(max_bytes=10 ** 6)
+        budget.record_write("k", "x" * 1000)
+        large = budget.total_bytes
+        budget.record_write("k", "x")
+
+        self.assertLess(budget.total_bytes, large)
+        budget.record_delete("k")
+        self.assertEqual(budget.total_bytes, 0)
+
+    def test_victims_stop_within_budget(self):
+        budget = MemoryBudget(max_entries=2)
+        for key in ("a", "b", "c", "d"):
+            budget.record_write(key, 1)
+
+        self.assertEqual(budget.over_budget_victims(keep="d"), ["a", "b"])
+
+    def test_victims_are_read_lazily(self):
+        budget = MemoryBudget(max_entries=1000)
+        for i in range(1001):
+            budget.record_write(f"k{i}", i)
+        visited = []
+        victims = budget.policy.victims
+
+        def recording_victims():
+            for key in victims():
+                visited.append(key)
+                yield key
+
+        budget.policy.victims = recording_victims
+        self.assertEqual(budget.over_budget_victims(), ["k0"])
+        self.assertEqual(visited, ["k0", "k1"])
+
+
+class TestMemoryManagerBudget(unittest.TestCase):
+    """Budgets enforced by MemoryManager"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.tmp.cleanup()
+
+    def test_entry_budget_evicts_lru(self):
+        manager = MemoryManager(max_memory_entries=3)
+        manager.register_agent("a")
+        for i in range(3):
+            manager.write(f"k{i}", f"value {i}", "a")
+        manager.get_value("k0", "a")
+        manager.write("k3", "value 3", "a")
+
+        self.assertEqual(sorted(manager.get_memory_keys()), ["k0", "k2", "k3"])
+        self.assertNotIn("k1", [hit['key'] for hit in manager.search("value", k=10, agent_id="a")])
+        self.assertEqual(manager.get_memory_stats()['budget']['evictions'], {'lru': 1})
+
+    def test_byte_budget_bounds_growth(self):
+        manager = MemoryManager(max_memory_bytes=20000, eviction_prefixes=("team_messages_",))
+        manager.register_agent("a")
+        manager.write("plan", "keep me", "a")
+        for i in range(100):
+            manager.write(f"team_messages_{i}", "x" * 500, "a")
+
+        stats = manager.get_budget_stats()
+        self.assertLessEqual(stats['estimated_bytes'], 20000)
+        self.assertEqual(stats['policy'], "prefix")
+        self.assertIn("plan", manager.get_memory_keys())
+        self.assertIn("team_messages_99", manager.get_memory_keys())
+
+    def test_ttl_expires_entries(self):
+        manager = MemoryManager(memory_ttl=0.05)
+        manager.register_agent("a")
+        manager.write("old", 1, "a")
+        time.sleep(0.06)
+
+        self.assertIsNone(manager.get_value("old", "a"))
+        manager.write("fresh", 2, "a")
+        self.assertEqual(manager.get_memory_keys(), ["fresh"])
+        self.assertEqual(manager.evict_expired(), 0)
+
+    def test_rbac_eviction_bypasses_permissions(self):
+        manager = MemoryManager(memory_type="rbac", max_memory_entries=1)
+        manager.register_agent("admin", "Admin")
+        manager.write("secret", 1, "admin")
+        manager.protect_key("secret", "admin")
+        manager.write("next", 2, "admin")
+
+        self.assertEqual(manager.get_memory_keys("admin"), ["next"])
+        self.assertEqual(manager.get_protected_keys("admin"), [])
+
+    def test_evictions_reported_to_shared_log(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            shared_log = SharedLog("budget_test.jsonl")
+            manager = MemoryManager(max_memory_entries=1, shared_log=shared_log)
+            manager.register_agent("a")
+            manager.write("first", 1, "a")
+            manager.write("second", 2, "a")
+
+            events = shared_log.get_full_logs()
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['event_type'], "MEMORY_EVICT")
+        self.assertEqual(events[0]['details']['key'], "first")
+        self.assertEqual(events[0]['details']['reason'], "lru")
+
+    def test_no_budget_by_default(self):
+        manager = MemoryManager()
+        self.assertIsNone(manager.budget)
+        self.assertIsNone(manager.get_budget_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import threading
+import time
+from typing import Dict
+
+from src.MemoryModule.concurrent_memory import ConcurrentSharedMemory
+from src.MemoryModule.shared_memory import SharedMemory
+
+
+def cas_increment(memory: SharedMemory, key: str, agent_id: str) -> int:
+    """Increment a counter entry with compare-and-swap; returns the number of retries"""
+    retries = 0
+    while True:
+        entry = memory.read(key, agent_id)
+        version = entry['version'] if entry else 0
+        count = entry['value'] if entry else 0
+        if memory.write_if_version(key, count + 1, version, agent_id):
+            return retries
+        retries += 1
+
+
+def blind_increment(memory: SharedMemory, key: str, agent_id: str) -> int:
+    """Read-modify-write without CAS (the pattern that loses updates under contention)"""
+    entry = memory.read(key, agent_id)
+    memory.write(key, (entry['value'] if entry else 0) + 1, agent_id)
+    return 0
+
+
+def run_contention(memory: SharedMemory, threads: int, increments: int, keys: int, use_cas: bool = True) -> Dict:
+    """
+    Every thread increments counters spread over `keys` keys (fewer keys = hotter contention).
+    Lost updates are the increments missing from the final counter totals.
+    """
+    increment = cas_increment if use_cas else blind_increment
+    agent_ids = [f"agent_{i}" for i in range(threads)]
+    for agent_id in agent_ids:
+        memory.register_agent(agent_id)
+
+    retries = [0] * threads
+    barrier = threading.Barrier(threads)
+
+    def worker(index: int) -> None:
+        agent_id = agent_ids[index]
+        barrier.wait()
+        for i in range(increments):
+            retries[index] += increment(memory, f"counter_{(index + i) % keys}", agent_id)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall_time = time.perf_counter() - started
+
+    expected = threads * increments
+    total = sum(memory.get_value(f"counter_{k}", agent_ids[0]) or 0 for k in range(keys))
+    return {
+        "memory": memory.__class__.__name__,
+        "cas": use_cas,
+        "threads": threads,
+        "keys": keys,
+        "increments": expected,
+        "lost_updates": expected - total,
+        "retries": sum(retries),
+        "wall_time": wall_time,
+        "increments_per_sec": expected / wall_time if wall_time else 0.0
+    }
+
+
+# -------------------------------------------------------------
+# Main
+# -------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contention benchmark for concurrent shared memory writes")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--increments", type=int, default=2000, help="Increments per thread")
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 16, 1024], help="Hot key counts to test")
+    parser.add_argument("--stripes", type=int, default=64)
+    args = parser.parse_args()
+
+    results = []
+    for keys in args.keys:
+        runs = [
+            run_contention(SharedMemory(), args.threads, args.increments, keys, use_cas=False),
+            run_contention(ConcurrentSharedMemory(args.stripes), args.threads, args.increments, keys)
+        ]
+        for result in runs:
+            results.append(result)
+            print(f"{result['memory']:>22} keys={keys:<5} cas={result['cas']!s:<5} "
+                  f"{result['increments_per_sec']:>10.0f} incr/s  lost={result['lost_updates']}  "
+                  f"retries={result['retries']}")
+
+    print(json.dumps(results, indent=2))
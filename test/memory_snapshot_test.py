@@ -0,0 +1,153 @@
+"""
+Test cases for persistent maps and O(1) memory snapshots
+"""
+
+import random
+import threading
+import unittest
+
+from src.MemoryModule.concurrent_memory import ConcurrentSharedMemory
+from src.MemoryModule.memory_manager import MemoryManager
+from src.MemoryModule.memory_snapshot import PersistentMap, SnapshotDict
+
+
+class CollidingKey:
+    """Key with a fixed hash to exercise collision nodes"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+
+class TestPersistentMap(unittest.TestCase):
+    """Test cases for PersistentMap"""
+
+    def test_matches_dict_under_random_operations(self):
+        rng = random.Random(7)
+        reference = {}
+        current = PersistentMap()
+        for _ in range(3000):
+            key = f"k{rng.randrange(500)}"
+            if rng.random() < 0.3:
+                reference.pop(key, None)
+                current = current.delete(key)
+            else:
+                value = rng.random()
+                reference[key] = value
+                current = current.set(key, value)
+
+        self.assertEqual(len(current), len(reference))
+        self.assertEqual(dict(current.items()), reference)
+
+    def test_old_versions_are_unchanged(self):
+        first = PersistentMap().set("a", 1)
+        second = first.set("a", 2).set("b", 3)
+
+        self.assertEqual(dict(first.items()), {"a": 1})
+        self.assertEqual(dict(second.items()), {"a": 2, "b": 3})
+        self.assertIs(first.delete("missing"), first)
+
+    def test_hash_collisions(self):
+        a, b, c = CollidingKey("a"), CollidingKey("b"), CollidingKey("c")
+        current = PersistentMap().set(a, 1).set(b, 2).set(c, 3).set(b, 4)
+
+        self.assertEqual(len(current), 3)
+        self.assertEqual(current[b], 4)
+        current = current.delete(a).delete(c)
+        self.assertEqual(dict(current.items()), {b: 4})
+        with self.assertRaises(KeyError):
+            current[a]
+
+    def test_diff_reports_only_changes(self):
+        base = PersistentMap.from_items((f"k{i}", i) for i in range(1000))
+        newer = base.set("k1", "one").delete("k2").set("new", 0)
+
+        changes = {key: (old, new) for key, old, new in base.diff(newer)}
+        self.assertEqual(set(changes), {"k1", "k2", "new"})
+        self.assertEqual(changes["k1"], (1, "one"))
+        self.assertEqual(list(base.diff(base)), [])
+
+
+class TestSnapshotDict(unittest.TestCase):
+    """Test cases for SnapshotDict mirroring"""
+
+    def test_snapshot_is_isolated_from_later_mutations(self):
+        live = SnapshotDict(a=1)
+        snapshot = live.snapshot_map()
+        live["b"] = 2
+        del live["a"]
+        live.update(c=3)
+        live.setdefault("d", 4)
+        live.pop("c")
+
+        self.assertEqual(dict(snapshot.items()), {"a": 1})
+        self.assertEqual(dict(live.snapshot_map().items()), {"b": 2, "d": 4})
+        live.clear()
+        self.assertEqual(len(live.snapshot_map()), 0)
+
+
+class TestMemorySnapshots(unittest.TestCase):
+    """Snapshots taken through MemoryManager"""
+
+    def test_snapshot_and_diff(self):
+        manager = MemoryManager()
+        manager.register_agent("a")
+        manager.write("plan", "v1", "a")
+        manager.write("notes", "n1", "a")
+        before = manager.snapshot()
+
+        manager.write("plan", "v2", "a")
+        manager.delete_key("notes", "a")
+        manager.write("result", "r1", "a")
+        after = manager.snapshot()
+
+        self.assertEqual(before["plan"]["value"], "v1")
+        self.assertEqual(after["plan"]["value"], "v2")
+        self.assertGreater(after.version, before.version)
+        diff = before.diff(after)
+        self.assertEqual(list(diff["added"]), ["result"])
+        self.assertEqual(list(diff["changed"]), ["plan"])
+        self.assertEqual(diff["removed"], ["notes"])
+
+    def test_memory_state_uses_snapshot(self):
+        manager = MemoryManager(memory_type="rbac")
+        manager.register_agent("admin", "Admin")
+        manager.write("k", 1, "admin")
+
+        state = manager.get_memory_state()
+        manager.write("k", 2, "admin")
+        self.assertEqual(state['memory_contents']['k']['value'], 1)
+        self.assertEqual(state['registered_agents'], ["admin"])
+        self.assertIs(type(state['memory_contents']), dict)
+
+    def test_first_snapshot_during_concurrent_writes(self):
+        for trial in range(3):
+            memory = ConcurrentSharedMemory()
+            for writer in range(4):
+                memory.register_agent(f"w{writer}")
+
+            def write_keys(writer):
+                for i in range(5000):
+                    memory.write(f"w{writer}_{i}", i, f"w{writer}")
+
+            threads = [threading.Thread(target=write_keys, args=(w,)) for w in range(4)]
+            for thread in threads:
+                thread.start()
+            while len(memory.memory) < 2000:
+                pass
+            try:
+                memory.snapshot()
+            finally:
+                for thread in threads:
+                    thread.join()
+
+            # Writes racing the first snapshot must still reach every later one
+            self.assertEqual(len(memory.snapshot()), 20000)
+
+if __name__ == '__main__':
+    unittest.main()
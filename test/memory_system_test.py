@@ -116,6 +116,37 @@ class TestShortTermMemory(unittest.TestCase):
         self.assertIn("New event 1", recent_events)
         self.assertIn("New event 2", recent_events)
     
+    def test_event_ids_stay_unique_after_wrap(self):
+        """Test that event ids keep increasing once the ring buffer wraps"""
+        for i in range(12):
+            self.short_memory.add_event(f"Event {i}")
+        
+        entries = self.short_memory.get_recent_with_metadata(5)
+        self.assertEqual([entry['event_id'] for entry in entries], [7, 8, 9, 10, 11])
+        self.assertEqual([entry['data'] for entry in entries], [f"Event {i}" for i in range(7, 12)])
+        self.assertEqual(self.short_memory.get_all_events(), [f"Event {i}" for i in range(7, 12)])
+        self.assertEqual(self.short_memory.get_recent(2), ["Event 10", "Event 11"])
+    
+    def test_get_events_since_after_wrap(self):
+        """Test the bisected time range query on a wrapped buffer"""
+        for i in range(8):
+            self.short_memory.add_event(f"Event {i}")
+        entries = self.short_memory.get_recent_with_metadata(5)
+        
+        self.assertEqual(self.short_memory.get_events_since(entries[1]['timestamp'] - timedelta(microseconds=1)),
+                         [entry['data'] for entry in entries[1:]])
+        self.assertEqual(self.short_memory.get_events_since(datetime.now() + timedelta(seconds=1)), [])
+        self.assertEqual(len(self.short_memory.get_events_since(datetime.now() - timedelta(seconds=1))), 5)
+    
+    def test_zero_capacity(self):
+        """Test that a zero-size memory stores nothing"""
+        memory = ShortTermMemory(max_size=0)
+        memory.add_event("dropped")
+        
+        self.assertEqual(memory.size(), 0)
+        self.assertEqual(memory.get_recent(5), [])
+        self.assertEqual(memory.get_events_since(datetime.now() - timedelta(seconds=1)), [])
+    
     def test_memory_info(self):
         """Test getting memory information"""
         # Test empty memory
@@ -217,6 +248,25 @@ class TestMemoryManagerWithShortTerm(unittest.TestCase):
         self.assertEqual(info['max_size'], 10)
         self.assertFalse(info['is_full'])
     
+    def test_memory_version_tracks_changes(self):
+        """Test that the memory version changes on writes and short-term events only"""
+        initial = self.memory_manager.get_memory_version(self.agent_id1)
+        
+        self.memory_manager.read("missing_key", self.agent_id1)
+        self.assertEqual(self.memory_manager.get_memory_version(self.agent_id1), initial)
+        
+        self.memory_manager.write("key", "value", self.agent_id2)
+        after_write = self.memory_manager.get_memory_version(self.agent_id1)
+        self.assertNotEqual(after_write, initial)
+        
+        self.memory_manager.add_short_term_event(self.agent_id1, "event")
+        self.assertNotEqual(self.memory_manager.get_memory_version(self.agent_id1), after_write)
+        
+        # Another agent's short-term events do not affect this agent's view
+        current = self.memory_manager.get_memory_version(self.agent_id1)
+        self.memory_manager.add_short_term_event(self.agent_id2, "other event")
+        self.assertEqual(self.memory_manager.get_memory_version(self.agent_id1), current)
+    
     def test_operations_with_unregistered_agent(self):
         """Test operations with unregistered agent"""
         unregistered_id = "unregistered_agent"
@@ -0,0 +1,208 @@
+"""
+Test cases for bounded per-agent message queues and backpressure policies
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode, create_message
+from src.CommunicationModule.message_queue import BackpressurePolicy, BoundedMessageQueue, QueueStats
+
+
+class StubAgent:
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+
+    def get_id(self):
+        return self.agent_id
+
+
+def message(sender, content, recipient=None, topic=None):
+    return create_message(sender_id=sender, sender_role="Tester", content=content,
+                          recipient_id=recipient, topic=topic)
+
+
+class TestBoundedMessageQueue(unittest.TestCase):
+    """Test cases for each backpressure policy"""
+
+    def test_drop_oldest(self):
+        queue = BoundedMessageQueue(2, BackpressurePolicy.DROP_OLDEST)
+        for i in range(3):
+            self.assertTrue(queue.put(message("a", f"m{i}")))
+        self.assertEqual([m.content for m in queue.drain()], ["m1", "m2"])
+        self.assertEqual(queue.stats.dropped, 1)
+        self.assertEqual(queue.stats.depth, 0)
+
+    def test_drop_newest(self):
+        queue = BoundedMessageQueue(2, BackpressurePolicy.DROP_NEWEST)
+        results = [queue.put(message("a", f"m{i}")) for i in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual([m.content for m in queue.drain()], ["m0", "m1"])
+        self.assertEqual(queue.stats.dropped, 1)
+
+    def test_coalesce_by_sender(self):
+        queue = BoundedMessageQueue(2, BackpressurePolicy.COALESCE_BY_SENDER)
+        queue.put(message("a", "a1"))
+        queue.put(message("b", "b1"))
+        queue.put(message("a", "a2"))
+        self.assertEqual(len(queue), 2)
+        self.assertEqual([m.content for m in queue.drain()], ["b1", "a2"])
+        self.assertEqual(queue.stats.coalesced, 1)
+        self.assertEqual(queue.stats.dropped, 0)
+
+    def test_block_times_out(self):
+        queue = BoundedMessageQueue(1, BackpressurePolicy.BLOCK, block_timeout=0.01)
+        self.assertTrue(queue.put(message("a", "m0")))
+        self.assertFalse(queue.put(message("a", "m1")))
+        self.assertEqual(queue.stats.block_timeouts, 1)
+
+    def test_block_waits_for_consumer(self):
+        queue = BoundedMessageQueue(1, BackpressurePolicy.BLOCK, block_timeout=5.0)
+        queue.put(message("a", "m0"))
+        drained = []
+
+        def consume():
+            time.sleep(0.05)
+            drained.extend(queue.drain())
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        self.assertTrue(queue.put(message("a", "m1")))
+        consumer.join()
+        self.assertEqual([m.content for m in drained], ["m0"])
+        self.assertEqual([m.content for m in queue.drain()], ["m1"])
+
+    def test_coalesce_after_eviction(self):
+        queue = BoundedMessageQueue(2, BackpressurePolicy.COALESCE_BY_SENDER)
+        for content in ("a1", "b1", "c1"):  # c1 evicts a1
+            queue.put(message(content[0], content))
+        queue.put(message("a", "a2"))  # a has nothing pending any more: evicts b1
+        self.assertEqual([m.content for m in queue.drain()], ["c1", "a2"])
+        self.assertEqual(queue.stats.coalesced, 0)
+        self.assertEqual(queue.stats.dropped, 2)
+
+    def test_block_rejected_on_event_loop(self):
+        queue = BoundedMessageQueue(1, BackpressurePolicy.BLOCK, block_timeout=5.0)
+        queue.put(message("a", "m0"))
+
+        async def send_on_loop():
+            return queue.put(message("a", "m1"))
+
+        start = time.perf_counter()
+        self.assertFalse(asyncio.run(send_on_loop()))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(queue.stats.dropped, 1)
+        self.assertEqual(queue.stats.block_timeouts, 0)
+
+    def test_aput_awaits_consumer_on_same_loop(self):
+        queue = BoundedMessageQueue(1, BackpressurePolicy.BLOCK, block_timeout=5.0)
+
+        async def scenario():
+            await queue.aput(message("a", "m0"))
+            producer = asyncio.create_task(queue.aput(message("a", "m1")))
+            await asyncio.sleep(0.01)
+            self.assertFalse(producer.done())
+            drained = queue.drain()
+            return drained, await producer
+
+        drained, accepted = asyncio.run(scenario())
+        self.assertEqual([m.content for m in drained], ["m0"])
+        self.assertTrue(accepted)
+        self.assertEqual([m.content for m in queue.drain()], ["m1"])
+
+    def test_aput_times_out(self):
+        queue = BoundedMessageQueue(1, BackpressurePolicy.BLOCK, block_timeout=0.01)
+
+        async def scenario():
+            await queue.aput(message("a", "m0"))
+            return await queue.aput(message("a", "m1"))
+
+        self.assertFalse(asyncio.run(scenario()))
+        self.assertEqual(queue.stats.block_timeouts, 1)
+        self.assertEqual(queue._space_waiters, [])
+
+    def test_shared_stats_track_depth(self):
+        stats = QueueStats()
+        first, second = BoundedMessageQueue(5, stats=stats), BoundedMessageQueue(5, stats=stats)
+        first.put(message("a", "x"))
+        second.put(message("a", "y"))
+        second.put(message("a", "z"))
+        self.assertEqual(stats.depth, 3)
+        second.drain()
+        self.assertEqual(stats.as_dict()["queue_depth"], 1)
+        self.assertEqual(stats.as_dict()["max_queue_depth"], 3)
+
+
+class TestCommunicationManagerQueues(unittest.TestCase):
+    """Test cases for queue counters exposed by the communication manager"""
+
+    def test_direct_stats(self):
+        manager = CommunicationManager(CommunicationMode.DIRECT, queue_size=2,
+                                       backpressure=BackpressurePolicy.DROP_NEWEST)
+        for agent_id in ("a", "b"):
+            manager.register_agent(StubAgent(agent_id))
+
+        results = [manager.send(message("a", f"m{i}", recipient="b")) for i in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(manager.communication_stats["queue_depth"], 2)
+        self.assertEqual(manager.communication_stats["messages_dropped"], 1)
+        self.assertEqual(manager.get_queue_depths(), {"a": 0, "b": 2})
+
+        self.assertEqual(len(manager.receive("b")), 2)
+        self.assertEqual(manager.communication_stats["queue_depth"], 0)
+        self.assertEqual(manager.communication_stats["messages_received"], 2)
+
+    def test_pubsub_coalescing(self):
+        manager = CommunicationManager(CommunicationMode.PUBSUB, backpressure=BackpressurePolicy.COALESCE_BY_SENDER)
+        for agent_id in ("a", "b"):
+            manager.register_agent(StubAgent(agent_id))
+        manager.subscribe("b", "status")
+
+        for i in range(3):
+            manager.send(message("a", f"s{i}", topic="status"))
+        self.assertEqual(manager.communication_stats["messages_coalesced"], 2)
+        self.assertEqual([m.content for m in manager.receive("b")], ["s2"])
+
+    def test_asend_blocks_without_stalling_the_loop(self):
+        manager = CommunicationManager(CommunicationMode.DIRECT, queue_size=1,
+                                       backpressure=BackpressurePolicy.BLOCK, block_timeout=5.0)
+        for agent_id in ("a", "b"):
+            manager.register_agent(StubAgent(agent_id))
+
+        async def scenario():
+            await manager.asend(message("a", "m0", recipient="b"))
+            producer = asyncio.create_task(manager.asend(message("a", "m1", recipient="b")))
+            first = await manager.areceive("b", timeout=1.0)
+            second = await manager.areceive("b", timeout=1.0)
+            return first, second, await producer
+
+        first, second, accepted = asyncio.run(scenario())
+        self.assertEqual([m.content for m in first + second], ["m0", "m1"])
+        self.assertTrue(accepted)
+        self.assertEqual(manager.communication_stats["messages_sent"], 2)
+
+    def test_message_log_keeps_only_recent_deliveries(self):
+        for mode in (CommunicationMode.DIRECT, CommunicationMode.PUBSUB):
+            with self.subTest(mode=mode):
+                manager = CommunicationManager(mode, message_log_size=3)
+                for agent_id in ("a", "b"):
+                    manager.register_agent(StubAgent(agent_id))
+                manager.subscribe("b", "status")
+
+                for i in range(10):
+                    manager.send(message("a", f"m{i}", recipient="b", topic="status"))
+                log = manager.current_communicator.message_log
+                self.assertEqual([m.content for m in log], ["m7", "m8", "m9"])
+
+    def test_blackboard_has_no_queues(self):
+        manager = CommunicationManager(CommunicationMode.BLACKBOARD)
+        manager.register_agent(StubAgent("a"))
+        manager.send(message("a", "hello"))
+        self.assertEqual(manager.get_queue_depths(), {})
+        self.assertEqual(manager.communication_stats["queue_depth"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Test cases for the SQLite-backed persistent memory
+"""
+
+import os
+import pickle
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+from src.MemoryModule.memory_manager import MemoryManager
+from src.MemoryModule.persistent_memory import PersistentMemory, PersistentRBACMemory, SQLiteMemoryStore
+
+
+class TestSQLiteMemoryStore(unittest.TestCase):
+    """Test cases for SQLiteMemoryStore"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "memory.db")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.tmp.cleanup()
+
+    def test_mapping_behaviour(self):
+        store = SQLiteMemoryStore(self.path)
+        store["a"] = {"value": 1}
+        store["b"] = {"value": [1, 2]}
+        del store["a"]
+
+        self.assertNotIn("a", store)
+        self.assertEqual(store["b"], {"value": [1, 2]})
+        self.assertEqual(len(store), 1)
+        with self.assertRaises(KeyError):
+            store["a"]
+        store.close()
+
+    def test_entries_stored_as_json(self):
+        store = SQLiteMemoryStore(self.path, cache_size=1)
+        written_at = datetime(2026, 1, 2, 3, 4, 5)
+        store["a"] = {"value": {"tags": {"x"}, "n": 1.5}, "timestamp": written_at}
+        store["b"] = {"value": None}  # evicts "a" from the cache
+
+        self.assertEqual(store["a"], {"value": {"tags": {"x"}, "n": 1.5}, "timestamp": written_at})
+        raw = store._conn.execute("SELECT entry FROM memory WHERE key = 'a'").fetchone()[0]
+        self.assertIn('"__datetime__"', raw)
+        store.close()
+
+    def test_pickled_entries_are_never_loaded(self):
+        class Exploit:
+            def __reduce__(self):
+                return (os.system, ("echo pwned",))
+
+        store = SQLiteMemoryStore(self.path)
+        store._conn.execute("INSERT INTO memory (key, entry) VALUES ('evil', ?)", (pickle.dumps(Exploit()),))
+        store._conn.commit()
+        store.close()
+
+        reopened = SQLiteMemoryStore(self.path)
+        with self.assertRaises(KeyError):
+            reopened["evil"]
+        reopened.close()
+
+    def test_keys_keep_insertion_order(self):
+        store = SQLiteMemoryStore(self.path)
+        for key in ["analyst_1006", "analyst_1009", "analyst_1002", "analyst_1000"]:
+            store[key] = {"value": key}
+        store["analyst_1009"] = {"value": "updated"}
+        store.close()
+
+        reopened = SQLiteMemoryStore(self.path)
+        self.assertEqual(list(reopened), ["analyst_1006", "analyst_1009", "analyst_1002", "analyst_1000"])
+        reopened.close()
+
+    def test_wal_mode(self):
+        store = SQLiteMemoryStore(self.path)
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+        store.close()
+
+    def test_read_through_cache(self):
+        store = SQLiteMemoryStore(self.path, cache_size=1)
+        store["a"] = {"value": "A"}
+        store["b"] = {"value": "B"}  # evicts "a" from the cache
+
+        store["b"]
+        store["a"]
+        store["a"]
+        stats = store.get_stats()
+        self.assertEqual(stats['cache_hits'], 2)
+        self.assertEqual(stats['cache_misses'], 1)
+        store.close()
+
+    def test_batched_commits(self):
+        store = SQLiteMemoryStore(self.path, batch_size=10, flush_interval=60)
+        for i in range(25):
+            store[f"k{i}"] = {"value": i}
+
+        self.assertEqual(store.get_stats()['pending_writes'], 5)
+        # Another connection sees only committed batches
+        reader = sqlite3.connect(self.path)
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM memory").fetchone()[0], 20)
+        store.flush()
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM memory").fetchone()[0], 25)
+        reader.close()
+        store.close()
+
+
+class TestPersistentMemory(unittest.TestCase):
+    """Test cases for PersistentMemory and PersistentRBACMemory"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "memory.db")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.tmp.cleanup()
+
+    def test_entries_survive_restart(self):
+        memory = PersistentMemory(self.path)
+        memory.register_agent("agent_1")
+        memory.write("plan", "v1", "agent_1")
+        memory.write("plan", "v2", "agent_1")
+        memory.close()
+
+        reopened = PersistentMemory(self.path)
+        reopened.register_agent("agent_2")
+        entry = reopened.read("plan", "agent_2")
+        self.assertEqual(entry['value'], "v2")
+        self.assertEqual(entry['written_by'], "agent_1")
+        self.assertEqual(entry['version'], 2)
+        self.assertEqual(reopened.get_memory_keys(), ["plan"])
+        reopened.close()
+
+    def test_unregistered_agent_rejected(self):
+        memory = PersistentMemory(self.path)
+        self.assertFalse(memory.write("plan", "v1", "stranger"))
+        self.assertEqual(len(memory.memory), 0)
+        memory.close()
+
+    def test_rbac_protected_keys_persist(self):
+        memory = PersistentRBACMemory(self.path)
+        memory.register_agent("admin", "Admin")
+        memory.write("secret", "s", "admin")
+        memory.protect_key("secret", "admin")
+        memory.close()
+
+        reopened = PersistentRBACMemory(self.path)
+        reopened.register_agent("analyst", "Problem Analyst")
+        self.assertFalse(reopened.write("secret", "overwrite", "analyst"))
+        self.assertIn("secret", reopened.protected_keys)
+        reopened.close()
+
+    def test_memory_manager_selection(self):
+        manager = MemoryManager(memory_type="persistent_rbac", memory_path=self.path)
+        manager.register_agent("writer", "Problem Analyst")
+
+        self.assertTrue(manager.is_rbac_enabled())
+        self.assertTrue(manager.write("notes", "hello", "writer"))
+        self.assertEqual(manager.get_value("notes", "writer"), "hello")
+        self.assertEqual(manager.get_memory_keys("writer"), ["notes"])
+        manager.flush()
+        self.assertIn('storage', manager.get_memory_stats())
+        manager.memory_impl.close()
+
+        shared = MemoryManager(memory_type="persistent", memory_path=self.path)
+        self.assertEqual(shared.get_memory_type(), "persistent")
+        self.assertFalse(shared.is_rbac_enabled())
+        shared.memory_impl.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Test cases for RBAC memory permission masks, role counts and visible key caching
+"""
+
+import unittest
+
+from src.MemoryModule.memory_manager import MemoryManager
+from src.MemoryModule.rbac_memory import AccessLevel, PERMISSION_BITS, RBACMemory, permission_mask
+
+
+class TestPermissionMasks(unittest.TestCase):
+    """Permission bitmasks follow role and permission changes"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.memory = RBACMemory()
+        self.memory.register_agent("admin", "Admin")
+        self.memory.register_agent("guest", "Guest")
+
+    def test_permission_mask(self):
+        self.assertEqual(permission_mask(set()), 0)
+        self.assertEqual(permission_mask({AccessLevel.READ, AccessLevel.ADMIN}),
+                         PERMISSION_BITS[AccessLevel.READ] | PERMISSION_BITS[AccessLevel.ADMIN])
+
+    def test_role_change_updates_permissions(self):
+        self.assertFalse(self.memory.write("k", 1, "guest"))
+
+        self.assertTrue(self.memory.set_agent_role("guest", "Solution Implementer", "admin"))
+        self.assertTrue(self.memory.write("k", 1, "guest"))
+        self.assertFalse(self.memory.delete_key("k", "guest"))
+
+    def test_role_permission_changes_reach_members(self):
+        self.memory.register_agent("guest2", "Guest")
+
+        self.assertTrue(self.memory.add_role_permission("Guest", AccessLevel.WRITE, "admin"))
+        self.assertTrue(self.memory.write("a", 1, "guest"))
+        self.assertTrue(self.memory.write("b", 1, "guest2"))
+
+        self.assertTrue(self.memory.remove_role_permission("Guest", AccessLevel.READ, "admin"))
+        self.assertIsNone(self.memory.read("a", "guest"))
+        self.assertEqual(self.memory.get_memory_keys("guest2"), [])
+
+    def test_unknown_role_and_agent_have_no_permissions(self):
+        self.memory.register_agent("nobody", "Unknown Role")
+
+        self.assertIsNone(self.memory.read("k", "nobody"))
+        self.assertFalse(self.memory.write("k", 1, "unregistered"))
+        self.assertEqual(self.memory.get_agent_permissions("nobody"), set())
+
+
+class TestRoleCounts(unittest.TestCase):
+    """Role membership is maintained incrementally"""
+
+    def test_role_distribution_and_info(self):
+        memory = RBACMemory()
+        memory.register_agent("admin", "Admin")
+        memory.register_agent("a", "Guest")
+        memory.register_agent("b", "Guest")
+        memory.set_agent_role("b", "Domain Specialist", "admin")
+
+        distribution = memory.get_rbac_stats()['role_distribution']
+        self.assertEqual(distribution['Guest'], 1)
+        self.assertEqual(distribution['Domain Specialist'], 1)
+        self.assertEqual(distribution['Admin'], 1)
+        self.assertEqual(distribution['Team Coordinator'], 0)
+        self.assertEqual(memory.get_role_info("Guest")['agents'], ["a"])
+        self.assertEqual(memory.get_role_info("Domain Specialist")['agents'], ["b"])
+
+
+class TestVisibleKeys(unittest.TestCase):
+    """Visible keys per access class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.memory = RBACMemory()
+        self.memory.register_agent("admin", "Admin")
+        self.memory.register_agent("writer", "Problem Analyst")
+        self.memory.write("first", 1, "writer")
+        self.memory.write("secret", 2, "admin")
+        self.memory.write("last", 3, "writer")
+
+    def test_keys_follow_protection_changes(self):
+        self.memory.protect_key("secret", "admin")
+        self.assertEqual(self.memory.get_memory_keys("writer"), ["first", "last"])
+        self.assertEqual(self.memory.get_memory_keys("admin"), ["first", "secret", "last"])
+
+        self.memory.unprotect_key("secret", "admin")
+        self.assertEqual(self.memory.get_memory_keys("writer"), ["first", "secret", "last"])
+
+    def test_keys_follow_writes_and_deletes(self):
+        self.assertEqual(self.memory.get_memory_keys("writer"), ["first", "secret", "last"])
+
+        self.memory.write("new", 4, "writer")
+        self.memory.delete_key("first", "admin")
+        self.assertEqual(self.memory.get_memory_keys("writer"), ["secret", "last", "new"])
+        self.assertEqual(self.memory.get_visible_key_set("writer"), {"secret", "last", "new"})
+
+        self.memory.clear_memory()
+        self.assertEqual(self.memory.get_memory_keys("admin"), [])
+
+    def test_writes_update_visible_keys_in_place(self):
+        visible = self.memory._get_visible_keys("writer")
+        self.memory.protect_key("secret", "admin")
+        self.memory.write("new", 4, "writer")
+        self.memory.write("admin_only", 5, "admin")
+        self.memory.protect_key("admin_only", "admin")
+        self.memory.delete_key("first", "admin")
+
+        self.assertIs(self.memory._get_visible_keys("writer"), visible)
+        self.assertEqual(self.memory.get_memory_keys("writer"), ["last", "new"])
+        self.assertEqual(self.memory.get_memory_keys("admin"), ["secret", "last", "new", "admin_only"])
+
+    def test_returned_list_is_a_copy(self):
+        keys = self.memory.get_memory_keys("writer")
+        keys.append("injected")
+
+        self.assertNotIn("injected", self.memory.get_memory_keys("writer"))
+
+    def test_manager_search_respects_protection(self):
+        manager = MemoryManager(memory_type="rbac")
+        manager.register_agent("admin", "Admin")
+        manager.register_agent("writer", "Problem Analyst")
+        manager.write("launch_codes", "database password rotation", "admin")
+        manager.protect_key("launch_codes", "admin")
+
+        self.assertEqual(manager.search("database password", agent_id="writer"), [])
+        self.assertEqual([hit['key'] for hit in manager.search("database password", agent_id="admin")],
+                         ["launch_codes"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Test cases for the concurrent round runner
+"""
+
+import asyncio
+import time
+import unittest
+
+from src.agent import Agent
+from src.CommunicationModule.communication_manager import CommunicationManager, CommunicationMode
+from src.CommunicationModule.message_queue import BackpressurePolicy
+from src.LLMModule.backends import FakeLLMBackend
+from src.round_runner import run_round_async, run_rounds
+
+
+LATENCY = 0.2
+
+
+def make_round(agent_count=3):
+    backend = FakeLLMBackend(latency=LATENCY)
+    manager = CommunicationManager(CommunicationMode.BLACKBOARD)
+    agents = [Agent(f"agent_{i}", f"Worker {i}", f"You are worker {i}.", backend=backend)
+              for i in range(agent_count)]
+    for agent in agents:
+        manager.register_agent(agent)
+    return agents, manager, backend
+
+
+def record_reads(manager):
+    """Wrap manager.receive to log (agent_id, senders of the messages it read)"""
+    reads = []
+    receive = manager.receive
+
+    def recording_receive(agent_id):
+        messages = receive(agent_id)
+        reads.append((agent_id, [message.agent_id for message in messages]))
+        return messages
+
+    manager.receive = recording_receive
+    return reads
+
+
+class TestRunRoundAsync(unittest.TestCase):
+    """Test cases for run_round_async / run_rounds"""
+
+    def test_sequential_round_sees_same_round_sends(self):
+        agents, manager, _ = make_round()
+        reads = record_reads(manager)
+
+        started = time.perf_counter()
+        run_rounds(agents, manager, "Plan the sprint", rounds=1)
+        self.assertGreaterEqual(time.perf_counter() - started, 3 * LATENCY)
+
+        self.assertEqual(reads, [("agent_0", []), ("agent_1", ["agent_0"]), ("agent_2", ["agent_0", "agent_1"])])
+
+    def test_concurrent_round_takes_about_one_latency(self):
+        agents, manager, backend = make_round()
+
+        started = time.perf_counter()
+        results = asyncio.run(run_round_async(agents, manager, "Plan the sprint", concurrent=True))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results, {agent.agent_id: "success" for agent in agents})
+        self.assertEqual(backend.get_stats()["calls"], 3)
+        self.assertGreaterEqual(elapsed, LATENCY)
+        self.assertLess(elapsed, 2 * LATENCY)  # sequential turns would take 3 latencies
+
+    def test_sends_follow_agent_order(self):
+        for concurrent in (False, True):
+            with self.subTest(concurrent=concurrent):
+                agents, manager, _ = make_round()
+                turns = []
+                run_rounds(agents, manager, "Plan the sprint", rounds=2, concurrent=concurrent,
+                           after_turn=lambda agent, result: turns.append(agent.agent_id))
+
+                senders = [message.agent_id for message in manager.blackboard_impl.messages]
+                self.assertEqual(senders, ["agent_0", "agent_1", "agent_2"] * 2)
+                self.assertEqual(turns, senders)
+
+    def test_concurrent_reads_exclude_same_round_sends(self):
+        agents, manager, _ = make_round()
+        reads = record_reads(manager)
+        run_rounds(agents, manager, "Plan the sprint", rounds=2, concurrent=True)
+
+        first_round, second_round = reads[:3], reads[3:]
+        self.assertEqual(first_round, [(agent.agent_id, []) for agent in agents])
+        self.assertEqual(second_round,
+                         [(agent.agent_id, ["agent_0", "agent_1", "agent_2"]) for agent in agents])
+
+    def test_failing_agent_does_not_affect_others(self):
+        async def fail(problem, recent_messages):
+            raise RuntimeError("backend down")
+
+        for concurrent in (False, True):
+            with self.subTest(concurrent=concurrent):
+                agents, manager, _ = make_round()
+                agents[1].agenerate_response = fail
+                results = asyncio.run(run_round_async(agents, manager, "Plan the sprint", concurrent=concurrent))
+
+                self.assertEqual(results, {"agent_0": "success", "agent_1": "error", "agent_2": "success"})
+                senders = [message.agent_id for message in manager.blackboard_impl.messages]
+                self.assertEqual(senders, ["agent_0", "agent_2"])
+
+    def test_block_backpressure_waits_for_space(self):
+        backend = FakeLLMBackend(latency=LATENCY)
+        manager = CommunicationManager(CommunicationMode.DIRECT, queue_size=1,
+                                       backpressure=BackpressurePolicy.BLOCK, block_timeout=5.0)
+        agents = [Agent(f"agent_{i}", f"Worker {i}", f"You are worker {i}.", backend=backend)
+                  for i in range(3)]
+        for agent in agents:
+            manager.register_agent(agent)
+        senders, reader = [agents[0], agents[2]], agents[1]
+
+        async def scenario():
+            round_task = asyncio.create_task(run_round_async(
+                senders, manager, "Plan the sprint",
+                recipients={agent.agent_id: reader.agent_id for agent in senders}))
+            # agent_0's reply fills agent_1's queue; agent_2's reply has to wait for this read
+            await asyncio.sleep(3 * LATENCY)
+            received = manager.receive(reader.agent_id)
+            results = await round_task
+            return received + manager.receive(reader.agent_id), results
+
+        received, results = asyncio.run(scenario())
+        self.assertEqual(results, {"agent_0": "success", "agent_2": "success"})
+        self.assertEqual([message.agent_id for message in received], ["agent_0", "agent_2"])
+        self.assertEqual(manager.communication_stats["messages_dropped"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
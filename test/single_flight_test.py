@@ -0,0 +1,94 @@
+"""
+Test cases for single-flight coalescing of identical LLM requests
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.LLMModule.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.group = SingleFlight()
+        self.calls = 0
+
+    def test_concurrent_threads_share_one_call(self):
+        results = []
+
+        def request():
+            self.calls += 1
+            time.sleep(0.1)
+            return "shared answer"
+
+        def worker():
+            results.append(self.group.do("same-prompt", request))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([result for result, _ in results], ["shared answer"] * 4)
+        self.assertEqual(sum(1 for _, shared in results if shared), 3)
+        self.assertEqual(self.group.get_stats()['coalesced'], 3)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Only requests in flight at the same time are joined"""
+        def request():
+            self.calls += 1
+            return self.calls
+
+        self.assertEqual(self.group.do("key", request), (1, False))
+        self.assertEqual(self.group.do("key", request), (2, False))
+
+    def test_different_keys_run_separately(self):
+        async def request(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        async def run():
+            return await asyncio.gather(
+                self.group.ado("a", lambda: request("A")),
+                self.group.ado("b", lambda: request("B"))
+            )
+
+        self.assertEqual(asyncio.run(run()), [("A", False), ("B", False)])
+        self.assertEqual(self.group.get_stats()['executions'], 2)
+
+    def test_async_callers_share_result(self):
+        async def request():
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        async def run():
+            return await asyncio.gather(*(self.group.ado("prompt", request) for _ in range(5)))
+
+        results = asyncio.run(run())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([result for result, _ in results], ["answer"] * 5)
+        self.assertEqual(self.group.get_stats()['in_flight'], 0)
+
+    def test_errors_are_shared(self):
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("endpoint down")
+
+        async def run():
+            return await asyncio.gather(*(self.group.ado("prompt", failing) for _ in range(3)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Test cases for streaming helpers (incremental JSON detection and latency metrics)
+"""
+
+import unittest
+
+from types import SimpleNamespace
+
+from src.LLMModule.streaming import GenerationMetrics, JSONObjectStream, percentile
+from src.OrchestrationLayer.action_executor import ActionExecutor
+
+
+class TestJSONObjectStream(unittest.TestCase):
+    """Test cases for JSONObjectStream"""
+
+    def test_object_emitted_when_closed(self):
+        """An object is returned by the chunk that closes it, not before"""
+        stream = JSONObjectStream()
+
+        self.assertEqual(stream.feed('Decision: {"decision": "appr'), [])
+        self.assertEqual(stream.feed('oved", "score": 0.9'), [])
+        self.assertEqual(stream.feed('} trailing text'), [{"decision": "approved", "score": 0.9}])
+
+    def test_nested_objects_and_braces_in_strings(self):
+        stream = JSONObjectStream()
+        objects = stream.feed('{"outer": {"inner": "a } b"}, "n": 1} {"second": true}')
+
+        self.assertEqual(objects, [{"outer": {"inner": "a } b"}, "n": 1}, {"second": True}])
+
+    def test_escaped_quotes(self):
+        stream = JSONObjectStream()
+        objects = stream.feed('{"text": "say \\"}\\" now"}')
+
+        self.assertEqual(objects, [{"text": 'say "}" now'}])
+
+    def test_invalid_object_skipped(self):
+        stream = JSONObjectStream()
+        self.assertEqual(stream.feed('{not json} {"ok": 1}'), [{"ok": 1}])
+
+
+class TestGenerationMetrics(unittest.TestCase):
+    """Test cases for GenerationMetrics"""
+
+    def test_streamed_call_metrics(self):
+        metrics = GenerationMetrics()
+        entry = metrics.record(latency=2.0, output_tokens=30, time_to_first_token=0.5, streamed=True)
+
+        self.assertEqual(entry['time_to_first_token'], 0.5)
+        self.assertAlmostEqual(entry['tokens_per_sec'], 20.0)
+
+    def test_blocking_call_uses_full_latency(self):
+        metrics = GenerationMetrics()
+        entry = metrics.record(latency=2.0, output_tokens=30)
+
+        self.assertEqual(entry['time_to_first_token'], 2.0)
+        self.assertAlmostEqual(entry['tokens_per_sec'], 15.0)
+
+    def test_rolling_window_and_stats(self):
+        metrics = GenerationMetrics(max_calls=3)
+        for latency in [1.0, 2.0, 3.0, 4.0]:
+            metrics.record(latency=latency, output_tokens=10)
+
+        stats = metrics.get_stats()
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['p50_latency'], 3.0)
+        self.assertEqual(stats['p95_latency'], 4.0)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 90), 0.0)
+        self.assertEqual(percentile([5.0, 1.0, 3.0], 50), 3.0)
+        self.assertEqual(percentile([5.0, 1.0, 3.0], 100), 5.0)
+
+
+
+class TestActionExecutorJSONParsing(unittest.TestCase):
+    """The action executor takes the first JSON object of an answer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        # Only the parsing helpers are needed; the executor's graph and environment are not built
+        self.executor = SimpleNamespace()
+        for name in ("_extract_json", "_parse_agent_selection"):
+            setattr(self.executor, name, getattr(ActionExecutor, name).__get__(self.executor))
+
+    def test_first_object_of_a_chatty_answer(self):
+        response = 'Decision: {"selected_agent_id": "coder", "confidence": 0.9} and some {"notes": "trailing"} prose'
+        self.assertEqual(self.executor._extract_json(response), {"selected_agent_id": "coder", "confidence": 0.9})
+
+        selection = self.executor._parse_agent_selection(response, [{"agent_id": "coder"}])
+        self.assertEqual(selection["selected_agent_id"], "coder")
+
+
+if __name__ == '__main__':
+    unittest.main()
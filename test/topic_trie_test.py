@@ -0,0 +1,102 @@
+"""
+Test cases for hierarchical / wildcard topics and the subscription trie
+"""
+
+import unittest
+
+from src.CommunicationModule.communication_manager import create_message
+from src.CommunicationModule.pubsub_communication import PubSubCommunicator
+from src.CommunicationModule.topic_trie import TopicTrie
+
+
+class StubAgent:
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+
+    def get_id(self):
+        return self.agent_id
+
+
+class TestTopicTrie(unittest.TestCase):
+    """Test cases for pattern matching"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.trie = TopicTrie()
+        self.trie.add("analysis.math.algebra", "exact")
+        self.trie.add("analysis.*.algebra", "star")
+        self.trie.add("analysis.#", "hash")
+        self.trie.add("#.algebra", "suffix")
+        self.trie.add("#", "everything")
+
+    def test_matching(self):
+        self.assertEqual(self.trie.match("analysis.math.algebra"),
+                         {"exact", "star", "hash", "suffix", "everything"})
+        self.assertEqual(self.trie.match("analysis"), {"hash", "everything"})
+        self.assertEqual(self.trie.match("analysis.physics.algebra"), {"star", "hash", "suffix", "everything"})
+        self.assertEqual(self.trie.match("analysis.math.algebra.linear"), {"hash", "everything"})
+        self.assertEqual(self.trie.match("algebra"), {"suffix", "everything"})
+        self.assertEqual(self.trie.match("design"), {"everything"})
+
+    def test_star_matches_exactly_one_segment(self):
+        trie = TopicTrie()
+        trie.add("a.*", "x")
+        self.assertEqual(trie.match("a.b"), {"x"})
+        self.assertEqual(trie.match("a"), set())
+        self.assertEqual(trie.match("a.b.c"), set())
+
+    def test_remove_invalidates_cache_and_prunes(self):
+        self.assertIn("star", self.trie.match("analysis.math.algebra"))
+        self.assertTrue(self.trie.remove("analysis.*.algebra", "star"))
+        self.assertNotIn("star", self.trie.match("analysis.math.algebra"))
+        self.assertFalse(self.trie.remove("analysis.*.algebra", "star"))
+        self.assertNotIn("*", self.trie._root.children["analysis"].children)
+
+    def test_malformed_patterns_are_rejected(self):
+        self.assertFalse(self.trie.add("analysis..math", "x"))
+        self.assertFalse(self.trie.add("", "x"))
+
+
+class TestHierarchicalPubSub(unittest.TestCase):
+    """Test cases for wildcard subscriptions in PubSubCommunicator"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.pubsub = PubSubCommunicator()
+        for agent_id in ("publisher", "mathematician", "analyst"):
+            self.pubsub.register_agent(StubAgent(agent_id))
+        self.pubsub.subscribe("mathematician", "analysis.math.*")
+        self.pubsub.subscribe("analyst", "analysis.#")
+        self.pubsub.subscribe("analyst", "review")
+
+    def publish(self, topic):
+        return self.pubsub.send(create_message(sender_id="publisher", sender_role="Tester",
+                                               content=topic, topic=topic))
+
+    def test_publish_reaches_matching_subscribers(self):
+        self.assertTrue(self.publish("analysis.math.algebra"))
+        self.assertTrue(self.publish("analysis.physics"))
+        self.assertFalse(self.publish("design"))
+
+        self.assertEqual([m.content for m in self.pubsub.receive("mathematician")], ["analysis.math.algebra"])
+        self.assertEqual([m.content for m in self.pubsub.receive("analyst")],
+                         ["analysis.math.algebra", "analysis.physics"])
+
+    def test_reverse_index(self):
+        self.assertEqual(self.pubsub.get_agent_subscriptions("analyst"), ["analysis.#", "review"])
+        self.assertTrue(self.pubsub.unsubscribe("analyst", "analysis.#"))
+        self.assertEqual(self.pubsub.get_agent_subscriptions("analyst"), ["review"])
+        self.assertEqual(self.pubsub.get_agent_subscriptions("publisher"), [])
+        self.assertEqual(self.pubsub.get_matching_subscribers("analysis.math.x"), {"mathematician"})
+
+    def test_many_topics(self):
+        for i in range(2000):
+            agent_id = f"agent_{i}"
+            self.pubsub.register_agent(StubAgent(agent_id))
+            self.pubsub.subscribe(agent_id, f"team.{i % 50}.task_{i}")
+        self.assertEqual(self.pubsub.get_matching_subscribers("team.7.task_107"), {"agent_107"})
+        self.assertEqual(self.pubsub.get_agent_subscriptions("agent_107"), ["team.7.task_107"])
+
+
+if __name__ == "__main__":
+    unittest.main()
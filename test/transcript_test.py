@@ -0,0 +1,79 @@
+"""
+Test cases for the incrementally rendered conversation transcript
+"""
+
+import unittest
+
+from src.CommunicationModule.blackboard import Blackboard
+from src.CommunicationModule.communication_manager import create_message
+from src.CommunicationModule.transcript import TranscriptCache
+from src.LLMModule.context_builder import estimate_tokens
+from src.agent import Agent
+
+
+class TestTranscriptCache(unittest.TestCase):
+    """Test cases for TranscriptCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.transcript = TranscriptCache("HEADER\n")
+        for word in ("alpha", "beta gamma", "delta epsilon zeta"):
+            self.transcript.append(word + "\n")
+
+    def test_full_text(self):
+        self.assertEqual(self.transcript.text(), "HEADER\nalpha\nbeta gamma\ndelta epsilon zeta\n")
+        self.transcript.append("eta\n")
+        self.assertTrue(self.transcript.text().endswith("zeta\neta\n"))
+        self.assertEqual(len(self.transcript), 4)
+
+    def test_token_bounded_tail(self):
+        last = estimate_tokens("delta epsilon zeta\n")
+        self.assertEqual(self.transcript.tail_lines(last), ["delta epsilon zeta\n"])
+        self.assertEqual(self.transcript.tail_lines(last - 1), [])
+        self.assertEqual(len(self.transcript.tail_lines(10 ** 6)), 3)
+        self.assertEqual(self.transcript.tail(last), "HEADER\ndelta epsilon zeta\n")
+
+    def test_clear(self):
+        self.transcript.text()
+        self.transcript.clear()
+        self.assertEqual(self.transcript.text(), "HEADER\n")
+        self.assertEqual(self.transcript.total_tokens, 0)
+
+
+class TestBlackboardHistory(unittest.TestCase):
+    """Blackboard history served from the transcript"""
+
+    def test_history_matches_messages(self):
+        board = Blackboard()
+        self.assertEqual(board.get_conversation_history(), "No previous messages.")
+
+        first = create_message(sender_id="a", sender_role="Analyst", content="first point")
+        second = create_message(sender_id="b", sender_role="Coder", content="second point")
+        board.send(first)
+        board.send(second)
+
+        history = board.get_conversation_history()
+        self.assertTrue(history.startswith("=== CONVERSATION HISTORY ===\n"))
+        self.assertIn(f"[{first.timestamp.strftime('%H:%M:%S')}] Analyst (a):\nfirst point\n\n", history)
+        self.assertNotIn("first point", board.get_conversation_tail(estimate_tokens(history) // 2))
+        self.assertIn("second point", board.get_conversation_tail(estimate_tokens(history) // 2))
+
+        board.clear()
+        self.assertEqual(board.get_conversation_history(), "No previous messages.")
+
+
+class TestAgentMessageLines(unittest.TestCase):
+    """Agents render each message once"""
+
+    def test_rendered_lines_are_cached(self):
+        agent = Agent("a", "Analyst", "You analyze.")
+        message = create_message(sender_id="b", sender_role="Coder", content="hello")
+
+        first = agent._render_messages([message])
+        message.content = "edited"
+        self.assertEqual(agent._render_messages([message]), first)
+        self.assertEqual(agent._format_message_lines([message]), [first[0][0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Test cases for the semantic (embedding) memory tier
+"""
+
+import unittest
+
+import numpy as np
+
+from src.MemoryModule.memory_manager import MemoryManager
+from src.MemoryModule.vector_memory import HashedNgramEmbedder, VectorMemory
+
+
+class TestHashedNgramEmbedder(unittest.TestCase):
+    """Test cases for HashedNgramEmbedder"""
+
+    def test_embeddings_are_normalized_and_stable(self):
+        embedder = HashedNgramEmbedder(dim=256)
+        first = embedder.embed("Caching database queries")
+
+        self.assertAlmostEqual(float(np.linalg.norm(first)), 1.0, places=5)
+        self.assertTrue(np.array_equal(first, HashedNgramEmbedder(dim=256).embed("Caching database queries")))
+        self.assertFalse(embedder.embed("...").any())
+
+    def test_similar_wording_scores_higher(self):
+        embedder = HashedNgramEmbedder()
+        query = embedder.embed("database caching")
+
+        related = float(embedder.embed("cache the databases") @ query)
+        unrelated = float(embedder.embed("team offsite schedule") @ query)
+        self.assertGreater(related, unrelated)
+
+
+class TestVectorMemory(unittest.TestCase):
+    """Test cases for VectorMemory"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.memory = VectorMemory(initial_capacity=2)
+        self.memory.add("cache", "Cache responses of the pricing service")
+        self.memory.add("auth", "Rotate authentication tokens every hour")
+        self.memory.add("schema", "Normalize the customer database schema")
+
+    def test_matrix_grows(self):
+        self.assertEqual(len(self.memory), 3)
+        self.assertEqual(self.memory.get_stats()['capacity'], 4)
+
+    def test_top_k(self):
+        results = self.memory.search("caching the pricing responses", k=1)
+        self.assertEqual(results[0][0], "cache")
+
+    def test_tombstone_and_compaction(self):
+        self.memory.remove("cache")
+        self.assertNotIn("cache", [key for key, _ in self.memory.search("pricing cache", k=3)])
+        self.assertEqual(self.memory.get_stats()['tombstones'], 1)
+
+        self.memory.remove("auth")  # more than half tombstoned -> compacted
+        self.assertEqual(self.memory.get_stats()['tombstones'], 0)
+        self.assertEqual(self.memory.search("customer schema", k=3)[0][0], "schema")
+
+    def test_replace_and_filter(self):
+        self.memory.add("auth", "Cache pricing lookups in Redis")
+        results = self.memory.search("pricing cache", k=2, accept=lambda key: key != "cache")
+
+        self.assertEqual(results[0][0], "auth")
+        self.assertEqual(len(self.memory), 3)
+
+    def test_ties_go_to_newest(self):
+        memory = VectorMemory(dim=64)
+        for i in range(10):
+            memory.add(f"k{i}", "add a read-through cache")
+        memory.remove("k3")
+        memory.compact()
+        self.assertEqual([key for key, _ in memory.search("read-through cache", k=3)], ["k9", "k8", "k7"])
+
+
+class TestMemoryManagerSemanticSearch(unittest.TestCase):
+    """Test cases for MemoryManager.semantic_search"""
+
+    def test_semantic_search_tracks_writes_and_visibility(self):
+        manager = MemoryManager(memory_type="rbac")
+        manager.register_agent("admin", "Admin")
+        manager.register_agent("guest", "Guest")
+        manager.write("insight_1", {"insight": "Shard the orders table"}, "admin")
+        manager.write("insight_2", {"insight": "Sharding orders by region"}, "admin")
+        manager.protect_key("insight_1", "admin")
+
+        self.assertEqual(manager.semantic_search("sharded order tables", 1, "admin")[0]['key'], "insight_1")
+        self.assertEqual([hit['key'] for hit in manager.semantic_search("sharded order tables", 5, "guest")],
+                         ["insight_2"])
+
+        manager.delete_key("insight_2", "admin")
+        self.assertEqual(manager.semantic_search("orders", 5, "guest"), [])
+
+    def test_problem_context_is_not_embedded(self):
+        problem = "Design a caching layer for a read-heavy web service."
+        manager = MemoryManager()
+        manager.register_agent("a1")
+        for i in range(20):
+            manager.write(f"analyst_{1000 + i}", {"role": "Analyst", "agent_id": "a1", "problem_context": problem,
+                                                  "insight": f"Round {i}: consider sharding the user table",
+                                                  "timestamp": 1000 + i}, "a1")
+
+        # The shared problem text no longer makes every entry look similar to the problem
+        self.assertEqual(manager.semantic_search(problem, 5, "a1", min_score=0.2), [])
+        self.assertEqual(len(manager.semantic_search("sharding the user table", 5, "a1", min_score=0.2)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()